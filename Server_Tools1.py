@@ -1,13 +1,38 @@
 import os
+import asyncio
+import base64
+import functools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
 import pyodbc
 import psycopg2
-from typing import Any, Optional
-import random
-import pandas as pd
+from typing import Any, Optional, Union
 from datetime import datetime, timedelta
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 import mysql.connector
 from dotenv import load_dotenv
+from async_db import AsyncDatabase
+from calllog_lexicon import backfill_lexicon, install_lexicon
+from calllog_rollup import install_rollup, rebuild_rollup
+from careplan_loader import load_careplan_tsv
+from columnar import RESULT_FORMATS, records_to_columnar
+from datagen import GenSpec, generate_chunk, load_mysql
+from db_executor import DBExecutor, DBQueueTimeout
+from db_pool import ConnectionPool, mysql_ping, mysql_reset, pg_ping, pg_reset
+from db_session import current_session, on_commit, run_in_session
+from entity_cache import MISS, EntityCache
+from filter_compiler import FilterCompileError, compile_sales_filter, cache_stats as filter_cache_stats
+from name_index import MATCH_RANKS, CustomerNameIndex, normalize
+from pg_copy import copy_rows
+from products_sync import ProductsSync, install_change_capture, install_sync_state
+from query_plan import PlanGroup, QueryPlan, run_plan_async, run_plan_sync
+from result_cache import DATA_VERSION_SQL, ResultCache, bump_data_version, install_data_version
+from result_governor import ResultGovernor
+from schema_version import record_version, seeded_version
+from serializer import convert_rows, dumps
+from transcript_terms import TermIndexSync, fold_pending_terms, install_term_index, rebuild_term_index
 
 load_dotenv()
 
@@ -26,7 +51,14 @@ MYSQL_PASSWORD = must_get("MYSQL_PASSWORD")
 MYSQL_DB = must_get("MYSQL_DB")
 
 
-def get_mysql_conn(db: str | None = MYSQL_DB):
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+MYSQL_POOL_MAX_OVERFLOW = int(os.getenv("MYSQL_POOL_MAX_OVERFLOW", "10"))
+MYSQL_POOL_RECYCLE = float(os.getenv("MYSQL_POOL_RECYCLE", "1800"))
+MYSQL_POOL_PRE_PING = float(os.getenv("MYSQL_POOL_PRE_PING", "30"))
+MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", "30"))
+
+
+def _open_mysql_conn(db: str | None):
     return mysql.connector.connect(
         host=MYSQL_HOST,
         port=MYSQL_PORT,
@@ -38,6 +70,82 @@ def get_mysql_conn(db: str | None = MYSQL_DB):
     )
 
 
+_mysql_pools: dict[str, ConnectionPool] = {}
+_mysql_pools_lock = threading.Lock()
+
+
+def get_mysql_pool(db: str = MYSQL_DB) -> ConnectionPool:
+    pool = _mysql_pools.get(db)
+    if pool is None:
+        with _mysql_pools_lock:
+            pool = _mysql_pools.get(db)
+            if pool is None:
+                pool = ConnectionPool(
+                    name=f"mysql:{db}",
+                    factory=lambda: _open_mysql_conn(db),
+                    size=MYSQL_POOL_SIZE,
+                    max_overflow=MYSQL_POOL_MAX_OVERFLOW,
+                    recycle=MYSQL_POOL_RECYCLE,
+                    pre_ping=MYSQL_POOL_PRE_PING,
+                    timeout=MYSQL_POOL_TIMEOUT,
+                    ping=mysql_ping,
+                    reset=mysql_reset,
+                )
+                _mysql_pools[db] = pool
+    return pool
+
+
+def get_mysql_conn(db: str | None = MYSQL_DB):
+    # Server-level connections (no default schema) are only used while seeding.
+    if db is None:
+        return _open_mysql_conn(None)
+    session = current_session()
+    if session is not None and db == MYSQL_DB:
+        return session.connection("mysql")
+    return get_mysql_pool(db).connect()
+
+
+PG_POOL_MIN_SIZE = int(os.getenv("PG_POOL_MIN_SIZE", "2"))
+PG_POOL_MAX_SIZE = int(os.getenv("PG_POOL_MAX_SIZE", "10"))
+PG_POOL_MAX_OVERFLOW = int(os.getenv("PG_POOL_MAX_OVERFLOW", "5"))
+PG_POOL_RECYCLE = float(os.getenv("PG_POOL_RECYCLE", "1800"))
+PG_POOL_PRE_PING = float(os.getenv("PG_POOL_PRE_PING", "30"))
+PG_POOL_TIMEOUT = float(os.getenv("PG_POOL_TIMEOUT", "30"))
+
+_pg_pools: dict[tuple, ConnectionPool] = {}
+_pg_pools_lock = threading.Lock()
+
+
+def get_pg_pool(host: str, port: int, dbname: str, user: str, password: str) -> ConnectionPool:
+    key = (host, port, dbname, user)
+    pool = _pg_pools.get(key)
+    if pool is None:
+        with _pg_pools_lock:
+            pool = _pg_pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    name=f"postgres:{dbname}@{host}:{port}",
+                    factory=lambda: psycopg2.connect(
+                        host=host,
+                        port=port,
+                        dbname=dbname,
+                        user=user,
+                        password=password,
+                        sslmode="require",
+                    ),
+                    size=PG_POOL_MAX_SIZE,
+                    min_size=PG_POOL_MIN_SIZE,
+                    max_overflow=PG_POOL_MAX_OVERFLOW,
+                    recycle=PG_POOL_RECYCLE,
+                    pre_ping=PG_POOL_PRE_PING,
+                    timeout=PG_POOL_TIMEOUT,
+                    ping=pg_ping,
+                    reset=pg_reset,
+                )
+                _pg_pools[key] = pool
+    return pool
+
+
 PG_HOST = must_get("PG_HOST")
 PG_PORT = int(must_get("PG_PORT"))
 PG_DB = os.getenv("PG_DB", "postgres")
@@ -46,14 +154,10 @@ PG_PASS = must_get("PG_PASSWORD")
 
 
 def get_pg_conn():
-    return psycopg2.connect(
-        host=PG_HOST,
-        port=PG_PORT,
-        dbname=PG_DB,
-        user=PG_USER,
-        password=PG_PASS,
-        sslmode="require",
-    )
+    session = current_session()
+    if session is not None:
+        return session.connection("postgres")
+    return get_pg_pool(PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASS).connect()
 
 
 PG_SALES_HOST = must_get("PG_SALES_HOST")
@@ -64,181 +168,250 @@ PG_SALES_PASS = must_get("PG_SALES_PASSWORD")
 
 
 def get_pg_sales_conn():
-    return psycopg2.connect(
-        host=PG_SALES_HOST,
-        port=PG_SALES_PORT,
-        dbname=PG_SALES_DB,
-        user=PG_SALES_USER,
-        password=PG_SALES_PASS,
-        sslmode="require",
-    )
+    session = current_session()
+    if session is not None:
+        return session.connection("pg_sales")
+    return get_pg_pool(PG_SALES_HOST, PG_SALES_PORT, PG_SALES_DB, PG_SALES_USER, PG_SALES_PASS).connect()
 
 
-mcp = FastMCP("CRUDServer")
-
-
-def generate_call_transcript(issue_category, resolution_status, sentiment_score, agent_name, duration):
-    transcript_templates = {
-        'billing': {
-            'positive': [
-                f"Customer called about billing discrepancy. {agent_name} explained the charges clearly. Customer expressed satisfaction with the detailed breakdown. Issue resolved by applying appropriate credit adjustment. Customer thanked agent for patience.",
-                f"Inquiry about unexpected charges on account. {agent_name} reviewed billing history, identified duplicate charge. Immediate refund processed. Customer appreciated quick resolution and professional service provided.",
-                f"Customer confused about new billing format. {agent_name} walked through each line item. Customer now understands charges better. Offered paperless billing option which customer accepted happily.",
-            ],
-            'negative': [
-                f"Customer upset about overcharge. {agent_name} attempted to explain but customer remained frustrated. Multiple billing errors found. Escalated to supervisor for resolution. Customer demanded compensation for inconvenience.",
-                f"Angry customer disputing charges for third month. {agent_name} unable to locate previous adjustment notes. System showing conflicting information. Customer threatened to cancel service. Immediate escalation required.",
-                f"Customer extremely dissatisfied with billing practices. {agent_name} apologized repeatedly but customer remained hostile. Previous promises not honored. Customer considering legal action. Urgent management intervention needed.",
-            ],
-            'neutral': [
-                f"Routine billing inquiry about statement date. {agent_name} explained billing cycle details. Customer requested email confirmation. Standard information provided. Call concluded with no issues identified.",
-                f"Customer checking on payment processing status. {agent_name} confirmed payment received yesterday. Updated account reflects current balance. Customer satisfied with information. No further action required.",
-            ]
-        },
-        'technical': {
-            'positive': [
-                f"Customer experiencing connectivity issues. {agent_name} performed remote diagnostics successfully. Issue identified as router configuration problem. Guided customer through reset process. Service restored, customer very grateful.",
-                f"Software installation problem reported. {agent_name} provided step-by-step guidance. Customer followed instructions carefully. Installation completed successfully. Customer praised agent's clear communication skills.",
-                f"Customer needed help with new feature setup. {agent_name} shared screen remotely. Configuration completed together. Customer learned valuable tips. Highly satisfied with support received.",
-            ],
-            'negative': [
-                f"Recurring technical problem frustrating customer. {agent_name} attempted multiple troubleshooting steps unsuccessfully. Customer lost patience during lengthy process. Previous tickets show unresolved issues. Escalation to technical team required.",
-                f"Customer angry about service outage. {agent_name} acknowledged ongoing system issues. No immediate resolution available. Customer demanding compensation for business losses. Extremely dissatisfied with response.",
-                f"Critical system failure affecting customer operations. {agent_name} unable to provide timeline for fix. Customer stressed about impact on business. Multiple failed resolution attempts. Emergency escalation initiated.",
-            ],
-            'neutral': [
-                f"Customer inquiring about system maintenance schedule. {agent_name} provided upcoming maintenance windows. Customer noted dates for planning. Standard information exchanged. Call ended cordially.",
-                f"Routine technical specification question. {agent_name} consulted documentation and provided details. Customer taking notes for internal team. Information delivered as requested. No issues noted.",
-            ]
-        },
-        'product_inquiry': {
-            'positive': [
-                f"Customer interested in new product features. {agent_name} enthusiastically explained benefits and pricing. Customer impressed with capabilities. Decided to upgrade immediately. Very satisfied with information received.",
-                f"Inquiry about product compatibility. {agent_name} confirmed full compatibility with customer's setup. Provided additional recommendations. Customer pleased with comprehensive response. Proceeding with purchase.",
-                f"Customer seeking product recommendations. {agent_name} analyzed needs and suggested perfect solution. Customer excited about features. Order placed during call. Thanked agent for expertise.",
-            ],
-            'negative': [
-                f"Customer disappointed with product limitations. {agent_name} explained current capabilities. Customer expected more features for price. Unhappy with value proposition. Considering competitor alternatives.",
-                f"Product not meeting advertised specifications. {agent_name} acknowledged discrepancy. Customer frustrated with misleading information. Requested full refund. Very dissatisfied with experience.",
-            ],
-            'neutral': [
-                f"General product information request. {agent_name} provided standard specifications and pricing. Customer collecting information for comparison. Will discuss with team. Polite interaction throughout.",
-                f"Customer checking product availability. {agent_name} confirmed stock levels and delivery times. Customer will consider options. Standard inquiry handled efficiently. No commitment made.",
-            ]
-        },
-        'complaint': {
-            'positive': [
-                f"Customer initially upset about service issue. {agent_name} listened empathetically and apologized sincerely. Offered immediate solution and compensation. Customer attitude improved significantly. Ended call satisfied.",
-                f"Complaint about previous poor experience. {agent_name} took ownership and implemented corrective measures. Customer appreciated proactive approach. Issue resolved beyond expectations. Relationship restored.",
-            ],
-            'negative': [
-                f"Customer extremely angry about repeated problems. {agent_name} struggled to calm situation. Multiple service failures documented. Customer demanding executive contact. Threatening social media exposure.",
-                f"Serious complaint about staff behavior. {agent_name} attempted damage control unsuccessfully. Customer unwilling to accept apologies. Formal complaint being filed. Legal action mentioned.",
-                f"Long-standing issue causing major frustration. {agent_name} unable to provide satisfactory resolution. Customer exhausted all patience. Canceling service immediately. Extremely negative experience.",
-            ],
-            'neutral': [
-                f"Customer registering formal complaint for records. {agent_name} documented all details carefully. Standard complaint procedure followed. Reference number provided. Professional interaction maintained throughout.",
-            ]
-        },
-        'order_status': {
-            'positive': [
-                f"Customer checking on recent order. {agent_name} provided tracking information promptly. Delivery on schedule for tomorrow. Customer pleased with quick update. Expressed satisfaction with service.",
-                f"Inquiry about expedited shipping options. {agent_name} arranged priority delivery at no charge. Customer delighted with accommodation. Order upgraded successfully. Very appreciative of help.",
-            ],
-            'negative': [
-                f"Order significantly delayed without notification. {agent_name} found logistics error. Customer upset about lack of communication. Business impact significant. Demanding immediate resolution and compensation.",
-                f"Wrong items delivered twice. {agent_name} apologized but no immediate fix available. Customer frustrated with repeated errors. Quality control issues evident. Considering canceling all future orders.",
-            ],
-            'neutral': [
-                f"Routine order status check. {agent_name} confirmed shipment departed this morning. Tracking number provided via email. Customer satisfied with update. Standard inquiry resolved quickly.",
-            ]
-        },
-        'account': {
-            'positive': [
-                f"Customer needed password reset assistance. {agent_name} verified identity and reset credentials. Access restored immediately. Customer grateful for quick help. Security tips provided and appreciated.",
-                f"Account upgrade request. {agent_name} processed changes efficiently. New features activated instantly. Customer excited about enhanced capabilities. Smooth transition completed.",
-            ],
-            'negative': [
-                f"Account hacked, unauthorized charges made. {agent_name} initiated security protocol. Customer panicked about data breach. Investigation will take days. Very upset about security failure.",
-                f"Unable to access account for weeks. {agent_name} found system error. Customer missed important deadlines. Business losses mounting. Extremely frustrated with platform reliability.",
-            ],
-            'neutral': [
-                f"Customer updating contact information. {agent_name} processed changes in system. Confirmation email sent. Standard account maintenance completed. No issues encountered.",
-            ]
-        },
-        'refund': {
-            'positive': [
-                f"Refund request for defective product. {agent_name} approved immediately after verification. Processing within 3-5 days. Customer satisfied with quick approval. Appreciated hassle-free process.",
-                f"Customer requesting partial refund for service issue. {agent_name} calculated fair adjustment. Credit applied to account instantly. Customer happy with resolution. Thanked agent for understanding.",
-            ],
-            'negative': [
-                f"Refund denied despite valid complaint. {agent_name} cited policy restrictions. Customer arguing about unfair treatment. Previous promises not honored. Threatening chargeback through bank.",
-                f"Multiple refund requests ignored. {agent_name} found processing errors. Customer exhausted and angry. Financial hardship mentioned. Considering legal action for resolution.",
-            ],
-            'neutral': [
-                f"Standard refund inquiry about timeline. {agent_name} explained processing procedures. Customer understood requirements. Documentation submitted. Awaiting standard processing time.",
-            ]
-        },
-        'general': {
-            'positive': [
-                f"Customer calling to praise recent service. {agent_name} accepted compliments graciously. Customer wanted manager to know about excellent experience. Positive feedback documented. Very satisfied customer.",
-                f"General inquiry about services. {agent_name} provided comprehensive overview. Customer impressed with options available. Interested in learning more. Scheduling follow-up consultation.",
-            ],
-            'negative': [
-                f"Customer expressing overall dissatisfaction. {agent_name} listened to multiple concerns. Long list of problems mentioned. Customer considering switching providers. Retention team referral needed.",
-                f"Vague complaint about service quality. {agent_name} tried identifying specific issues. Customer frustrated with everything. Unable to pinpoint exact problem. General dissatisfaction expressed.",
-            ],
-            'neutral': [
-                f"Customer had miscellaneous questions. {agent_name} answered each one patiently. Information gathering for future reference. No immediate action needed. Cordial conversation throughout.",
-                f"General check-in call about services. {agent_name} reviewed account status. Everything functioning normally. Customer had no concerns. Brief, pleasant interaction.",
-            ]
-        }
+products_sync = ProductsSync(
+    pg_connect=lambda: get_pg_pool(PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASS).connect(),
+    mysql_connect=lambda: get_mysql_pool().connect(),
+    listen_connect=lambda: psycopg2.connect(host=PG_HOST, port=PG_PORT, dbname=PG_DB, user=PG_USER,
+                                            password=PG_PASS, sslmode="require"),
+    batch_size=int(os.getenv("PRODUCTS_SYNC_BATCH", "500")),
+    poll_interval=float(os.getenv("PRODUCTS_SYNC_INTERVAL", "5")),
+    resync_interval=float(os.getenv("PRODUCTS_SYNC_RESYNC", "3600")),
+)
+
+term_index_sync = TermIndexSync(
+    mysql_connect=lambda: get_mysql_pool().connect(),
+    batch_size=int(os.getenv("TERM_INDEX_BATCH", "1000")),
+    interval=float(os.getenv("TERM_INDEX_INTERVAL", "5")),
+)
+
+
+def warm_up_pools():
+    get_mysql_pool().warm_up()
+    get_pg_pool(PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASS).warm_up()
+    get_pg_pool(PG_SALES_HOST, PG_SALES_PORT, PG_SALES_DB, PG_SALES_USER, PG_SALES_PASS).warm_up()
+
+
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "32"))
+DB_QUEUE_TIMEOUT = float(os.getenv("DB_QUEUE_TIMEOUT", "30"))
+MYSQL_MAX_CONCURRENCY = int(os.getenv("MYSQL_MAX_CONCURRENCY", str(MYSQL_POOL_SIZE + MYSQL_POOL_MAX_OVERFLOW)))
+PG_MAX_CONCURRENCY = int(os.getenv("PG_MAX_CONCURRENCY", str(PG_POOL_MAX_SIZE + PG_POOL_MAX_OVERFLOW)))
+
+db_executor = DBExecutor(
+    max_workers=DB_EXECUTOR_WORKERS,
+    limits={"mysql": MYSQL_MAX_CONCURRENCY, "postgres": PG_MAX_CONCURRENCY},
+    queue_timeout=DB_QUEUE_TIMEOUT,
+)
+
+
+# "thread" runs the blocking drivers on db_executor; "asyncio" answers planned reads
+# from native async pools (aiomysql / psycopg 3) and keeps writes on the executor.
+DB_BACKEND = os.getenv("DB_BACKEND", "thread").lower()
+
+async_db = AsyncDatabase(
+    mysql={"host": MYSQL_HOST, "port": MYSQL_PORT, "user": MYSQL_USER,
+           "password": MYSQL_PASSWORD, "database": MYSQL_DB},
+    postgres={"host": PG_HOST, "port": PG_PORT, "dbname": PG_DB,
+              "user": PG_USER, "password": PG_PASS},
+    min_size=PG_POOL_MIN_SIZE,
+    max_size=int(os.getenv("ASYNC_DB_POOL_SIZE", "50")),
+    recycle=MYSQL_POOL_RECYCLE,
+)
+
+
+# Connections a tool-call session may open, one per backend. MySQL cursors are
+# buffered so helper lookups can share the connection with an open cursor.
+SESSION_OPENERS = {
+    "mysql": lambda: get_mysql_pool().connect(),
+    "postgres": lambda: get_pg_pool(PG_HOST, PG_PORT, PG_DB, PG_USER, PG_PASS).connect(),
+    "pg_sales": lambda: get_pg_pool(PG_SALES_HOST, PG_SALES_PORT, PG_SALES_DB, PG_SALES_USER, PG_SALES_PASS).connect(),
+}
+SESSION_CURSOR_KWARGS = {"mysql": {"buffered": True}}
+
+# Cursors for plans that stream their rows: unbuffered on MySQL, server-side on Postgres.
+STREAM_CURSOR_KWARGS = {"mysql": {"buffered": False}, "postgres": {"name": "stream"}}
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "25"))
+
+
+def _plan_connection(backend: str):
+    return get_pg_conn() if backend == "postgres" else get_mysql_conn()
+
+
+async def execute_plan(backend: str, plan: QueryPlan) -> Any:
+    if DB_BACKEND == "asyncio":
+        return await run_plan_async(async_db, backend, plan)
+    return await db_executor.run(
+        backend, lambda: run_plan_sync(_plan_connection(backend), plan, STREAM_CURSOR_KWARGS.get(backend)))
+
+
+def _progress_reporter(ctx: Context):
+    """Forward a plan's row count to the client as MCP progress notifications, from any thread."""
+    loop = asyncio.get_running_loop()
+
+    def report(fetched: int):
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(progress=fetched, total=None, message=f"{fetched} rows fetched"), loop)
+    return report
+
+
+# Per-tool row / byte caps (RESULT_MAX_ROWS, RESULT_MAX_BYTES, RESULT_MAX_ROWS_<TOOL>, ...).
+result_governor = ResultGovernor.from_env()
+
+
+# Call-log analyses and transcript searches, reused until the call-log data version moves.
+result_cache = ResultCache("calllog_results", int(os.getenv("RESULT_CACHE_SIZE", "256")),
+                           int(os.getenv("RESULT_CACHE_MAX_BYTES", "64000000")))
+
+
+def _data_version_plan() -> QueryPlan:
+    return QueryPlan(DATA_VERSION_SQL, None, lambda rows: tuple(rows[0]), on_error=lambda e: None)
+
+
+async def execute_governed(backend: str, tool: str, plan: QueryPlan, version: Any = MISS) -> Any:
+    """Run ``plan`` under ``tool``'s result caps; truncated responses also get a total_estimate.
+
+    ``version`` is the data version already read for this call (None: unavailable, skip the cache).
+    """
+    if plan.cache_key is None:
+        return await _execute_governed(backend, tool, plan)
+    if version is MISS:
+        version = await execute_plan(backend, _data_version_plan())
+    if version is None:
+        return await _execute_governed(backend, tool, plan)
+    key = (tool, plan.cache_key)
+    cached = result_cache.get(key, version)
+    if cached is not MISS:
+        return dict(cached)
+    response = await _execute_governed(backend, tool, plan)
+    if isinstance(response, dict) and not str(response.get("result")).startswith("❌"):
+        result_cache.set(key, version, response, len(dumps(response)))
+    return dict(response) if isinstance(response, dict) else response
+
+
+async def _execute_governed(backend: str, tool: str, plan: QueryPlan) -> Any:
+    plan.limits = result_governor.limits(tool)
+    response = await execute_plan(backend, plan)
+    if isinstance(response, dict) and response.get("truncated"):
+        if plan.count_sql is not None:
+            count_sql, count_params = plan.count_sql, plan.count_params
+        else:
+            count_sql, count_params = plan.sql, plan.params
+        count = QueryPlan(f"SELECT COUNT(*) FROM ({count_sql}) AS governed", count_params,
+                          lambda rows: rows[0][0], on_error=lambda e: None)
+        try:
+            response["total_estimate"] = await execute_plan(backend, count)
+        except DBQueueTimeout:
+            response["total_estimate"] = None
+    return response
+
+
+async def execute_group(backend: str, tool: str, group: PlanGroup, result_format: Optional[str]) -> dict:
+    """Run every plan of ``group`` at once; the response keys each result and its wall time by name."""
+    version = MISS
+    if any(plan.cache_key is not None for plan in group.plans.values()):
+        # One version read serves every cached plan in the group.
+        try:
+            version = await execute_plan(backend, _data_version_plan())
+        except DBQueueTimeout:
+            version = None
+
+    async def timed(plan: QueryPlan):
+        start = time.perf_counter()
+        try:
+            response = format_response(await execute_governed(backend, tool, plan, version), result_format)
+        except Exception as e:
+            response = {"sql": plan.sql, "result": f"❌ SQL Error: {str(e)}"}
+        return response, round((time.perf_counter() - start) * 1000, 2)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(timed(plan) for plan in group.plans.values()))
+    return {
+        "result": {name: response for name, (response, _) in zip(group.plans, outcomes)},
+        "timings_ms": {name: elapsed for name, (_, elapsed) in zip(group.plans, outcomes)},
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
     }
 
-    if sentiment_score >= 0.3:
-        sentiment_cat = 'positive'
-    elif sentiment_score <= -0.3:
-        sentiment_cat = 'negative'
-    else:
-        sentiment_cat = 'neutral'
 
-    if issue_category in transcript_templates:
-        templates = transcript_templates[issue_category].get(sentiment_cat,
-                                                             transcript_templates[issue_category]['neutral'])
-    else:
-        templates = transcript_templates['general'][sentiment_cat]
-
-    base_transcript = random.choice(templates)
-
-    if duration < 120:
-        base_transcript = "Quick call. " + base_transcript
-    elif duration > 900:
-        base_transcript = "Extended call requiring patience. " + base_transcript
-
-    if resolution_status == 'escalated':
-        base_transcript += " Supervisor intervention required."
-    elif resolution_status == 'pending':
-        base_transcript += " Follow-up scheduled."
-
-    words = base_transcript.split()
-    if len(words) > 40:
-        base_transcript = ' '.join(words[:40])
-    elif len(words) < 30:
-        padding = [
-            "Additional notes added.",
-            "Customer database updated.",
-            "Ticket created for tracking.",
-            "Quality assurance reviewed.",
-            "Standard procedures followed.",
-        ]
-        while len(words) < 30:
-            words.extend(random.choice(padding).split())
-        base_transcript = ' '.join(words[:40])
+def format_response(response: Any, result_format: Optional[str]) -> Any:
+    """Re-encode a ``{"result": [dict, ...]}`` response as columnar when asked to."""
+    if result_format == "columnar" and isinstance(response, dict):
+        result = response.get("result")
+        if isinstance(result, list) and all(isinstance(r, dict) for r in result):
+            return {**response, "result": records_to_columnar(result)}
+    return response
+
+
+def _bad_result_format(kwargs: dict) -> Optional[dict]:
+    result_format = kwargs.get("result_format")
+    if result_format is not None and result_format not in RESULT_FORMATS:
+        return {"sql": None, "result": f"❌ Unknown result_format '{result_format}'. Use one of {list(RESULT_FORMATS)}."}
+    return None
+
+
+def query_tool(backend: str):
+    """Expose a planning function as a tool coroutine that executes the QueryPlan it returns."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            error = _bad_result_format(kwargs)
+            if error is not None:
+                return error
+            plan = fn(*args, **kwargs)
+            if isinstance(plan, PlanGroup):
+                return await execute_group(backend, fn.__name__, plan, kwargs.get("result_format"))
+            if not isinstance(plan, QueryPlan):
+                return plan
+            if plan.chunk_size and kwargs.get("ctx") is not None:
+                plan.progress = _progress_reporter(kwargs["ctx"])
+            try:
+                return format_response(await execute_governed(backend, fn.__name__, plan), kwargs.get("result_format"))
+            except DBQueueTimeout as e:
+                return {"sql": None, "result": f"❌ {e}"}
+        return wrapper
+    return decorator
+
+
+def offload(backend: str, planner=None):
+    """Expose a blocking tool body as a coroutine that runs on the DB executor.
+
+    The body runs inside a DBSession, so it and every helper it calls share one
+    connection per backend and commit once when the body returns.
+    ``planner`` takes the tool's keyword arguments and returns a QueryPlan for
+    single-statement reads, a response dict for requests it can answer without
+    the database, or None to fall back to the blocking body.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            error = _bad_result_format(kwargs)
+            if error is not None:
+                return error
+            result_format = kwargs.get("result_format")
+            try:
+                if planner is not None:
+                    plan = planner(**kwargs)
+                    if isinstance(plan, QueryPlan):
+                        return format_response(await execute_governed(backend, fn.__name__, plan), result_format)
+                    if plan is not None:
+                        return plan
+                response = await db_executor.run(backend, run_in_session, SESSION_OPENERS, SESSION_CURSOR_KWARGS,
+                                                 fn, *args, **kwargs)
+                return format_response(response, result_format)
+            except DBQueueTimeout as e:
+                return {"sql": None, "result": f"❌ {e}"}
+        return wrapper
+    return decorator
+
 
-    return base_transcript
+mcp = FastMCP("CRUDServer", tool_serializer=dumps)
 
 
-def seed_databases():
+def seed_mysql():
     root_cnx = get_mysql_conn(db=None)
     root_cur = root_cnx.cursor()
     root_cur.execute(f"CREATE DATABASE IF NOT EXISTS `{MYSQL_DB}`;")
@@ -254,17 +427,29 @@ def seed_databases():
     sql_cur.execute("DROP TABLE IF EXISTS Customers;")
     sql_cur.execute("DROP TABLE IF EXISTS CarePlan;")
     sql_cur.execute("DROP TABLE IF EXISTS CallLogs;")
+    sql_cur.execute("DROP TABLE IF EXISTS CallLogRollup;")
+    sql_cur.execute("DROP TABLE IF EXISTS CallTermDaily;")
+    sql_cur.execute("DROP TABLE IF EXISTS CallTermTotals;")
+    sql_cur.execute("DROP TABLE IF EXISTS CallTermPending;")
+    sql_cur.execute("DROP TABLE IF EXISTS DataVersion;")
+    sql_cur.execute("DROP TABLE IF EXISTS SyncState;")
     sql_cur.execute("SET FOREIGN_KEY_CHECKS = 1;")
 
     sql_cur.execute("""
                     CREATE TABLE Customers
                     (
-                        Id        INT AUTO_INCREMENT PRIMARY KEY,
-                        FirstName VARCHAR(50) NOT NULL,
-                        LastName  VARCHAR(50) NOT NULL,
-                        Name      VARCHAR(100) NOT NULL,
-                        Email     VARCHAR(100),
-                        CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        Id            INT AUTO_INCREMENT PRIMARY KEY,
+                        FirstName     VARCHAR(50) NOT NULL,
+                        LastName      VARCHAR(50) NOT NULL,
+                        Name          VARCHAR(100) NOT NULL,
+                        Email         VARCHAR(100),
+                        CreatedAt     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        NameNorm      VARCHAR(100) AS (LOWER(TRIM(Name))) STORED,
+                        FirstNameNorm VARCHAR(50) AS (LOWER(TRIM(FirstName))) STORED,
+                        LastNameNorm  VARCHAR(50) AS (LOWER(TRIM(LastName))) STORED,
+                        INDEX idx_name_norm (NameNorm),
+                        INDEX idx_first_name_norm (FirstNameNorm),
+                        INDEX idx_last_name_norm (LastNameNorm)
                     );
                     """)
 
@@ -281,7 +466,8 @@ def seed_databases():
                         id          INT PRIMARY KEY,
                         name        VARCHAR(100) NOT NULL,
                         price       DECIMAL(10, 4) NOT NULL,
-                        description TEXT
+                        description TEXT,
+                        DeletedAt   TIMESTAMP NULL DEFAULT NULL
                     );
                     """)
 
@@ -292,6 +478,8 @@ def seed_databases():
          (3, "Tool", 24.99, None)]
     )
 
+    install_sync_state(sql_cur)
+
     sql_cur.execute("""
                     CREATE TABLE Sales
                     (
@@ -302,8 +490,9 @@ def seed_databases():
                         unit_price   DECIMAL(10, 4) NOT NULL,
                         total_price  DECIMAL(10, 4) NOT NULL,
                         sale_date    TIMESTAMP      DEFAULT CURRENT_TIMESTAMP,
+                        INDEX idx_sale_date_id (sale_date, Id),
                         FOREIGN KEY (customer_id) REFERENCES Customers(Id) ON DELETE CASCADE,
-                        FOREIGN KEY (product_id) REFERENCES ProductsCache(id) ON DELETE CASCADE
+                        FOREIGN KEY (product_id) REFERENCES ProductsCache(id)
                     );
                     """)
 
@@ -335,43 +524,9 @@ def seed_databases():
     );
     """)
 
-        # Check if the file exists first
     try:
-        df = pd.read_csv("output.tsv", sep="\t")
-        
-        # Replace 'nan' strings and NaN values with None (which becomes NULL in SQL)
-        df = df.replace('nan', None)
-        df = df.replace({pd.NaT: None, float('nan'): None})
-        
-        insert_sql = """
-                    INSERT INTO CarePlan (
-                        ActualReleaseDate, NameOfYouth, RaceEthnicity, MediCalID,
-                        ResidentialAddress, Telephone, MediCalHealthPlan, HealthScreenings,
-                        HealthAssessments, ChronicConditions, PrescribedMedications,
-                        Notes, CarePlanNotes
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """
-
-        for _, row in df.iterrows():
-            # Convert each value, handling NaN and None properly
-            values = (
-                row.get('ActualReleaseDate') if pd.notna(row.get('ActualReleaseDate')) else None,
-                row.get('NameOfYouth') if pd.notna(row.get('NameOfYouth')) else None,
-                row.get('RaceEthnicity') if pd.notna(row.get('RaceEthnicity')) else None,
-                row.get('MediCalID') if pd.notna(row.get('MediCalID')) else None,
-                row.get('ResidentialAddress') if pd.notna(row.get('ResidentialAddress')) else None,
-                row.get('Telephone') if pd.notna(row.get('Telephone')) else None,
-                row.get('MediCalHealthPlan') if pd.notna(row.get('MediCalHealthPlan')) else None,
-                row.get('HealthScreenings') if pd.notna(row.get('HealthScreenings')) else None,
-                row.get('HealthAssessments') if pd.notna(row.get('HealthAssessments')) else None,
-                row.get('ChronicConditions') if pd.notna(row.get('ChronicConditions')) else None,
-                row.get('PrescribedMedications') if pd.notna(row.get('PrescribedMedications')) else None,
-                row.get('Notes') if pd.notna(row.get('Notes')) else None,
-                row.get('CarePlanNotes') if pd.notna(row.get('CarePlanNotes')) else None
-            )
-            
-            sql_cur.execute(insert_sql, values)
-            
+        report = load_careplan_tsv(sql_cur, "output.tsv")
+        print(f"✅ Loaded {report['rows']} CarePlan rows in {report['seconds']}s ({report['rows_per_sec']} rows/s)")
     except FileNotFoundError:
         print("⚠️  output.tsv file not found. Skipping CarePlan data seeding.")
     except Exception as e:
@@ -400,64 +555,27 @@ def seed_databases():
             FULLTEXT INDEX idx_transcript (CallTranscript)
         );
     """)
-
-    call_log_data = []
-    agents = ['Sarah Chen', 'Mike Johnson', 'Emily Davis', 'James Wilson',
-              'Lisa Anderson', 'David Martinez', 'Jennifer Brown', 'Robert Taylor']
-    call_types = ['inbound', 'outbound', 'transfer']
-    call_statuses = ['completed', 'dropped', 'voicemail']
-    issue_categories = ['billing', 'technical', 'product_inquiry', 'complaint',
-                        'order_status', 'account', 'refund', 'general']
-    resolution_statuses = ['resolved', 'escalated', 'pending', 'follow_up']
-
-    base_date = datetime.now() - timedelta(days=90)
-
-    for i in range(300):
-        call_date = base_date + timedelta(
-            days=random.randint(0, 89),
-            hours=random.randint(8, 20),
-            minutes=random.randint(0, 59)
-        )
-
-        agent = random.choice(agents)
-        duration = random.randint(30, 1800)
-        issue = random.choice(issue_categories)
-        resolution = random.choice(resolution_statuses)
-        sentiment = round(random.uniform(-0.5, 1.0), 2)
-
-        transcript = generate_call_transcript(issue, resolution, sentiment, agent, duration)
-
-        call_notes = f"Customer called regarding {issue} issue. {random.choice(['Issue resolved successfully.', 'Escalated to supervisor.', 'Follow-up required.', 'Customer satisfied with resolution.'])}"
-
-        call_log_data.append((
-            call_date,
-            random.randint(1, 3),
-            agent,
-            duration,
-            random.choice(call_types),
-            random.choice(call_statuses),
-            issue,
-            resolution,
-            sentiment,
-            call_notes,
-            transcript,
-            random.randint(0, 300),
-            random.randint(0, 3)
-        ))
-
-    sql_cur.executemany("""
-        INSERT INTO CallLogs (CallDate, CustomerID, AgentName, CallDuration, CallType,
-                             CallStatus, IssueCategory, ResolutionStatus, SentimentScore,
-                             CallNotes, CallTranscript, WaitTime, TransferCount)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """, call_log_data)
-
+    install_lexicon(sql_cur)
+    install_rollup(sql_cur)
+    install_term_index(sql_cur)
+    install_data_version(sql_cur)
+
+    # The demo's 300 calls over the last 90 days, drawn by the load-test generator.
+    demo = GenSpec(customers=3, products=3, sales=3, calllogs=300, end=datetime.now(), history_days=90)
+    load_mysql(sql_cur, "calllogs", generate_chunk(demo, "calllogs", 0, 1, demo.calllogs))
+    while fold_pending_terms(sql_cur):
+        pass
+
+    record_version(sql_cur, "mysql", "mysql", SCHEMA_VERSION)
     sql_cnx.close()
 
+
+def seed_products():
     pg_cnxn = get_pg_conn()
     pg_cnxn.autocommit = True
     pg_cur = pg_cnxn.cursor()
     pg_cur.execute("DROP TABLE IF EXISTS products CASCADE;")
+    pg_cur.execute("DROP TABLE IF EXISTS products_changes;")
     pg_cur.execute("""
                    CREATE TABLE products
                    (
@@ -467,14 +585,16 @@ def seed_databases():
                        description TEXT
                    );
                    """)
-    pg_cur.executemany(
-        "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)",
-        [("Widget", 9.99, "A standard widget."),
-         ("Gadget", 14.99, "A useful gadget."),
-         ("Tool", 24.99, "A handy tool.")]
-    )
+    install_change_capture(pg_cur)
+    copy_rows(pg_cur, "products", ["name", "price", "description"],
+              [("Widget", 9.99, "A standard widget."),
+               ("Gadget", 14.99, "A useful gadget."),
+               ("Tool", 24.99, "A handy tool.")])
+    record_version(pg_cur, "postgres", "postgres", SCHEMA_VERSION)
     pg_cnxn.close()
 
+
+def seed_sales():
     sales_cnxn = get_pg_sales_conn()
     sales_cnxn.autocommit = True
     sales_cur = sales_cnxn.cursor()
@@ -491,15 +611,55 @@ def seed_databases():
                           sale_date    TIMESTAMP               DEFAULT CURRENT_TIMESTAMP
                       );
                       """)
-    sales_cur.executemany(
-        "INSERT INTO sales (customer_id, product_id, quantity, unit_price, total_amount) VALUES (%s, %s, %s, %s, %s)",
-        [(1, 1, 2, 9.99, 19.98),
-         (2, 2, 1, 14.99, 14.99),
-         (3, 3, 3, 24.99, 74.97)]
-    )
+    copy_rows(sales_cur, "sales", ["customer_id", "product_id", "quantity", "unit_price", "total_amount"],
+              [(1, 1, 2, 9.99, 19.98),
+               (2, 2, 1, 14.99, 14.99),
+               (3, 3, 3, 24.99, 74.97)])
+    record_version(sales_cur, "postgres", "pg_sales", SCHEMA_VERSION)
     sales_cnxn.close()
 
 
+# Bump when a seed_* function changes its schema or seed data: on the next start,
+# backends recorded at an older version are dropped and re-seeded.
+SCHEMA_VERSION = 4
+# "auto" seeds only backends not yet at SCHEMA_VERSION, "force" re-seeds all of them, "off" never seeds.
+SEED_MODE = os.getenv("SEED_MODE", "auto").lower()
+
+# backend -> (open a connection, version-table dialect, seeder)
+SEEDERS = {
+    "mysql": (get_mysql_conn, "mysql", seed_mysql),
+    "postgres": (get_pg_conn, "postgres", seed_products),
+    "pg_sales": (get_pg_sales_conn, "postgres", seed_sales),
+}
+
+
+def _seed_backend(backend: str, force: bool) -> str:
+    connect, dialect, seed = SEEDERS[backend]
+    if not force:
+        try:
+            conn = connect()
+        except Exception:
+            version = None  # e.g. the MySQL database doesn't exist yet
+        else:
+            try:
+                version = seeded_version(conn, dialect, backend)
+            finally:
+                conn.close()
+        if version == SCHEMA_VERSION:
+            return "current"
+    seed()
+    return "seeded"
+
+
+def seed_databases(mode: str = "force") -> dict:
+    """Seed the MySQL, Postgres and Postgres-sales backends concurrently; returns what each one did."""
+    if mode == "off":
+        return {}
+    with ThreadPoolExecutor(max_workers=len(SEEDERS), thread_name_prefix="seed") as pool:
+        futures = {backend: pool.submit(_seed_backend, backend, mode == "force") for backend in SEEDERS}
+        return {backend: future.result() for backend, future in futures.items()}
+
+
 def get_customer_id_by_name(name: str) -> Optional[int]:
     conn = get_mysql_conn()
     cursor = conn.cursor()
@@ -518,19 +678,77 @@ def get_product_id_by_name(name: str) -> Optional[int]:
     return result[0] if result else None
 
 
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "300"))
+
+# Customer Id -> Name, product id -> {"name", "price"}, and lookup-by-name results.
+customer_cache = EntityCache("customers", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
+product_cache = EntityCache("products", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
+customer_name_cache = EntityCache("customer_names", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
+product_name_cache = EntityCache("product_names", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL)
+
+
+def _customer_ids_in(lookup: dict) -> set:
+    if lookup.get("multiple_matches"):
+        return {m["id"] for m in lookup["matches"]}
+    return {lookup["customer_id"]} if lookup.get("found") else set()
+
+
+def invalidate_customer(customer_id: int = None, name: str = None, first_name: str = None, last_name: str = None):
+    """Drop cached entries touched by a Customers write once the write commits.
+
+    Pass ``customer_id`` for updates/deletes of an existing row and the new
+    row's names for inserts, which can change any name lookup they match.
+    """
+    def invalidate():
+        if customer_id is not None:
+            customer_cache.invalidate(customer_id)
+            customer_name_cache.invalidate_where(lambda key, value: customer_id in _customer_ids_in(value))
+            customer_name_index.mark_stale(customer_id)
+        if name is not None:
+            customer_name_index.mark_stale()
+            names = [n.lower() for n in (name, first_name, last_name) if n]
+            customer_name_cache.invalidate_where(lambda key, value: any(key.lower() in n for n in names))
+
+    on_commit(invalidate)
+
+
+def invalidate_product(product_id: int = None, name: str = None, names: list = None):
+    """Drop cached entries touched by a products write once the write commits."""
+    written = [n.lower() for n in ([name] if name is not None else []) + (names or [])]
+
+    def invalidate():
+        if product_id is not None:
+            product_cache.invalidate(product_id)
+            product_name_cache.invalidate_where(lambda key, value: value.get("id") == product_id)
+        if written:
+            product_name_cache.invalidate_where(lambda key, value: any(key.lower() in n for n in written))
+        products_sync.wake()
+
+    on_commit(invalidate)
+
+
 def get_customer_name(customer_id: int) -> str:
+    cached = customer_cache.get(customer_id)
+    if cached is not MISS:
+        return cached
     try:
         mysql_cnxn = get_mysql_conn()
         mysql_cur = mysql_cnxn.cursor()
         mysql_cur.execute("SELECT Name FROM Customers WHERE Id = %s", (customer_id,))
         result = mysql_cur.fetchone()
         mysql_cnxn.close()
+        if result:
+            customer_cache.set(customer_id, result[0])
         return result[0] if result else f"Unknown Customer ({customer_id})"
     except Exception:
         return f"Unknown Customer ({customer_id})"
 
 
 def get_product_details(product_id: int) -> dict:
+    cached = product_cache.get(product_id)
+    if cached is not MISS:
+        return dict(cached)
     try:
         pg_cnxn = get_pg_conn()
         pg_cur = pg_cnxn.cursor()
@@ -538,7 +756,9 @@ def get_product_details(product_id: int) -> dict:
         result = pg_cur.fetchone()
         pg_cnxn.close()
         if result:
-            return {"name": result[0], "price": float(result[1])}
+            details = {"name": result[0], "price": float(result[1])}
+            product_cache.set(product_id, details)
+            return dict(details)
         else:
             return {"name": f"Unknown Product ({product_id})", "price": 0.0}
     except Exception:
@@ -546,116 +766,196 @@ def get_product_details(product_id: int) -> dict:
 
 
 def validate_customer_exists(customer_id: int) -> bool:
+    # Fetching the name instead of COUNT(*) lets the follow-up get_customer_name hit the cache.
+    if customer_cache.get(customer_id) is not MISS:
+        return True
     try:
         mysql_cnxn = get_mysql_conn()
         mysql_cur = mysql_cnxn.cursor()
-        mysql_cur.execute("SELECT COUNT(*) FROM Customers WHERE Id = %s", (customer_id,))
+        mysql_cur.execute("SELECT Name FROM Customers WHERE Id = %s", (customer_id,))
         result = mysql_cur.fetchone()
         mysql_cnxn.close()
-        return result[0] > 0 if result else False
+        if result:
+            customer_cache.set(customer_id, result[0])
+        return result is not None
     except Exception:
         return False
 
 
 def validate_product_exists(product_id: int) -> bool:
+    if product_cache.get(product_id) is not MISS:
+        return True
     try:
         pg_cnxn = get_pg_conn()
         pg_cur = pg_cnxn.cursor()
-        pg_cur.execute("SELECT COUNT(*) FROM products WHERE id = %s", (product_id,))
+        pg_cur.execute("SELECT name, price FROM products WHERE id = %s", (product_id,))
         result = pg_cur.fetchone()
         pg_cnxn.close()
-        return result[0] > 0 if result else False
+        if result:
+            product_cache.set(product_id, {"name": result[0], "price": float(result[1])})
+        return result is not None
     except Exception:
         return False
 
 
-def find_customer_by_name_enhanced(name: str) -> dict:
-    try:
-        mysql_cnxn = get_mysql_conn()
-        mysql_cur = mysql_cnxn.cursor()
-        all_matches = []
-        mysql_cur.execute("SELECT Id, Name, Email FROM Customers WHERE LOWER(Name) = LOWER(%s)", (name,))
-        exact_matches = mysql_cur.fetchall()
-
-        if exact_matches:
-            if len(exact_matches) == 1:
-                mysql_cnxn.close()
-                return {
-                    "found": True,
-                    "multiple_matches": False,
-                    "customer_id": exact_matches[0][0],
-                    "customer_name": exact_matches[0][1],
-                    "customer_email": exact_matches[0][2]
-                }
-            else:
-                for match in exact_matches:
-                    all_matches.append({
-                        "id": match[0],
-                        "name": match[1],
-                        "email": match[2],
-                        "match_type": "exact_full_name"
-                    })
-
-        if not exact_matches:
-            mysql_cur.execute("""
-                SELECT Id, Name, Email FROM Customers
-                WHERE LOWER(FirstName) = LOWER(%s)
-                   OR LOWER(LastName) = LOWER(%s)
-            """, (name, name))
-            name_matches = mysql_cur.fetchall()
-
-            for match in name_matches:
-                all_matches.append({
-                    "id": match[0],
-                    "name": match[1],
-                    "email": match[2],
-                    "match_type": "exact_name_part"
-                })
-
-        if not all_matches:
-            mysql_cur.execute("""
-                SELECT Id, Name, Email FROM Customers
-                WHERE LOWER(Name) LIKE LOWER(%s)
-                   OR LOWER(FirstName) LIKE LOWER(%s)
-                   OR LOWER(LastName) LIKE LOWER(%s)
-            """, (f"%{name}%", f"%{name}%", f"%{name}%"))
-            partial_matches = mysql_cur.fetchall()
-
-            for match in partial_matches:
-                all_matches.append({
-                    "id": match[0],
-                    "name": match[1],
-                    "email": match[2],
-                    "match_type": "partial"
-                })
+def get_existing_customer_ids(customer_ids) -> set:
+    result = set()
+    missing = []
+    for customer_id in customer_ids:
+        if customer_cache.get(customer_id) is not MISS:
+            result.add(customer_id)
+        else:
+            missing.append(customer_id)
+    if not missing:
+        return result
+    mysql_cnxn = get_mysql_conn()
+    mysql_cur = mysql_cnxn.cursor()
+    placeholders = ", ".join(["%s"] * len(missing))
+    mysql_cur.execute(f"SELECT Id, Name FROM Customers WHERE Id IN ({placeholders})", missing)
+    for r in mysql_cur.fetchall():
+        customer_cache.set(r[0], r[1])
+        result.add(r[0])
+    mysql_cnxn.close()
+    return result
+
+
+def get_products_details(product_ids) -> dict:
+    result = {}
+    missing = []
+    for product_id in product_ids:
+        cached = product_cache.get(product_id)
+        if cached is not MISS:
+            result[product_id] = dict(cached)
+        else:
+            missing.append(product_id)
+    if not missing:
+        return result
+    pg_cnxn = get_pg_conn()
+    pg_cur = pg_cnxn.cursor()
+    pg_cur.execute("SELECT id, name, price FROM products WHERE id = ANY(%s)", (missing,))
+    for r in pg_cur.fetchall():
+        details = {"name": r[1], "price": float(r[2])}
+        product_cache.set(r[0], details)
+        result[r[0]] = dict(details)
+    pg_cnxn.close()
+    return result
+
+
+def get_synced_products(product_ids) -> dict:
+    """Products a Sales row may reference: live rows of the MySQL ProductsCache, which the FK points at."""
+    if not product_ids:
+        return {}
+    mysql_cnxn = get_mysql_conn()
+    mysql_cur = mysql_cnxn.cursor()
+    placeholders = ", ".join(["%s"] * len(product_ids))
+    mysql_cur.execute(f"SELECT id, name, price FROM ProductsCache WHERE id IN ({placeholders}) AND DeletedAt IS NULL",
+                      list(product_ids))
+    result = {r[0]: {"name": r[1], "price": float(r[2])} for r in mysql_cur.fetchall()}
+    mysql_cnxn.close()
+    return result
+
+
+def _cacheable_lookup(lookup: dict) -> bool:
+    return lookup.get("found") or not lookup.get("error", "").startswith("Database error")
 
-        mysql_cnxn.close()
 
-        if not all_matches:
-            return {"found": False, "error": f"Customer '{name}' not found"}
+def find_customer_by_name_enhanced(name: str) -> dict:
+    return customer_name_cache.get_or_load(name, lambda: _find_customer_by_name(name), _cacheable_lookup)
+
+
+def _load_customer_names(ids: list = None, after_id: int = None) -> list:
+    mysql_cnxn = get_mysql_conn()
+    mysql_cur = mysql_cnxn.cursor()
+    sql = "SELECT Id, FirstName, LastName, Name, Email FROM Customers"
+    params = []
+    if ids is not None or after_id is not None:
+        clauses = ["Id > %s"]
+        params.append(after_id or 0)
+        if ids:
+            clauses.append(f"Id IN ({', '.join(['%s'] * len(ids))})")
+            params.extend(ids)
+        sql += " WHERE " + " OR ".join(clauses)
+    mysql_cur.execute(sql, params)
+    rows = mysql_cur.fetchall()
+    mysql_cnxn.close()
+    return rows
+
+
+CUSTOMER_NAME_INDEX = os.getenv("CUSTOMER_NAME_INDEX", "1") == "1"
+customer_name_index = CustomerNameIndex(
+    _load_customer_names,
+    poll_interval=float(os.getenv("CUSTOMER_NAME_INDEX_POLL", "5")),
+    full_reload_interval=float(os.getenv("CUSTOMER_NAME_INDEX_RELOAD", "600")),
+)
+
+
+def _search_customers_sql(name: str) -> list[dict]:
+    # Over the indexed *Norm columns; only the best-ranked tier is kept. Prefix
+    # patterns stay index ranges and cover every exact match, so the substring
+    # scan (a leading wildcard reads all of Customers) only runs when they find nothing.
+    query = normalize(name)
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    mysql_cnxn = get_mysql_conn()
+    mysql_cur = mysql_cnxn.cursor()
+    for pattern in (escaped + "%", "%" + escaped + "%"):
+        mysql_cur.execute("""
+            SELECT Id, Name, Email,
+                   CASE WHEN NameNorm = %s THEN 0
+                        WHEN FirstNameNorm = %s OR LastNameNorm = %s THEN 1
+                        ELSE 2 END AS MatchRank
+            FROM Customers
+            WHERE NameNorm LIKE %s OR FirstNameNorm LIKE %s OR LastNameNorm LIKE %s
+            ORDER BY MatchRank, Id
+        """, (query, query, query, pattern, pattern, pattern))
+        rows = mysql_cur.fetchall()
+        if rows:
+            break
+    mysql_cnxn.close()
+    match_types = {rank: match_type for match_type, rank in MATCH_RANKS.items()}
+    return [
+        {"id": r[0], "name": r[1], "email": r[2], "match_type": match_types[r[3]]}
+        for r in rows if r[3] == rows[0][3]
+    ]
+
+
+def _search_customers(name: str) -> list[dict]:
+    if CUSTOMER_NAME_INDEX:
+        return customer_name_index.search(name)
+    return _search_customers_sql(name)
+
+
+def _find_customer_by_name(name: str) -> dict:
+    try:
+        all_matches = _search_customers(name)
+    except Exception as e:
+        return {"found": False, "error": f"Database error: {str(e)}"}
 
-        if len(all_matches) == 1:
-            match = all_matches[0]
-            return {
-                "found": True,
-                "multiple_matches": False,
-                "customer_id": match["id"],
-                "customer_name": match["name"],
-                "customer_email": match["email"]
-            }
+    if not all_matches:
+        return {"found": False, "error": f"Customer '{name}' not found"}
 
+    if len(all_matches) == 1:
+        match = all_matches[0]
         return {
             "found": True,
-            "multiple_matches": True,
-            "matches": all_matches,
-            "error": f"Multiple customers found matching '{name}'"
+            "multiple_matches": False,
+            "customer_id": match["id"],
+            "customer_name": match["name"],
+            "customer_email": match["email"]
         }
 
-    except Exception as e:
-        return {"found": False, "error": f"Database error: {str(e)}"}
+    return {
+        "found": True,
+        "multiple_matches": True,
+        "matches": all_matches,
+        "error": f"Multiple customers found matching '{name}'"
+    }
 
 
 def find_product_by_name(name: str) -> dict:
+    return product_name_cache.get_or_load(name, lambda: _find_product_by_name(name), _cacheable_lookup)
+
+
+def _find_product_by_name(name: str) -> dict:
     try:
         pg_cnxn = get_pg_conn()
         pg_cur = pg_cnxn.cursor()
@@ -687,8 +987,61 @@ def find_product_by_name(name: str) -> dict:
         return {"found": False, "error": f"Database error: {str(e)}"}
 
 
+def _sqlserver_read_plan(operation: str, name: str = None, limit: int = 10, table_name: str = None, **_):
+    if operation == "read":
+        if name:
+            sql_query = """
+                        SELECT Id, FirstName, LastName, Name, Email, CreatedAt
+                        FROM Customers
+                        WHERE LOWER(Name) LIKE LOWER(%s)
+                           OR LOWER(FirstName) LIKE LOWER(%s)
+                           OR LOWER(LastName) LIKE LOWER(%s)
+                        ORDER BY Id ASC
+                        """
+            count_params = (f"%{name}%", f"%{name}%", f"%{name}%")
+        else:
+            sql_query = """
+                        SELECT Id, FirstName, LastName, Name, Email, CreatedAt
+                        FROM Customers
+                        ORDER BY Id ASC
+                        """
+            count_params = ()
+        count_sql = sql_query
+        sql_query += "LIMIT %s\n"
+        params = count_params + (limit,)
+
+        def build(rows):
+            result = convert_rows(["Id", "FirstName", "LastName", "Name", "Email", "CreatedAt"], rows)
+            return {"sql": sql_query, "result": result}
+
+        return QueryPlan(sql_query, params, build, count_sql=count_sql, count_params=count_params)
+
+    elif operation == "describe":
+        table = table_name or "Customers"
+        sql_query = f"DESCRIBE {table}"
+
+        def build(rows):
+            result = [
+                {
+                    "Field": r[0],
+                    "Type": r[1],
+                    "Null": r[2],
+                    "Key": r[3],
+                    "Default": r[4],
+                    "Extra": r[5]
+                }
+                for r in rows
+            ]
+            return {"sql": sql_query, "result": result}
+
+        return QueryPlan(sql_query, None, build)
+
+    return None
+
+
 @mcp.tool()
-async def sqlserver_crud(
+@offload("mysql", planner=_sqlserver_read_plan)
+def sqlserver_crud(
         operation: str,
         name: str = None,
         email: str = None,
@@ -696,6 +1049,7 @@ async def sqlserver_crud(
         customer_id: int = None,
         new_email: str = None,
         table_name: str = None,
+        result_format: str = None,
 ) -> Any:
     cnxn = get_mysql_conn()
     cur = cnxn.cursor()
@@ -707,14 +1061,7 @@ async def sqlserver_crud(
 
         search_name = name.strip()
 
-        cur.execute("""
-            SELECT Id, Name, Email FROM Customers
-            WHERE LOWER(Name) = LOWER(%s)
-               OR LOWER(FirstName) = LOWER(%s)
-               OR LOWER(Name) LIKE LOWER(%s)
-        """, (search_name, search_name, f"%{search_name}%"))
-
-        existing_customers = cur.fetchall()
+        existing_customers = [(m["id"], m["name"], m["email"]) for m in _search_customers(search_name)]
 
         if existing_customers:
             customers_without_email = [c for c in existing_customers if not c[2]]
@@ -730,6 +1077,7 @@ async def sqlserver_crud(
                     sql_query = "UPDATE Customers SET Email = %s WHERE Id = %s"
                     cur.execute(sql_query, (email, existing_customer[0]))
                     cnxn.commit()
+                    invalidate_customer(existing_customer[0])
                     cnxn.close()
                     return {"sql": sql_query,
                             "result": f"✅ Email '{email}' added to existing customer '{existing_customer[1]}'."}
@@ -752,45 +1100,10 @@ async def sqlserver_crud(
         sql_query = "INSERT INTO Customers (FirstName, LastName, Name, Email) VALUES (%s, %s, %s, %s)"
         cur.execute(sql_query, (first_name, last_name, name, email))
         cnxn.commit()
+        invalidate_customer(name=name, first_name=first_name, last_name=last_name)
         cnxn.close()
         return {"sql": sql_query, "result": f"✅ New customer '{name}' created with email '{email}'."}
 
-    elif operation == "read":
-        if name:
-            sql_query = """
-                        SELECT Id, FirstName, LastName, Name, Email, CreatedAt
-                        FROM Customers
-                        WHERE LOWER(Name) LIKE LOWER(%s)
-                           OR LOWER(FirstName) LIKE LOWER(%s)
-                           OR LOWER(LastName) LIKE LOWER(%s)
-                        ORDER BY Id ASC
-                        LIMIT %s
-                        """
-            cur.execute(sql_query, (f"%{name}%", f"%{name}%", f"%{name}%", limit))
-        else:
-            sql_query = """
-                        SELECT Id, FirstName, LastName, Name, Email, CreatedAt
-                        FROM Customers
-                        ORDER BY Id ASC
-                        LIMIT %s
-                        """
-            cur.execute(sql_query, (limit,))
-
-        rows = cur.fetchall()
-        result = [
-            {
-                "Id": r[0],
-                "FirstName": r[1],
-                "LastName": r[2],
-                "Name": r[3],
-                "Email": r[4],
-                "CreatedAt": r[5].isoformat()
-            }
-            for r in rows
-        ]
-        cnxn.close()
-        return {"sql": sql_query, "result": result}
-
     elif operation == "update":
         customer_name = None
 
@@ -803,13 +1116,14 @@ async def sqlserver_crud(
                 customer_id = customer_info["customer_id"]
                 customer_name = customer_info["customer_name"]
             except Exception as search_error:
+                name_norm = normalize(name)
                 cur.execute("""
                     SELECT Id, Name FROM Customers
-                    WHERE LOWER(Name) = LOWER(%s)
-                       OR LOWER(FirstName) = LOWER(%s)
-                       OR LOWER(LastName) = LOWER(%s)
+                    WHERE NameNorm = %s
+                       OR FirstNameNorm = %s
+                       OR LastNameNorm = %s
                     LIMIT 1
-                """, (name, name, name))
+                """, (name_norm, name_norm, name_norm))
                 result = cur.fetchone()
 
                 if result:
@@ -840,6 +1154,7 @@ async def sqlserver_crud(
         sql_query = "UPDATE Customers SET Email = %s WHERE Id = %s"
         cur.execute(sql_query, (new_email, customer_id))
         cnxn.commit()
+        invalidate_customer(customer_id)
         cnxn.close()
         return {"sql": sql_query, "result": f"✅ Customer '{customer_name}' email updated to '{new_email}'."}
 
@@ -855,13 +1170,14 @@ async def sqlserver_crud(
                 customer_id = customer_info["customer_id"]
                 customer_name = customer_info["customer_name"]
             except Exception as search_error:
+                name_norm = normalize(name)
                 cur.execute("""
                     SELECT Id, Name FROM Customers
-                    WHERE LOWER(Name) = LOWER(%s)
-                       OR LOWER(FirstName) = LOWER(%s)
-                       OR LOWER(LastName) = LOWER(%s)
+                    WHERE NameNorm = %s
+                       OR FirstNameNorm = %s
+                       OR LastNameNorm = %s
                     LIMIT 1
-                """, (name, name, name))
+                """, (name_norm, name_norm, name_norm))
                 result = cur.fetchone()
 
                 if result:
@@ -881,35 +1197,73 @@ async def sqlserver_crud(
         sql_query = "DELETE FROM Customers WHERE Id = %s"
         cur.execute(sql_query, (customer_id,))
         cnxn.commit()
+        invalidate_customer(customer_id)
         cnxn.close()
         return {"sql": sql_query, "result": f"✅ Customer '{customer_name}' deleted."}
 
-    elif operation == "describe":
-        table = table_name or "Customers"
-        sql_query = f"DESCRIBE {table}"
-        cur.execute(sql_query)
-        rows = cur.fetchall()
-        result = [
-            {
-                "Field": r[0],
-                "Type": r[1],
-                "Null": r[2],
-                "Key": r[3],
-                "Default": r[4],
-                "Extra": r[5]
-            }
-            for r in rows
-        ]
-        cnxn.close()
-        return {"sql": sql_query, "result": result}
-
     else:
         cnxn.close()
         return {"sql": None, "result": f"❌ Unknown operation '{operation}'."}
 
 
+def _postgresql_read_plan(operation: str, name: str = None, limit: int = 10, table_name: str = None, **_):
+    if operation == "read":
+        if name:
+            sql_query = """
+                        SELECT id, name, price, description
+                        FROM products
+                        WHERE LOWER(name) LIKE LOWER(%s)
+                        ORDER BY id ASC
+                        """
+            count_params = (f"%{name}%",)
+        else:
+            sql_query = """
+                        SELECT id, name, price, description
+                        FROM products
+                        ORDER BY id ASC
+                        """
+            count_params = ()
+        count_sql = sql_query
+        sql_query += "LIMIT %s\n"
+        params = count_params + (limit,)
+
+        def build(rows):
+            result = convert_rows(["id", "name", "price", "description"], rows)
+            for row in result:
+                row["description"] = row["description"] or ""
+            return {"sql": sql_query, "result": result}
+
+        return QueryPlan(sql_query, params, build, count_sql=count_sql, count_params=count_params)
+
+    elif operation == "describe":
+        table = table_name or "products"
+        sql_query = f"""
+                    SELECT column_name, data_type, is_nullable, column_default
+                    FROM information_schema.columns
+                    WHERE table_name = %s
+                    ORDER BY ordinal_position
+                    """
+
+        def build(rows):
+            result = [
+                {
+                    "Column": r[0],
+                    "Type": r[1],
+                    "Nullable": r[2],
+                    "Default": r[3]
+                }
+                for r in rows
+            ]
+            return {"sql": sql_query, "result": result}
+
+        return QueryPlan(sql_query, (table,), build)
+
+    return None
+
+
 @mcp.tool()
-async def postgresql_crud(
+@offload("postgres", planner=_postgresql_read_plan)
+def postgresql_crud(
         operation: str,
         name: str = None,
         price: float = None,
@@ -918,48 +1272,42 @@ async def postgresql_crud(
         product_id: int = None,
         new_price: float = None,
         table_name: str = None,
+        products: list[dict] = None,
+        result_format: str = None,
 ) -> Any:
     cnxn = get_pg_conn()
     cur = cnxn.cursor()
 
-    if operation == "create":
+    if operation == "bulk_create":
+        if not products:
+            cnxn.close()
+            return {"sql": None, "result": "❌ 'products' (a list of {name, price, description}) required for bulk_create."}
+        missing = [i for i, p in enumerate(products)
+                   if not isinstance(p, dict) or not isinstance(p.get("name"), str) or not p["name"]
+                   or p.get("price") is None]
+        if missing:
+            cnxn.close()
+            return {"sql": None, "result": f"❌ Every product must be an object with 'name' and 'price' (invalid at {missing[:10]})."}
+        sql_query = "COPY products (name, price, description) FROM STDIN"
+        count = copy_rows(cur, "products", ["name", "price", "description"],
+                          ((p["name"], p["price"], p.get("description")) for p in products))
+        cnxn.commit()
+        invalidate_product(names=[p["name"] for p in products])
+        cnxn.close()
+        return {"sql": sql_query, "result": f"✅ {count} products added."}
+
+    elif operation == "create":
         if not name or price is None:
             cnxn.close()
             return {"sql": None, "result": "❌ 'name' and 'price' required for create."}
         sql_query = "INSERT INTO products (name, price, description) VALUES (%s, %s, %s)"
         cur.execute(sql_query, (name, price, description))
         cnxn.commit()
+        invalidate_product(name=name)
         result = f"✅ Product '{name}' added with price ${price:.2f}."
         cnxn.close()
         return {"sql": sql_query, "result": result}
 
-    elif operation == "read":
-        if name:
-            sql_query = """
-                        SELECT id, name, price, description
-                        FROM products
-                        WHERE LOWER(name) LIKE LOWER(%s)
-                        ORDER BY id ASC
-                        LIMIT %s
-                        """
-            cur.execute(sql_query, (f"%{name}%", limit))
-        else:
-            sql_query = """
-                        SELECT id, name, price, description
-                        FROM products
-                        ORDER BY id ASC
-                        LIMIT %s
-                        """
-            cur.execute(sql_query, (limit,))
-
-        rows = cur.fetchall()
-        result = [
-            {"id": r[0], "name": r[1], "price": float(r[2]), "description": r[3] or ""}
-            for r in rows
-        ]
-        cnxn.close()
-        return {"sql": sql_query, "result": result}
-
     elif operation == "update":
         if not product_id and name:
             product_info = find_product_by_name(name)
@@ -975,6 +1323,7 @@ async def postgresql_crud(
         sql_query = "UPDATE products SET price = %s WHERE id = %s"
         cur.execute(sql_query, (new_price, product_id))
         cnxn.commit()
+        invalidate_product(product_id)
 
         cur.execute("SELECT name FROM products WHERE id = %s", (product_id,))
         product_name = cur.fetchone()
@@ -1002,40 +1351,237 @@ async def postgresql_crud(
         sql_query = "DELETE FROM products WHERE id = %s"
         cur.execute(sql_query, (product_id,))
         cnxn.commit()
+        invalidate_product(product_id)
         cnxn.close()
         return {"sql": sql_query, "result": f"✅ Product '{product_name}' deleted."}
 
-    elif operation == "describe":
-        table = table_name or "products"
-        sql_query = f"""
-                    SELECT column_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    WHERE table_name = %s
-                    ORDER BY ordinal_position
-                    """
-        cur.execute(sql_query, (table,))
-        rows = cur.fetchall()
-        result = [
-            {
-                "Column": r[0],
-                "Type": r[1],
-                "Nullable": r[2],
-                "Default": r[3]
-            }
-            for r in rows
-        ]
-        cnxn.close()
-        return {"sql": sql_query, "result": result}
-
     else:
         cnxn.close()
         return {"sql": None, "result": f"❌ Unknown operation '{operation}'."}
 
 
-@mcp.tool()
-async def sales_crud(
-        operation: str,
-        customer_id: int = None,
+SALES_PAGE_SIZE = int(os.getenv("SALES_PAGE_SIZE", "100"))
+CAREPLAN_PAGE_SIZE = int(os.getenv("CAREPLAN_PAGE_SIZE", "100"))
+
+
+def encode_page_cursor(*values) -> str:
+    """Opaque keyset cursor over the given sort-key values (dates are stored as ISO strings)."""
+    payload = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_page_cursor(token: str) -> list:
+    try:
+        return json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def decode_date_id_cursor(token: str) -> tuple:
+    """(date, id) keyset cursor as written by ``encode_page_cursor(date, id)``."""
+    try:
+        value_date, value_id = decode_page_cursor(token)
+        return (datetime.fromisoformat(value_date) if value_date else None), int(value_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def decode_id_cursor(token: str) -> int:
+    try:
+        (value_id,) = decode_page_cursor(token)
+        return int(value_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def _sales_read_plan(
+        operation: str,
+        display_format: str = None,
+        columns: str = None,
+        where_clause: str = None,
+        filter_conditions: dict = None,
+        limit: int = None,
+        cursor: str = None,
+        **_
+):
+    if operation != "read":
+        return None
+
+    available_columns = {
+        "sale_id": "s.Id",
+        "first_name": "c.FirstName",
+        "last_name": "c.LastName",
+        "customer_name": "c.Name",
+        "product_name": "p.name",
+        "product_description": "p.description",
+        "quantity": "s.quantity",
+        "unit_price": "s.unit_price",
+        "total_price": "s.total_price",
+        "amount": "s.total_price",
+        "sale_date": "s.sale_date",
+        "date": "s.sale_date",
+        "customer_email": "c.Email",
+        "email": "c.Email"
+    }
+
+    selected_columns = []
+    column_aliases = []
+
+    if columns and columns.strip():
+        columns_clean = columns.strip()
+
+        if "," in columns_clean:
+            requested_cols = [col.strip().lower().replace(" ", "_") for col in columns_clean.split(",") if
+                              col.strip()]
+        else:
+            requested_cols = [col.strip().lower().replace(" ", "_") for col in columns_clean.split() if col.strip()]
+
+        for col in requested_cols:
+            matched = False
+            if col in available_columns:
+                selected_columns.append(available_columns[col])
+                column_aliases.append(col)
+                matched = True
+            else:
+                for avail_col, db_col in available_columns.items():
+                    if (col in avail_col or avail_col in col or
+                            col.replace("_", "") in avail_col.replace("_", "") or
+                            avail_col.replace("_", "") in col.replace("_", "")):
+                        selected_columns.append(db_col)
+                        column_aliases.append(avail_col)
+                        matched = True
+                        break
+
+    if not selected_columns:
+        selected_columns = [
+            "s.Id", "c.Name", "p.name", "s.quantity", "s.unit_price", "s.total_price", "s.sale_date", "c.Email"
+        ]
+        column_aliases = [
+            "sale_id", "customer_name", "product_name", "quantity", "unit_price", "total_price", "sale_date",
+            "email"
+        ]
+
+    select_clause = ", ".join([f"{col} AS {alias}" for col, alias in zip(selected_columns, column_aliases)])
+    # Trailing keyset columns for the continuation cursor; build() only reads the aliased ones.
+    select_clause += ", s.sale_date AS page_sale_date, s.Id AS page_sale_id"
+
+    base_sql = f"""
+    SELECT  {select_clause}
+    FROM    Sales          s
+    JOIN    Customers      c ON c.Id = s.customer_id
+    JOIN    ProductsCache  p ON p.id = s.product_id
+    """
+
+    where_sql = ""
+    query_params = []
+
+    if where_clause and where_clause.strip():
+        try:
+            where_conditions, clause_params = compile_sales_filter(where_clause)
+        except FilterCompileError:
+            return {"sql": None, "result": f"❌ Could not understand where_clause '{where_clause}'. "
+                                           "Try e.g. 'total_price > 100', 'quantity < 5' or "
+                                           "\"customer_name = 'Alice Smith'\"."}
+        query_params.extend(clause_params)
+        where_sql = " WHERE " + " AND ".join(where_conditions)
+
+    elif filter_conditions:
+        where_conditions = []
+        for field, value in filter_conditions.items():
+            if field in available_columns:
+                db_field = available_columns[field]
+                if isinstance(value, str):
+                    where_conditions.append(f"{db_field} LIKE %s")
+                    query_params.append(f"%{value}%")
+                else:
+                    where_conditions.append(f"{db_field} = %s")
+                    query_params.append(value)
+
+        if where_conditions:
+            where_sql = " WHERE " + " AND ".join(where_conditions)
+
+    count_sql, count_params = base_sql + where_sql, list(query_params)
+    if cursor:
+        try:
+            after_date, after_id = decode_date_id_cursor(cursor)
+        except ValueError:
+            return {"sql": None, "result": "❌ Invalid or expired 'cursor'."}
+        if after_date is None:
+            keyset_sql = "s.sale_date IS NULL AND s.Id < %s"
+            query_params.append(after_id)
+        else:
+            keyset_sql = "(s.sale_date < %s OR (s.sale_date = %s AND s.Id < %s) OR s.sale_date IS NULL)"
+            query_params.extend([after_date, after_date, after_id])
+        where_sql = (where_sql + " AND " if where_sql else " WHERE ") + keyset_sql
+
+    if limit is not None and limit < 1:
+        return {"sql": None, "result": "❌ 'limit' must be at least 1."}
+    page_size = limit or SALES_PAGE_SIZE
+    order_sql = " ORDER BY s.sale_date DESC, s.Id DESC"
+    # One extra row tells us whether another page exists.
+    limit_sql = f" LIMIT {int(page_size) + 1}"
+
+    sql = base_sql + where_sql + order_sql + limit_sql
+
+    def build(rows):
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_page_cursor(rows[-1][-2], rows[-1][-1])
+
+        processed_results = []
+        for r in rows:
+            row_data = {}
+            for i, alias in enumerate(column_aliases):
+                if i < len(r):
+                    value = r[i]
+
+                    if display_format == "Data Format Conversion":
+                        if "date" in alias or "timestamp" in alias:
+                            value = value.strftime("%Y-%m-%d %H:%M:%S") if value else "N/A"
+                    elif display_format == "Decimal Value Formatting":
+                        if "price" in alias or "total" in alias or "amount" in alias:
+                            value = f"{float(value):.2f}" if value is not None else "0.00"
+                    elif display_format == "Null Value Removal/Handling":
+                        if value is None:
+                            value = "N/A"
+
+                    row_data[alias] = value
+
+            if display_format == "String Concatenation":
+                if "customer_name" in row_data or ("first_name" in row_data and "last_name" in row_data):
+                    if "first_name" in row_data and "last_name" in row_data:
+                        row_data["customer_full_name"] = f"{row_data['first_name']} {row_data['last_name']}"
+
+                if "product_name" in row_data and "product_description" in row_data:
+                    desc = row_data['product_description'] or 'No description'
+                    row_data["product_full_description"] = f"{row_data['product_name']} ({desc})"
+
+                if all(field in row_data for field in ['customer_name', 'quantity', 'product_name', 'total_price']):
+                    row_data["sale_summary"] = (
+                        f"{row_data['customer_name']} bought {row_data['quantity']} "
+                        f"of {row_data['product_name']} for ${float(row_data['total_price']):.2f}"
+                    )
+
+            if display_format == "Null Value Removal/Handling":
+                if any(v is None for v in row_data.values()):
+                    continue
+
+            processed_results.append(row_data)
+
+        return {"sql": sql, "result": processed_results, "next_cursor": next_cursor}
+
+    return QueryPlan(sql, query_params, build,
+                     on_error=lambda e: {"sql": sql, "result": f"❌ SQL Error: {str(e)}"},
+                     continuation=lambda row: encode_page_cursor(row[-2], row[-1]),
+                     count_sql=count_sql, count_params=count_params)
+
+
+@mcp.tool()
+@offload("mysql", planner=_sales_read_plan)
+def sales_crud(
+        operation: str,
+        customer_id: int = None,
         product_id: int = None,
         quantity: int = 1,
         unit_price: float = None,
@@ -1051,19 +1597,25 @@ async def sales_crud(
         columns: str = None,
         where_clause: str = None,
         filter_conditions: dict = None,
-        limit: int = None
+        limit: int = None,
+        items: list[dict] = None,
+        cursor: str = None,
+        result_format: str = None
 ) -> Any:
     sales_cnxn = get_mysql_conn()
     sales_cur = sales_cnxn.cursor()
 
     if operation == "create":
         if not customer_id or not product_id:
+            sales_cnxn.close()
             return {"sql": None, "result": "❌ 'customer_id' and 'product_id' required for create."}
 
         if not validate_customer_exists(customer_id):
+            sales_cnxn.close()
             return {"sql": None, "result": f"❌ Customer ID {customer_id} not found."}
 
         if not validate_product_exists(product_id):
+            sales_cnxn.close()
             return {"sql": None, "result": f"❌ Product ID {product_id} not found."}
 
         if not unit_price:
@@ -1098,6 +1650,76 @@ async def sales_crud(
         sales_cnxn.close()
         return {"sql": sql_query, "result": result}
 
+    elif operation == "bulk_create":
+        if not items:
+            sales_cnxn.close()
+            return {"sql": None, "result": "❌ 'items' (list of sales with customer_id and product_id) required for bulk_create."}
+
+        known_customers = get_existing_customer_ids({i.get("customer_id") for i in items if i.get("customer_id")})
+        products = get_synced_products({i.get("product_id") for i in items if i.get("product_id")})
+
+        outcomes = []
+        rows = []
+        created = []
+        for index, item in enumerate(items):
+            item_customer = item.get("customer_id")
+            item_product = item.get("product_id")
+            item_quantity = item.get("quantity") or 1
+
+            if not item_customer or not item_product:
+                outcomes.append({"index": index, "status": "rejected",
+                                 "reason": "'customer_id' and 'product_id' required."})
+                continue
+            if item_customer not in known_customers:
+                outcomes.append({"index": index, "status": "rejected",
+                                 "reason": f"Customer ID {item_customer} not found."})
+                continue
+            if item_product not in products:
+                outcomes.append({"index": index, "status": "rejected",
+                                 "reason": f"Product ID {item_product} not found."})
+                continue
+
+            item_price = item.get("unit_price") or products[item_product]["price"]
+            item_total = item.get("total_amount") or item_price * item_quantity
+            rows.append((item_customer, item_product, item_quantity, item_price, item_total))
+            created.append(len(outcomes))
+            outcomes.append({"index": index, "status": "created", "customer_id": item_customer,
+                             "product_id": item_product, "product_name": products[item_product]["name"],
+                             "quantity": item_quantity, "unit_price": item_price,
+                             "total_amount": round(item_total, 2)})
+
+        sql_query = None
+        if rows:
+            sql_query = ("INSERT INTO Sales (customer_id, product_id, quantity, unit_price, total_price) VALUES "
+                         + ", ".join(["(%s, %s, %s, %s, %s)"] * len(rows)))
+            try:
+                sales_cur.execute(sql_query, [value for row in rows for value in row])
+            except Exception:
+                # A row went stale between validation and the INSERT (e.g. its product was
+                # soft-deleted); the statement wrote nothing, so insert row by row instead.
+                sql_query = ("INSERT INTO Sales (customer_id, product_id, quantity, unit_price, total_price) "
+                             "VALUES (%s, %s, %s, %s, %s)")
+                for row, position in zip(rows, created):
+                    try:
+                        sales_cur.execute(sql_query, row)
+                    except Exception as e:
+                        outcomes[position] = {"index": outcomes[position]["index"], "status": "failed",
+                                              "reason": str(e)}
+            sales_cnxn.commit()
+
+        count = sum(1 for outcome in outcomes if outcome["status"] == "created")
+        if count == len(items):
+            status = "✅"
+        elif count:
+            status = "⚠️"
+        else:
+            status = "❌"
+        sales_cnxn.close()
+        return {"sql": sql_query, "result": {
+            "summary": f"{status} {count} of {len(items)} sales created.",
+            "items": outcomes,
+        }}
+
     elif operation == "update":
         if not sale_id or new_quantity is None:
             sales_cnxn.close()
@@ -1127,276 +1749,29 @@ async def sales_crud(
         sales_cnxn.close()
         return {"sql": sql_query, "result": result}
 
-    elif operation == "read":
-        mysql_cnxn = get_mysql_conn()
-        mysql_cur = mysql_cnxn.cursor()
-
-        available_columns = {
-            "sale_id": "s.Id",
-            "first_name": "c.FirstName",
-            "last_name": "c.LastName",
-            "customer_name": "c.Name",
-            "product_name": "p.name",
-            "product_description": "p.description",
-            "quantity": "s.quantity",
-            "unit_price": "s.unit_price",
-            "total_price": "s.total_price",
-            "amount": "s.total_price",
-            "sale_date": "s.sale_date",
-            "date": "s.sale_date",
-            "customer_email": "c.Email",
-            "email": "c.Email"
-        }
-
-        selected_columns = []
-        column_aliases = []
-
-        if columns and columns.strip():
-            columns_clean = columns.strip()
-
-            if "," in columns_clean:
-                requested_cols = [col.strip().lower().replace(" ", "_") for col in columns_clean.split(",") if
-                                  col.strip()]
-            else:
-                requested_cols = [col.strip().lower().replace(" ", "_") for col in columns_clean.split() if col.strip()]
-
-            for col in requested_cols:
-                matched = False
-                if col in available_columns:
-                    selected_columns.append(available_columns[col])
-                    column_aliases.append(col)
-                    matched = True
-                else:
-                    for avail_col, db_col in available_columns.items():
-                        if (col in avail_col or avail_col in col or
-                                col.replace("_", "") in avail_col.replace("_", "") or
-                                avail_col.replace("_", "") in col.replace("_", "")):
-                            selected_columns.append(db_col)
-                            column_aliases.append(avail_col)
-                            matched = True
-                            break
-
-        if not selected_columns:
-            selected_columns = [
-                "s.Id", "c.Name", "p.name", "s.quantity", "s.unit_price", "s.total_price", "s.sale_date", "c.Email"
-            ]
-            column_aliases = [
-                "sale_id", "customer_name", "product_name", "quantity", "unit_price", "total_price", "sale_date",
-                "email"
-            ]
-
-        select_clause = ", ".join([f"{col} AS {alias}" for col, alias in zip(selected_columns, column_aliases)])
-
-        base_sql = f"""
-        SELECT  {select_clause}
-        FROM    Sales          s
-        JOIN    Customers      c ON c.Id = s.customer_id
-        JOIN    ProductsCache  p ON p.id = s.product_id
-        """
-
-        where_sql = ""
-        query_params = []
-
-        if where_clause and where_clause.strip():
-            import re
-            clause = where_clause.strip().lower()
-            where_conditions = []
-
-            price_patterns = [
-                r'total[_\s]*price[_\s]*(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)',
-                r'(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)\s*total[_\s]*price',
-                r'total[_\s]*price[_\s]*(<|<=|below|less\s+than|under)\s*\$?(\d+(?:\.\d+)?)',
-                r'total[_\s]*price[_\s]*(=|equals?|is)\s*\$?(\d+(?:\.\d+)?)'
-            ]
-
-            for pattern in price_patterns:
-                match = re.search(pattern, clause)
-                if match:
-                    if len(match.groups()) == 2:
-                        operator_text, value = match.groups()
-                        if any(word in operator_text for word in ['exceed', 'above', 'greater', 'more', '>']):
-                            operator = '>'
-                        elif any(word in operator_text for word in ['below', 'less', 'under', '<']):
-                            operator = '<'
-                        elif any(word in operator_text for word in ['equal', 'is', '=']):
-                            operator = '='
-                        else:
-                            operator = '>'
-
-                        where_conditions.append(f"s.total_price {operator} %s")
-                        query_params.append(float(value))
-                        break
-
-            quantity_patterns = [
-                r'quantity[_\s]*(>|>=|greater\s+than|more\s+than|above)\s*(\d+)',
-                r'quantity[_\s]*(<|<=|less\s+than|below|under)\s*(\d+)',
-                r'quantity[_\s]*(=|equals?|is)\s*(\d+)'
-            ]
-
-            for pattern in quantity_patterns:
-                match = re.search(pattern, clause)
-                if match:
-                    operator_text, value = match.groups()
-                    if any(symbol in operator_text for symbol in ['>', 'greater', 'more', 'above']):
-                        operator = '>'
-                    elif any(symbol in operator_text for symbol in ['<', 'less', 'below', 'under']):
-                        operator = '<'
-                    else:
-                        operator = '='
-
-                    where_conditions.append(f"s.quantity {operator} %s")
-                    query_params.append(int(value))
-                    break
-
-            customer_patterns = [
-                r'customer[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
-                r'customer[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
-                r'customer[_\s]*=[_\s]*["\']([^"\']+)["\']',
-                r'customer[_\s]*name[_\s]*([a-zA-Z\s]+?)(?:\s|$)'
-            ]
-
-            for pattern in customer_patterns:
-                match = re.search(pattern, clause)
-                if match:
-                    name_value = match.group(1).strip()
-                    if 'like' in clause:
-                        where_conditions.append("c.Name LIKE %s")
-                        query_params.append(f"%{name_value}%")
-                    else:
-                        where_conditions.append("c.Name = %s")
-                        query_params.append(name_value)
-                    break
-
-            product_patterns = [
-                r'product[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
-                r'product[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
-                r'product[_\s]*=[_\s]*["\']([^"\']+)["\']'
-            ]
-
-            for pattern in product_patterns:
-                match = re.search(pattern, clause)
-                if match:
-                    product_value = match.group(1).strip()
-                    if 'like' in clause:
-                        where_conditions.append("p.name LIKE %s")
-                        query_params.append(f"%{product_value}%")
-                    else:
-                        where_conditions.append("p.name = %s")
-                        query_params.append(product_value)
-                    break
-
-            if not where_conditions:
-                number_match = re.search(r'\$?(\d+(?:\.\d+)?)', clause)
-                if number_match:
-                    value = float(number_match.group(1))
-                    if any(word in clause for word in ['exceed', 'above', 'greater', 'more']):
-                        where_conditions.append("s.total_price > %s")
-                    elif any(word in clause for word in ['below', 'less', 'under']):
-                        where_conditions.append("s.total_price < %s")
-                    else:
-                        where_conditions.append("s.total_price > %s")
-
-                    query_params.append(value)
-
-            if where_conditions:
-                where_sql = " WHERE " + " AND ".join(where_conditions)
-
-        elif filter_conditions:
-            where_conditions = []
-            for field, value in filter_conditions.items():
-                if field in available_columns:
-                    db_field = available_columns[field]
-                    if isinstance(value, str):
-                        where_conditions.append(f"{db_field} LIKE %s")
-                        query_params.append(f"%{value}%")
-                    else:
-                        where_conditions.append(f"{db_field} = %s")
-                        query_params.append(value)
-
-            if where_conditions:
-                where_sql = " WHERE " + " AND ".join(where_conditions)
-
-        order_sql = " ORDER BY s.sale_date DESC"
-        limit_sql = ""
-        if limit:
-            limit_sql = f" LIMIT {limit}"
-
-        sql = base_sql + where_sql + order_sql + limit_sql
-
-        try:
-            if query_params:
-                mysql_cur.execute(sql, query_params)
-            else:
-                mysql_cur.execute(sql)
-
-            rows = mysql_cur.fetchall()
-        except Exception as e:
-            mysql_cnxn.close()
-            return {"sql": sql, "result": f"❌ SQL Error: {str(e)}"}
-
-        mysql_cnxn.close()
-
-        processed_results = []
-        for r in rows:
-            row_data = {}
-            for i, alias in enumerate(column_aliases):
-                if i < len(r):
-                    value = r[i]
-
-                    if display_format == "Data Format Conversion":
-                        if "date" in alias or "timestamp" in alias:
-                            value = value.strftime("%Y-%m-%d %H:%M:%S") if value else "N/A"
-                    elif display_format == "Decimal Value Formatting":
-                        if "price" in alias or "total" in alias or "amount" in alias:
-                            value = f"{float(value):.2f}" if value is not None else "0.00"
-                    elif display_format == "Null Value Removal/Handling":
-                        if value is None:
-                            value = "N/A"
-
-                    row_data[alias] = value
-
-            if display_format == "String Concatenation":
-                if "customer_name" in row_data or ("first_name" in row_data and "last_name" in row_data):
-                    if "first_name" in row_data and "last_name" in row_data:
-                        row_data["customer_full_name"] = f"{row_data['first_name']} {row_data['last_name']}"
-
-                if "product_name" in row_data and "product_description" in row_data:
-                    desc = row_data['product_description'] or 'No description'
-                    row_data["product_full_description"] = f"{row_data['product_name']} ({desc})"
-
-                if all(field in row_data for field in ['customer_name', 'quantity', 'product_name', 'total_price']):
-                    row_data["sale_summary"] = (
-                        f"{row_data['customer_name']} bought {row_data['quantity']} "
-                        f"of {row_data['product_name']} for ${float(row_data['total_price']):.2f}"
-                    )
-
-            if display_format == "Null Value Removal/Handling":
-                if any(v is None for v in row_data.values()):
-                    continue
-
-            processed_results.append(row_data)
-
-        return {"sql": sql, "result": processed_results}
 
     else:
+        sales_cnxn.close()
         return {"sql": None, "result": f"❌ Unknown operation '{operation}'."}
 
 
 @mcp.tool()
-async def careplan_crud(
+@query_tool("mysql")
+def careplan_crud(
         operation: str,
         columns: str = None,
         where_clause: str = None,
         limit: int = None,
         care_plan_type: str = None,
-        status: str = None
+        status: str = None,
+        stream: bool = False,
+        cursor: str = None,
+        result_format: str = None,
+        ctx: Context = None
 ) -> Any:
     if operation != "read":
         return {"sql": None, "result": "❌ Only 'read' operation is supported for care plans."}
 
-    conn = get_mysql_conn()
-    cur = conn.cursor()
-
     available_columns = {
         "id": "ID",
         "actual_release_date": "ActualReleaseDate",
@@ -1457,6 +1832,9 @@ async def careplan_crud(
         ]
 
     select_clause = ", ".join([f"{db_col} AS {alias}" for db_col, alias in zip(selected_columns, column_aliases)])
+    # Streaming returns one page per call, read in chunks, with a cursor for the next page.
+    streaming = stream or bool(cursor)
+    select_clause += ", ID AS page_id"
     sql = f"SELECT {select_clause} FROM CarePlan WHERE 1=1"
     query_params = []
 
@@ -1464,37 +1842,260 @@ async def careplan_crud(
         # Map the column names in the where_clause to the actual column names in the database
         for col_alias, db_col in available_columns.items():
             where_clause = where_clause.replace(col_alias, db_col)
-        sql += f" AND {where_clause}"
+        sql += f" AND ({where_clause})"
+
+    if limit is not None and limit < 1:
+        return {"sql": None, "result": "❌ 'limit' must be at least 1."}
+    page_size = limit or CAREPLAN_PAGE_SIZE
+    count_sql = sql
+    if streaming:
+        if cursor:
+            try:
+                after_id = decode_id_cursor(cursor)
+            except ValueError:
+                return {"sql": None, "result": "❌ Invalid or expired 'cursor'."}
+            # Inlined (it is an int) so a raw where_clause with LIKE '%x%' is never %-formatted.
+            sql += f" AND ID > {int(after_id)}"
+        sql += f" ORDER BY ID LIMIT {int(page_size) + 1}"
+    else:
+        sql += " ORDER BY ID"
+        if limit:
+            sql += f" LIMIT {limit}"
 
-    if limit:
-        sql += f" LIMIT {limit}"
+    def build(rows):
+        next_cursor = None
+        if streaming and len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_page_cursor(rows[-1][-1])
 
-    try:
-        cur.execute(sql, query_params)
-        rows = cur.fetchall()
-    except Exception as e:
-        conn.close()
-        return {"sql": sql, "result": f"❌ SQL Error: {str(e)}"}
+        results = convert_rows(column_aliases, rows)
 
-    conn.close()
+        if streaming:
+            return {"sql": sql, "result": results, "next_cursor": next_cursor}
+        return {"sql": sql, "result": results}
+
+    return QueryPlan(sql, query_params, build,
+                     on_error=lambda e: {"sql": sql, "result": f"❌ SQL Error: {str(e)}"},
+                     chunk_size=STREAM_CHUNK_SIZE if streaming else None,
+                     continuation=lambda row: encode_page_cursor(row[-1]),
+                     count_sql=count_sql)
+
+
+TOP_KEYWORDS = 5
+
+
+def _calllogs_analysis_plan(analysis_type: str) -> Optional[QueryPlan]:
+    """Plan for one analysis type; build() returns the bare result list."""
+    if analysis_type == "sentiment_by_agent":
+        sql = """
+            SELECT NULLIF(AgentName, '') as AgentName,
+                   SUM(SumSentiment) / SUM(SentimentCalls) as AvgSentiment,
+                   CAST(SUM(Calls) AS SIGNED) as TotalCalls,
+                   CAST(SUM(PositiveCalls) AS SIGNED) as PositiveCalls
+            FROM CallLogRollup
+            GROUP BY AgentName
+            HAVING TotalCalls > 0
+            ORDER BY AvgSentiment DESC
+        """
+
+        def build_result(rows):
+            result = [{"AgentName": r[0], "AvgSentiment": float(r[1]),
+                       "TotalCalls": r[2], "PositiveCalls": r[3]} for r in rows]
+            return result
 
-    results = []
-    for row in rows:
-        row_dict = {}
-        for i, alias in enumerate(column_aliases):
-            if i < len(row):
-                value = row[i]
-                if alias in ["actual_release_date", "created_at", "updated_at"] and value:
-                    value = value.isoformat()
-                row_dict[alias] = value
-        results.append(row_dict)
+    elif analysis_type == "agent_performance":
+        sql = """
+            SELECT NULLIF(AgentName, '') as AgentName,
+                   CAST(SUM(Calls) AS SIGNED) as TotalCalls,
+                   SUM(SumDuration) / SUM(DurationCalls) as AvgCallDuration,
+                   SUM(SumSentiment) / SUM(SentimentCalls) as AvgSentiment,
+                   SUM(CASE WHEN ResolutionStatus = 'resolved' THEN Calls ELSE 0 END) * 100.0 / SUM(Calls) as ResolutionRate,
+                   SUM(SumTransfers) / SUM(TransferCalls) as AvgTransfers
+            FROM CallLogRollup
+            GROUP BY AgentName
+            HAVING TotalCalls > 0
+            ORDER BY ResolutionRate DESC
+        """
+
+        def build_result(rows):
+            result = [{"AgentName": r[0], "TotalCalls": r[1],
+                       "AvgCallDuration": r[2], "AvgSentiment": float(r[3]),
+                       "ResolutionRate": float(r[4]), "AvgTransfers": float(r[5])} for r in rows]
+            return result
+
+    elif analysis_type == "transcript_keywords":
+        # Call counts come from the rollup and keywords from the term index
+        # (folded in by term_index_sync), so no transcript is read at query time.
+        sql = f"""
+            SELECT NULLIF(c.IssueCategory, ''), c.CallCount, k.Term, k.Freq
+            FROM (
+                SELECT IssueCategory, CAST(SUM(Calls) AS SIGNED) AS CallCount
+                FROM CallLogRollup
+                GROUP BY IssueCategory
+                HAVING SUM(Calls) > 0
+            ) c
+            LEFT JOIN (
+                SELECT IssueCategory, Term, Freq
+                FROM (
+                    SELECT IssueCategory, Term, CAST(SUM(Freq) AS SIGNED) AS Freq,
+                           ROW_NUMBER() OVER (PARTITION BY IssueCategory
+                                              ORDER BY SUM(Freq) DESC, Term) AS TermRank
+                    FROM CallTermTotals
+                    GROUP BY IssueCategory, Term
+                    HAVING SUM(Freq) > 0
+                ) ranked
+                WHERE TermRank <= {TOP_KEYWORDS}
+            ) k ON k.IssueCategory = c.IssueCategory
+            ORDER BY c.IssueCategory, k.Freq DESC, k.Term
+        """
+
+        def build_result(rows):
+            result = []
+            for r in rows:
+                if not result or result[-1]["IssueCategory"] != r[0]:
+                    result.append({"IssueCategory": r[0], "CallCount": r[1], "TopKeywords": []})
+                if r[2] is not None:
+                    result[-1]["TopKeywords"].append({"keyword": r[2], "frequency": r[3]})
+            return result
+
+    elif analysis_type == "transcript_sentiment":
+        sql = """
+            SELECT NULLIF(IssueCategory, '') as IssueCategory,
+                   SUM(SumSentiment) / SUM(SentimentCalls) as AvgSentiment,
+                   CAST(SUM(NegativeLanguage) AS SIGNED) as NegativeLanguageCount,
+                   CAST(SUM(PositiveLanguage) AS SIGNED) as PositiveLanguageCount,
+                   CAST(SUM(Calls) AS SIGNED) as TotalCalls
+            FROM CallLogRollup
+            GROUP BY IssueCategory
+            HAVING TotalCalls > 0
+        """
+
+        def build_result(rows):
+            result = [{
+                "IssueCategory": r[0],
+                "AvgSentiment": float(r[1]) if r[1] else 0,
+                "NegativeLanguageCount": r[2],
+                "PositiveLanguageCount": r[3],
+                "TotalCalls": r[4],
+                "PositiveLanguageRate": round((r[3] / r[4]) * 100, 2) if r[4] > 0 else 0,
+                "NegativeLanguageRate": round((r[2] / r[4]) * 100, 2) if r[4] > 0 else 0
+            } for r in rows]
+            return result
+
+    elif analysis_type == "agent_communication":
+        sql = """
+            SELECT NULLIF(AgentName, '') as AgentName,
+                   CAST(SUM(Calls) AS SIGNED) as TotalCalls,
+                   SUM(SumTranscriptLength) / SUM(TranscriptCalls) as AvgTranscriptLength,
+                   CAST(SUM(ApologyLanguage) AS SIGNED) as ApologyCount,
+                   CAST(SUM(SolutionLanguage) AS SIGNED) as SolutionOrientedCount,
+                   CAST(SUM(EscalationLanguage) AS SIGNED) as EscalationMentions,
+                   SUM(SumDuration) / SUM(DurationCalls) as AvgDuration
+            FROM CallLogRollup
+            GROUP BY AgentName
+            HAVING TotalCalls > 0
+            ORDER BY TotalCalls DESC
+        """
+
+        def build_result(rows):
+            result = [{
+                "AgentName": r[0],
+                "TotalCalls": r[1],
+                "AvgTranscriptLength": round(r[2]) if r[2] else 0,
+                "ApologyRate": round((r[3] / r[1]) * 100, 2) if r[1] > 0 else 0,
+                "SolutionOrientedRate": round((r[4] / r[1]) * 100, 2) if r[1] > 0 else 0,
+                "EscalationRate": round((r[5] / r[1]) * 100, 2) if r[1] > 0 else 0,
+                "AvgDuration": r[6]
+            } for r in rows]
+            return result
+
+    elif analysis_type == "problem_patterns":
+        sql = """
+            SELECT NULLIF(IssueCategory, '') as IssueCategory,
+                   NULLIF(ResolutionStatus, '') as ResolutionStatus,
+                   CAST(SUM(Calls) AS SIGNED) as Frequency,
+                   CAST(SUM(RecurringLanguage) AS SIGNED) as RecurringIssueCount,
+                   SUM(SumSentiment) / SUM(SentimentCalls) as AvgSentiment
+            FROM CallLogRollup
+            GROUP BY IssueCategory, ResolutionStatus
+            HAVING Frequency > 5
+            ORDER BY Frequency DESC
+        """
+
+        def build_result(rows):
+            result = [{
+                "IssueCategory": r[0],
+                "ResolutionStatus": r[1],
+                "Frequency": r[2],
+                "RecurringIssueCount": r[3],
+                "RecurringIssueRate": round((r[3] / r[2]) * 100, 2) if r[2] > 0 else 0,
+                "AvgSentiment": float(r[4]) if r[4] else 0
+            } for r in rows]
+            return result
+
+    elif analysis_type == "issue_frequency":
+        sql = """
+            SELECT NULLIF(IssueCategory, '') as IssueCategory,
+                   CAST(SUM(Calls) AS SIGNED) as Frequency,
+                   SUM(SumDuration) / SUM(DurationCalls) as AvgDuration,
+                   SUM(CASE WHEN ResolutionStatus = 'resolved' THEN Calls ELSE 0 END) * 100.0 / SUM(Calls) as ResolutionRate
+            FROM CallLogRollup
+            GROUP BY IssueCategory
+            HAVING Frequency > 0
+            ORDER BY Frequency DESC
+        """
+
+        def build_result(rows):
+            result = [{"IssueCategory": r[0], "Frequency": r[1],
+                       "AvgDuration": r[2], "ResolutionRate": float(r[3])} for r in rows]
+            return result
+
+    elif analysis_type == "call_volume_trends":
+        sql = """
+            SELECT CallDay as Date,
+                   CAST(SUM(Calls) AS SIGNED) as CallCount,
+                   SUM(SumWait) / SUM(WaitCalls) as AvgWaitTime,
+                   SUM(SumDuration) / SUM(DurationCalls) as AvgDuration
+            FROM CallLogRollup
+            GROUP BY CallDay
+            HAVING CallCount > 0
+            ORDER BY Date DESC
+            LIMIT 30
+        """
+
+        def build_result(rows):
+            result = [{"Date": r[0].isoformat(), "CallCount": r[1],
+                       "AvgWaitTime": r[2], "AvgDuration": r[3]} for r in rows]
+            return result
+
+    elif analysis_type == "escalation_analysis":
+        sql = """
+            SELECT NULLIF(IssueCategory, '') as IssueCategory,
+                   CAST(SUM(Calls) AS SIGNED) as TotalCalls,
+                   CAST(SUM(CASE WHEN ResolutionStatus = 'escalated' THEN Calls ELSE 0 END) AS SIGNED) as EscalatedCalls,
+                   SUM(CASE WHEN ResolutionStatus = 'escalated' THEN Calls ELSE 0 END) * 100.0 / SUM(Calls) as EscalationRate
+            FROM CallLogRollup
+            GROUP BY IssueCategory
+            HAVING EscalationRate > 0
+            ORDER BY EscalationRate DESC
+        """
+
+        def build_result(rows):
+            result = [{"IssueCategory": r[0], "TotalCalls": r[1],
+                       "EscalatedCalls": r[2], "EscalationRate": float(r[3])} for r in rows]
+            return result
+
+    else:
+        return None
+
+    return QueryPlan(sql, None, build_result)
 
-    return {"sql": sql, "result": results}
 
 @mcp.tool()
-async def calllogs_crud(
+@query_tool("mysql")
+def calllogs_crud(
         operation: str,
-        analysis_type: str = None,
+        analysis_type: Union[str, list[str]] = None,
         date_range: str = None,
         agent_name: str = None,
         issue_category: str = None,
@@ -1504,12 +2105,15 @@ async def calllogs_crud(
         limit: int = 50,
         search_text: str = None,
         keyword_analysis: bool = False,
-        include_transcripts: bool = True
+        include_transcripts: bool = True,
+        stream: bool = False,
+        cursor: str = None,
+        result_format: str = None,
+        ctx: Context = None
 ) -> Any:
-    conn = get_mysql_conn()
-    cur = conn.cursor()
-
     if operation == "read":
+        if limit is None or limit < 1:
+            return {"sql": None, "result": "❌ 'limit' must be at least 1."}
         available_columns = {
             "log_id": "cl.LogID",
             "call_date": "cl.CallDate",
@@ -1571,6 +2175,9 @@ async def calllogs_crud(
 
         select_clause = ", ".join([f"{col} AS {alias}"
                                    for col, alias in zip(selected_columns, column_aliases)])
+        # Streaming returns one page per call, read in chunks, with a cursor for the next page.
+        streaming = stream or bool(cursor)
+        select_clause += ", cl.CallDate AS page_call_date, cl.LogID AS page_log_id"
 
         sql = f"""
             SELECT {select_clause}
@@ -1597,29 +2204,38 @@ async def calllogs_crud(
             params.append(search_text)
 
         if where_clause and where_clause.strip():
-            sql += f" AND {where_clause}"
-
-        sql += " ORDER BY cl.CallDate DESC LIMIT %s"
-        params.append(limit)
-
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-
-        result = []
-        for r in rows:
-            row_dict = {}
-            for i, alias in enumerate(column_aliases):
-                if i < len(r):
-                    value = r[i]
-                    if alias == "call_date" and value:
-                        value = value.isoformat()
-                    elif alias == "sentiment_score" and value is not None:
-                        value = float(value)
-                    row_dict[alias] = value
-            result.append(row_dict)
-
-        conn.close()
-        return {"sql": sql, "result": result}
+            # params always carries the LIMIT, so literal % in the clause must be escaped.
+            sql += f" AND ({where_clause.replace('%', '%%')})"
+
+        count_sql, count_params = sql, list(params)
+        if streaming:
+            if cursor:
+                try:
+                    after_date, after_id = decode_date_id_cursor(cursor)
+                except ValueError:
+                    return {"sql": None, "result": "❌ Invalid or expired 'cursor'."}
+                sql += " AND (cl.CallDate < %s OR (cl.CallDate = %s AND cl.LogID < %s))"
+                params.extend([after_date, after_date, after_id])
+            sql += " ORDER BY cl.CallDate DESC, cl.LogID DESC LIMIT %s"
+            params.append(limit + 1)
+        else:
+            sql += " ORDER BY cl.CallDate DESC, cl.LogID DESC LIMIT %s"
+            params.append(limit)
+
+        def build(rows):
+            next_cursor = None
+            if streaming and len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_page_cursor(rows[-1][-2], rows[-1][-1])
+            result = convert_rows(column_aliases, rows)
+            if streaming:
+                return {"sql": sql, "result": result, "next_cursor": next_cursor}
+            return {"sql": sql, "result": result}
+
+        return QueryPlan(sql, params, build, chunk_size=STREAM_CHUNK_SIZE if streaming else None,
+                         continuation=lambda row: encode_page_cursor(row[-2], row[-1]),
+                         count_sql=count_sql if count_params else count_sql.replace("%%", "%"),
+                         count_params=count_params or None)
 
     elif operation == "transcript_search":
         sql = """
@@ -1640,252 +2256,121 @@ async def calllogs_crud(
             LIMIT %s
         """
         params = [search_text, search_text, limit]
-        cur.execute(sql, params)
-        rows = cur.fetchall()
 
-        result = []
-        for r in rows:
-            result.append({
-                "LogID": r[0],
-                "CallDate": r[1].isoformat() if r[1] else None,
-                "CustomerName": r[2],
-                "AgentName": r[3],
-                "IssueCategory": r[4],
-                "ResolutionStatus": r[5],
-                "CallTranscript": r[6],
-                "SentimentScore": float(r[7]) if r[7] else 0,
-                "RelevanceScore": float(r[8]) if r[8] else 0
-            })
-
-        conn.close()
-        return {"sql": sql, "result": result}
+        def build(rows):
+            result = convert_rows(["LogID", "CallDate", "CustomerName", "AgentName", "IssueCategory",
+                                   "ResolutionStatus", "CallTranscript", "SentimentScore", "RelevanceScore"], rows)
+            for row in result:
+                row["SentimentScore"] = row["SentimentScore"] or 0
+                row["RelevanceScore"] = row["RelevanceScore"] or 0
+            return {"sql": sql, "result": result}
+
+        count_sql = """
+            SELECT cl.LogID FROM CallLogs cl
+            WHERE MATCH(cl.CallTranscript) AGAINST(%s IN NATURAL LANGUAGE MODE)
+        """
+        return QueryPlan(sql, params, build, cache_key=("transcript_search", search_text, limit),
+                         count_sql=count_sql, count_params=[search_text])
 
     elif operation == "analyze":
-        sql = ""
-
-        if analysis_type == "sentiment_by_agent":
-            sql = """
-                SELECT AgentName,
-                       AVG(SentimentScore) as AvgSentiment,
-                       COUNT(*) as TotalCalls,
-                       SUM(CASE WHEN SentimentScore >= 0.5 THEN 1 ELSE 0 END) as PositiveCalls
-                FROM CallLogs
-                GROUP BY AgentName
-                ORDER BY AvgSentiment DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{"AgentName": r[0], "AvgSentiment": float(r[1]),
-                       "TotalCalls": r[2], "PositiveCalls": r[3]} for r in rows]
+        # A list (or comma-separated string) of types runs them all concurrently in one call.
+        multiple = isinstance(analysis_type, list) or (isinstance(analysis_type, str) and "," in analysis_type)
+        types = analysis_type if isinstance(analysis_type, list) else [analysis_type]
+        if multiple:
+            types = list(dict.fromkeys(t.strip() for item in types for t in str(item).split(",") if t.strip()))
+        plans = {t: _calllogs_analysis_plan(t) for t in types}
+        if not plans or None in plans.values():
+            result = """Unknown analysis type. Available types: 
+                     sentiment_by_agent, issue_frequency, call_volume_trends, 
+                     escalation_analysis, agent_performance, transcript_keywords,
+                     transcript_sentiment, agent_communication, problem_patterns"""
+            return {"sql": "" if analysis_type != None else None, "result": result}
 
-        elif analysis_type == "agent_performance":
-            sql = """
-                SELECT AgentName,
-                       COUNT(*) as TotalCalls,
-                       AVG(CallDuration) as AvgCallDuration,
-                       AVG(SentimentScore) as AvgSentiment,
-                       SUM(CASE WHEN ResolutionStatus = 'resolved' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as ResolutionRate,
-                       AVG(TransferCount) as AvgTransfers
-                FROM CallLogs
-                GROUP BY AgentName
-                ORDER BY ResolutionRate DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{"AgentName": r[0], "TotalCalls": r[1],
-                       "AvgCallDuration": r[2], "AvgSentiment": float(r[3]),
-                       "ResolutionRate": float(r[4]), "AvgTransfers": float(r[5])} for r in rows]
+        def wrap(analysis, plan):
+            return QueryPlan(plan.sql, plan.params, lambda rows: {"sql": plan.sql, "result": plan.build(rows)},
+                             cache_key=("analyze", analysis))
 
-        elif analysis_type == "transcript_keywords":
-            sql = """
-                SELECT 
-                    IssueCategory,
-                    COUNT(*) as CallCount,
-                    GROUP_CONCAT(CallTranscript SEPARATOR ' ') as CombinedTranscripts
-                FROM CallLogs
-                GROUP BY IssueCategory
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
+        if multiple:
+            return PlanGroup({t: wrap(t, plan) for t, plan in plans.items()})
+        return wrap(types[0], plans[types[0]])
 
-            result = []
-            for r in rows:
-                issue_cat = r[0]
-                call_count = r[1]
-                transcripts = r[2] if r[2] else ""
-
-                words = transcripts.lower().split()
-                stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                              'of', 'with', 'by', 'from', 'was', 'were', 'been', 'be', 'have',
-                              'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-                              'is', 'are', 'am', 'customer', 'agent', 'call', 'called'}
-
-                filtered_words = [w for w in words if w not in stop_words and len(w) > 3]
-                word_freq = {}
-                for word in filtered_words:
-                    word_freq[word] = word_freq.get(word, 0) + 1
-
-                top_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:5]
-
-                result.append({
-                    "IssueCategory": issue_cat,
-                    "CallCount": call_count,
-                    "TopKeywords": [{"keyword": k, "frequency": v} for k, v in top_keywords]
-                })
-
-        elif analysis_type == "transcript_sentiment":
-            sql = """
-                SELECT 
-                    IssueCategory,
-                    AVG(SentimentScore) as AvgSentiment,
-                    COUNT(CASE WHEN CallTranscript LIKE '%frustrated%' 
-                           OR CallTranscript LIKE '%angry%' 
-                           OR CallTranscript LIKE '%upset%' THEN 1 END) as NegativeLanguageCount,
-                    COUNT(CASE WHEN CallTranscript LIKE '%satisfied%' 
-                           OR CallTranscript LIKE '%happy%' 
-                           OR CallTranscript LIKE '%grateful%' 
-                           OR CallTranscript LIKE '%appreciated%' THEN 1 END) as PositiveLanguageCount,
-                    COUNT(*) as TotalCalls
-                FROM CallLogs
-                GROUP BY IssueCategory
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{
-                "IssueCategory": r[0],
-                "AvgSentiment": float(r[1]) if r[1] else 0,
-                "NegativeLanguageCount": r[2],
-                "PositiveLanguageCount": r[3],
-                "TotalCalls": r[4],
-                "PositiveLanguageRate": round((r[3] / r[4]) * 100, 2) if r[4] > 0 else 0,
-                "NegativeLanguageRate": round((r[2] / r[4]) * 100, 2) if r[4] > 0 else 0
-            } for r in rows]
+    else:
+        return {"sql": "", "result": f"Unknown operation '{operation}'."}
 
-        elif analysis_type == "agent_communication":
-            sql = """
-                SELECT 
-                    AgentName,
-                    COUNT(*) as TotalCalls,
-                    AVG(LENGTH(CallTranscript)) as AvgTranscriptLength,
-                    COUNT(CASE WHEN CallTranscript LIKE '%apologized%' 
-                           OR CallTranscript LIKE '%sorry%' THEN 1 END) as ApologyCount,
-                    COUNT(CASE WHEN CallTranscript LIKE '%solution%' 
-                           OR CallTranscript LIKE '%resolved%' 
-                           OR CallTranscript LIKE '%fixed%' THEN 1 END) as SolutionOrientedCount,
-                    COUNT(CASE WHEN CallTranscript LIKE '%escalat%' THEN 1 END) as EscalationMentions,
-                    AVG(CallDuration) as AvgDuration
-                FROM CallLogs
-                GROUP BY AgentName
-                ORDER BY TotalCalls DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{
-                "AgentName": r[0],
-                "TotalCalls": r[1],
-                "AvgTranscriptLength": round(r[2]) if r[2] else 0,
-                "ApologyRate": round((r[3] / r[1]) * 100, 2) if r[1] > 0 else 0,
-                "SolutionOrientedRate": round((r[4] / r[1]) * 100, 2) if r[1] > 0 else 0,
-                "EscalationRate": round((r[5] / r[1]) * 100, 2) if r[1] > 0 else 0,
-                "AvgDuration": r[6]
-            } for r in rows]
 
-        elif analysis_type == "problem_patterns":
-            sql = """
-                SELECT 
-                    IssueCategory,
-                    ResolutionStatus,
-                    COUNT(*) as Frequency,
-                    GROUP_CONCAT(
-                        CASE 
-                            WHEN CallTranscript LIKE '%recurring%' OR CallTranscript LIKE '%again%' 
-                                 OR CallTranscript LIKE '%multiple%' OR CallTranscript LIKE '%repeated%'
-                            THEN LogID 
-                        END
-                    ) as RecurringIssueLogIDs,
-                    AVG(SentimentScore) as AvgSentiment
-                FROM CallLogs
-                GROUP BY IssueCategory, ResolutionStatus
-                HAVING Frequency > 5
-                ORDER BY Frequency DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = []
-            for r in rows:
-                recurring_ids = [id for id in str(r[3]).split(',') if id and id != 'None'] if r[3] else []
-                result.append({
-                    "IssueCategory": r[0],
-                    "ResolutionStatus": r[1],
-                    "Frequency": r[2],
-                    "RecurringIssueCount": len(recurring_ids),
-                    "RecurringIssueRate": round((len(recurring_ids) / r[2]) * 100, 2) if r[2] > 0 else 0,
-                    "AvgSentiment": float(r[4]) if r[4] else 0
-                })
-
-        elif analysis_type == "issue_frequency":
-            sql = """
-                SELECT IssueCategory,
-                       COUNT(*) as Frequency,
-                       AVG(CallDuration) as AvgDuration,
-                       SUM(CASE WHEN ResolutionStatus = 'resolved' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as ResolutionRate
-                FROM CallLogs
-                GROUP BY IssueCategory
-                ORDER BY Frequency DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{"IssueCategory": r[0], "Frequency": r[1],
-                       "AvgDuration": r[2], "ResolutionRate": float(r[3])} for r in rows]
+# Fills in derived call-log data for rows written before its triggers existed.
+# Run with CallLogs writes paused; backfill_lexicon comes before rebuild_rollup.
+CALLLOG_MAINTENANCE = ("backfill_lexicon", "rebuild_rollup", "rebuild_term_index")
 
-        elif analysis_type == "call_volume_trends":
-            sql = """
-                SELECT DATE(CallDate) as Date,
-                       COUNT(*) as CallCount,
-                       AVG(WaitTime) as AvgWaitTime,
-                       AVG(CallDuration) as AvgDuration
-                FROM CallLogs
-                GROUP BY DATE(CallDate)
-                ORDER BY Date DESC
-                LIMIT 30
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{"Date": r[0].isoformat(), "CallCount": r[1],
-                       "AvgWaitTime": r[2], "AvgDuration": r[3]} for r in rows]
 
-        elif analysis_type == "escalation_analysis":
-            sql = """
-                SELECT IssueCategory,
-                       COUNT(*) as TotalCalls,
-                       SUM(CASE WHEN ResolutionStatus = 'escalated' THEN 1 ELSE 0 END) as EscalatedCalls,
-                       SUM(CASE WHEN ResolutionStatus = 'escalated' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as EscalationRate
-                FROM CallLogs
-                GROUP BY IssueCategory
-                HAVING EscalationRate > 0
-                ORDER BY EscalationRate DESC
-            """
-            cur.execute(sql)
-            rows = cur.fetchall()
-            result = [{"IssueCategory": r[0], "TotalCalls": r[1],
-                       "EscalatedCalls": r[2], "EscalationRate": float(r[3])} for r in rows]
+def _run_calllog_maintenance(operation: str) -> dict:
+    # A dedicated autocommit connection, not a tool-call DBSession: every batch
+    # commits as it goes instead of the whole job becoming one transaction.
+    cnxn = get_mysql_pool().connect()
+    start = time.perf_counter()
+    try:
+        cnxn.autocommit = True
+        cur = cnxn.cursor()
+        if operation == "backfill_lexicon":
+            # The rollup's update trigger folds every recomputed row into CallLogRollup.
+            backfill_lexicon(cur)
+        elif operation == "rebuild_rollup":
+            rebuild_rollup(cur)
+            bump_data_version(cur)
+        elif operation == "rebuild_term_index":
+            rebuild_term_index(cur)
+            bump_data_version(cur)
+    except Exception as e:
+        try:
+            cnxn.rollback()
+        except Exception:
+            pass
+        return {"sql": None, "result": f"❌ {operation} failed: {str(e)}"}
+    finally:
+        cnxn.close()
+    return {"sql": None, "result": f"✅ {operation} finished in {time.perf_counter() - start:.1f}s."}
 
-        else:
-            result = """Unknown analysis type. Available types: 
-                     sentiment_by_agent, issue_frequency, call_volume_trends, 
-                     escalation_analysis, agent_performance, transcript_keywords,
-                     transcript_sentiment, agent_communication, problem_patterns"""
 
-        conn.close()
-        return {"sql": sql if analysis_type != None else None, "result": result}
+@mcp.tool()
+async def calllogs_maintenance(operation: str) -> Any:
+    if operation not in CALLLOG_MAINTENANCE:
+        return {"sql": None, "result": f"❌ Unknown operation '{operation}'. Use one of {list(CALLLOG_MAINTENANCE)}."}
+    try:
+        return await db_executor.run("mysql", _run_calllog_maintenance, operation)
+    except DBQueueTimeout as e:
+        return {"sql": None, "result": f"❌ {e}"}
 
-    else:
-        conn.close()
-        return {"sql": "", "result": f"Unknown operation '{operation}'."}
+
+@mcp.tool()
+async def db_pool_stats() -> Any:
+    pools = list(_mysql_pools.values()) + list(_pg_pools.values())
+    return {"result": [pool.stats() for pool in pools] + async_db.stats(), "executor": db_executor.stats()}
+
+
+@mcp.tool()
+async def products_sync_status() -> Any:
+    return {"result": products_sync.stats()}
+
+
+@mcp.tool()
+async def term_index_status() -> Any:
+    return {"result": term_index_sync.stats()}
+
+
+@mcp.tool()
+async def cache_stats() -> Any:
+    caches = [customer_cache, product_cache, customer_name_cache, product_name_cache, result_cache]
+    return {"result": [cache.stats() for cache in caches] + [filter_cache_stats()]}
 
 
 if __name__ == "__main__":
-    seed_databases()
+    for backend, outcome in seed_databases(SEED_MODE).items():
+        print(f"✅ {backend}: {'already seeded' if outcome == 'current' else 'seeded'} (schema v{SCHEMA_VERSION})")
+    warm_up_pools()
+    if os.getenv("PRODUCTS_SYNC", "1") == "1":
+        products_sync.start()
+    if os.getenv("TERM_INDEX_SYNC", "1") == "1":
+        term_index_sync.start()
     import os
 
     port = int(os.environ.get("PORT", 8000))
@@ -0,0 +1,157 @@
+import asyncio
+import ssl
+from typing import Any, Optional, Sequence
+
+
+def _tls_context() -> ssl.SSLContext:
+    # Same guarantees as ssl_disabled=False / sslmode=require on the sync drivers:
+    # encrypted transport without certificate verification.
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+class AsyncDatabase:
+    """Native asyncio pools (aiomysql for MySQL, psycopg 3 for Postgres).
+
+    Both drivers use the ``%s`` paramstyle, so statements written for
+    mysql.connector / psycopg2 run unchanged. Pools are created lazily on the
+    running event loop.
+    """
+
+    def __init__(self, mysql: dict, postgres: dict, min_size: int = 1, max_size: int = 20, recycle: float = 1800.0):
+        self._mysql_cfg = mysql
+        self._pg_cfg = postgres
+        self.min_size = min_size
+        self.max_size = max_size
+        self.recycle = recycle
+        self._mysql_pool = None
+        self._pg_pool = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _get_mysql_pool(self):
+        if self._mysql_pool is None:
+            try:
+                import aiomysql
+            except ImportError as e:
+                raise RuntimeError("DB_BACKEND=asyncio needs aiomysql (pip install aiomysql)") from e
+            self._lock = self._lock or asyncio.Lock()
+            async with self._lock:
+                if self._mysql_pool is None:
+                    cfg = self._mysql_cfg
+                    self._mysql_pool = await aiomysql.create_pool(
+                        host=cfg["host"],
+                        port=cfg["port"],
+                        user=cfg["user"],
+                        password=cfg["password"],
+                        db=cfg["database"],
+                        minsize=self.min_size,
+                        maxsize=self.max_size,
+                        pool_recycle=int(self.recycle),
+                        autocommit=True,
+                        ssl=_tls_context(),
+                    )
+        return self._mysql_pool
+
+    async def _get_pg_pool(self):
+        if self._pg_pool is None:
+            try:
+                from psycopg_pool import AsyncConnectionPool
+            except ImportError as e:
+                raise RuntimeError("DB_BACKEND=asyncio needs psycopg 3 (pip install 'psycopg[binary,pool]')") from e
+            self._lock = self._lock or asyncio.Lock()
+            async with self._lock:
+                if self._pg_pool is None:
+                    cfg = self._pg_cfg
+                    conninfo = (
+                        f"host={cfg['host']} port={cfg['port']} dbname={cfg['dbname']} "
+                        f"user={cfg['user']} password={cfg['password']} sslmode=require"
+                    )
+                    pool = AsyncConnectionPool(
+                        conninfo,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        max_lifetime=self.recycle,
+                        open=False,
+                    )
+                    await pool.open()
+                    self._pg_pool = pool
+        return self._pg_pool
+
+    async def fetchall(self, backend: str, sql: str, params: Optional[Sequence] = None) -> list:
+        if backend == "mysql":
+            pool = await self._get_mysql_pool()
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(sql, params)
+                    return list(await cur.fetchall())
+        if backend == "postgres":
+            pool = await self._get_pg_pool()
+            async with pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(sql, params)
+                    return await cur.fetchall()
+        raise ValueError(f"Unknown backend '{backend}'")
+
+    async def stream(self, backend: str, sql: str, params: Optional[Sequence], chunk_size: int):
+        """Yield rows in ``chunk_size`` batches from an unbuffered (MySQL) or server-side (Postgres) cursor."""
+        if backend == "mysql":
+            import aiomysql
+            pool = await self._get_mysql_pool()
+            conn = await pool.acquire()
+            finished = False
+            try:
+                cur = await conn.cursor(aiomysql.SSCursor)
+                await cur.execute(sql, params)
+                while chunk := await cur.fetchmany(chunk_size):
+                    yield list(chunk)
+                await cur.close()
+                finished = True
+            finally:
+                if not finished:
+                    # Closing an unbuffered cursor abandoned part-way reads every
+                    # remaining row; drop the connection instead.
+                    conn.close()
+                await pool.release(conn)
+            return
+        if backend == "postgres":
+            pool = await self._get_pg_pool()
+            async with pool.connection() as conn:
+                async with conn.cursor(name="stream") as cur:
+                    await cur.execute(sql, params)
+                    while chunk := await cur.fetchmany(chunk_size):
+                        yield chunk
+            return
+        raise ValueError(f"Unknown backend '{backend}'")
+
+    def stats(self) -> list[dict]:
+        result = []
+        if self._mysql_pool is not None:
+            result.append({
+                "pool": "aiomysql",
+                "size": self._mysql_pool.size,
+                "idle": self._mysql_pool.freesize,
+                "in_use": self._mysql_pool.size - self._mysql_pool.freesize,
+                "max_size": self._mysql_pool.maxsize,
+            })
+        if self._pg_pool is not None:
+            s = self._pg_pool.get_stats()
+            result.append({
+                "pool": "psycopg",
+                "size": s.get("pool_size", 0),
+                "idle": s.get("pool_available", 0),
+                "in_use": s.get("pool_size", 0) - s.get("pool_available", 0),
+                "waiters": s.get("requests_waiting", 0),
+                "max_size": s.get("pool_max", self.max_size),
+            })
+        return result
+
+    async def close(self):
+        if self._mysql_pool is not None:
+            self._mysql_pool.close()
+            await self._mysql_pool.wait_closed()
+            self._mysql_pool = None
+        if self._pg_pool is not None:
+            await self._pg_pool.close()
+            self._pg_pool = None
@@ -0,0 +1,61 @@
+"""Throughput of the DB execution layer as client concurrency rises.
+
+Each simulated query blocks its thread the way mysql.connector / psycopg2 do
+while waiting on the socket. Run from the repo root:
+
+    python benchmarks/bench_db_executor.py --requests 400 --latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_executor import DBExecutor  # noqa: E402
+
+
+def blocking_query(latency: float) -> int:
+    time.sleep(latency)
+    return 1
+
+
+async def inline_tool(latency: float) -> int:
+    # What the tools did before: a blocking driver call inside a coroutine.
+    return blocking_query(latency)
+
+
+async def run_level(executor: DBExecutor | None, concurrency: int, requests: int, latency: float) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def client():
+        async with sem:
+            if executor is None:
+                await inline_tool(latency)
+            else:
+                await executor.run("mysql", blocking_query, latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args):
+    levels = [1, 2, 4, 8, 16, 32]
+    print(f"{'concurrency':>11} {'inline req/s':>13} {'offloaded req/s':>16}")
+    for level in levels:
+        executor = DBExecutor(max_workers=args.workers, limits={"mysql": args.limit}, queue_timeout=60)
+        inline = await run_level(None, level, max(level * 2, args.requests // 8), args.latency_ms / 1000)
+        offloaded = await run_level(executor, level, args.requests, args.latency_ms / 1000)
+        executor.shutdown()
+        print(f"{level:>11} {inline:>13.1f} {offloaded:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
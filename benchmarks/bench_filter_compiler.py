@@ -0,0 +1,151 @@
+"""Per-call cost of turning a sales where_clause into SQL predicates.
+
+Compares the parser sales_crud used to run inline (uncompiled re.search per
+pattern on every call) with filter_compiler, cold (compiled patterns, cache
+cleared each call) and warm (memoized). Run from the repo root:
+
+    python benchmarks/bench_filter_compiler.py --iterations 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import filter_compiler  # noqa: E402
+
+CLAUSES = [
+    "total_price > 500",
+    "total price exceeds $1200.50",
+    "quantity < 3",
+    "customer_name = 'Alice Smith'",
+    "product_name like 'laptop'",
+    "total_price below 80 and quantity > 2",
+    "sales above 250",
+]
+
+
+def legacy_parse(where_clause: str):
+    # Verbatim copy of the former inline branch in _sales_read_plan.
+    clause = where_clause.strip().lower()
+    where_conditions = []
+    query_params = []
+
+    price_patterns = [
+        r'total[_\s]*price[_\s]*(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)',
+        r'(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)\s*total[_\s]*price',
+        r'total[_\s]*price[_\s]*(<|<=|below|less\s+than|under)\s*\$?(\d+(?:\.\d+)?)',
+        r'total[_\s]*price[_\s]*(=|equals?|is)\s*\$?(\d+(?:\.\d+)?)'
+    ]
+    for pattern in price_patterns:
+        match = re.search(pattern, clause)
+        if match:
+            operator_text, value = match.groups()
+            if any(word in operator_text for word in ['exceed', 'above', 'greater', 'more', '>']):
+                operator = '>'
+            elif any(word in operator_text for word in ['below', 'less', 'under', '<']):
+                operator = '<'
+            elif any(word in operator_text for word in ['equal', 'is', '=']):
+                operator = '='
+            else:
+                operator = '>'
+            where_conditions.append(f"s.total_price {operator} %s")
+            query_params.append(float(value))
+            break
+
+    quantity_patterns = [
+        r'quantity[_\s]*(>|>=|greater\s+than|more\s+than|above)\s*(\d+)',
+        r'quantity[_\s]*(<|<=|less\s+than|below|under)\s*(\d+)',
+        r'quantity[_\s]*(=|equals?|is)\s*(\d+)'
+    ]
+    for pattern in quantity_patterns:
+        match = re.search(pattern, clause)
+        if match:
+            operator_text, value = match.groups()
+            if any(symbol in operator_text for symbol in ['>', 'greater', 'more', 'above']):
+                operator = '>'
+            elif any(symbol in operator_text for symbol in ['<', 'less', 'below', 'under']):
+                operator = '<'
+            else:
+                operator = '='
+            where_conditions.append(f"s.quantity {operator} %s")
+            query_params.append(int(value))
+            break
+
+    customer_patterns = [
+        r'customer[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
+        r'customer[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
+        r'customer[_\s]*=[_\s]*["\']([^"\']+)["\']',
+        r'customer[_\s]*name[_\s]*([a-zA-Z\s]+?)(?:\s|$)'
+    ]
+    for pattern in customer_patterns:
+        match = re.search(pattern, clause)
+        if match:
+            name_value = match.group(1).strip()
+            if 'like' in clause:
+                where_conditions.append("c.Name LIKE %s")
+                query_params.append(f"%{name_value}%")
+            else:
+                where_conditions.append("c.Name = %s")
+                query_params.append(name_value)
+            break
+
+    product_patterns = [
+        r'product[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
+        r'product[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
+        r'product[_\s]*=[_\s]*["\']([^"\']+)["\']'
+    ]
+    for pattern in product_patterns:
+        match = re.search(pattern, clause)
+        if match:
+            product_value = match.group(1).strip()
+            if 'like' in clause:
+                where_conditions.append("p.name LIKE %s")
+                query_params.append(f"%{product_value}%")
+            else:
+                where_conditions.append("p.name = %s")
+                query_params.append(product_value)
+            break
+
+    if not where_conditions:
+        number_match = re.search(r'\$?(\d+(?:\.\d+)?)', clause)
+        if number_match:
+            value = float(number_match.group(1))
+            if any(word in clause for word in ['below', 'less', 'under']):
+                where_conditions.append("s.total_price < %s")
+            else:
+                where_conditions.append("s.total_price > %s")
+            query_params.append(value)
+
+    return tuple(where_conditions), tuple(query_params)
+
+
+def compiled_cold(clause: str):
+    filter_compiler._compile.cache_clear()
+    return filter_compiler.compile_sales_filter(clause)
+
+
+def time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(CLAUSES[i % len(CLAUSES)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(args):
+    for clause in CLAUSES:
+        assert legacy_parse(clause) == filter_compiler.compile_sales_filter(clause), clause
+
+    print(f"{'parser':>16} {'us/call':>10}")
+    for label, fn in [("legacy inline", legacy_parse),
+                      ("compiled, cold", compiled_cold),
+                      ("compiled, cached", filter_compiler.compile_sales_filter)]:
+        print(f"{label:>16} {time_per_call(fn, args.iterations):>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""Postgres load throughput: executemany vs COPY FROM STDIN (pg_copy.copy_rows).
+
+Loads generated sales rows into a temporary copy of the sales table on the
+database named by PG_HOST / PG_PORT / PG_DB / PG_USER / PG_PASSWORD (read from
+the environment or .env). Nothing outside the temp table is touched. Run from
+the repo root:
+
+    python benchmarks/bench_pg_copy.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2  # noqa: E402
+from dotenv import load_dotenv  # noqa: E402
+
+import datagen  # noqa: E402
+from pg_copy import copy_rows  # noqa: E402
+
+CREATE_SQL = """
+    CREATE TEMP TABLE bench_sales
+    (
+        id           INT,
+        customer_id  INT            NOT NULL,
+        product_id   INT            NOT NULL,
+        quantity     INT            NOT NULL DEFAULT 1,
+        unit_price   NUMERIC(10, 4) NOT NULL,
+        total_amount NUMERIC(10, 4) NOT NULL,
+        sale_date    TIMESTAMP
+    )
+"""
+INSERT_SQL = ("INSERT INTO bench_sales (id, customer_id, product_id, quantity, unit_price, total_amount, sale_date)"
+              " VALUES (%s, %s, %s, %s, %s, %s, %s)")
+
+
+def load_executemany(cur, rows):
+    cur.executemany(INSERT_SQL, rows)
+
+
+def load_copy(cur, rows):
+    copy_rows(cur, "bench_sales", datagen.PG_SALES_COLUMNS, rows)
+
+
+def main(args):
+    load_dotenv()
+    conn = psycopg2.connect(host=os.environ["PG_HOST"], port=int(os.environ["PG_PORT"]),
+                            dbname=os.getenv("PG_DB", "postgres"), user=os.environ["PG_USER"],
+                            password=os.environ["PG_PASSWORD"], sslmode=os.getenv("PG_SSLMODE", "require"))
+    spec = datagen.GenSpec.at_scale(args.rows / datagen.BASE_COUNTS["sales"])
+    rows = datagen.sale_rows(spec, random.Random(1), 1, args.rows)
+    cur = conn.cursor()
+    cur.execute(CREATE_SQL)
+    print(f"{'path':>12} {'rows/s':>12}")
+    for label, load in [("executemany", load_executemany), ("copy", load_copy)]:
+        cur.execute("TRUNCATE bench_sales")
+        start = time.perf_counter()
+        load(cur, rows)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12} {args.rows / elapsed:>12.0f}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+"""Encode throughput for CallLogs-shaped tool results.
+
+"per-row" is the post-processing the tools used to do (a Python branch per
+value, then json.dumps with default=str); "typed" converts once per column
+type with serializer.convert_rows and encodes with serializer.dumps (orjson
+when installed). Run from the repo root:
+
+    python benchmarks/bench_serializer.py --rows 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serializer  # noqa: E402
+
+COLUMNS = ["log_id", "call_date", "agent_name", "issue_category", "sentiment_score",
+           "call_transcript", "call_duration", "recording_hash"]
+
+
+def make_rows(count: int) -> list:
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    return [
+        (i, start + timedelta(minutes=rng.randrange(500000)), rng.choice(["Sarah Chen", "Mike Johnson"]),
+         rng.choice(["billing", "technical", "account"]), Decimal(f"{rng.random():.2f}"),
+         "Customer called about billing discrepancy. " * 6, rng.randrange(60, 1800), os.urandom(16))
+        for i in range(count)
+    ]
+
+
+def per_row(rows: list) -> str:
+    result = []
+    for r in rows:
+        row_dict = {}
+        for i, alias in enumerate(COLUMNS):
+            value = r[i]
+            if alias == "call_date" and value:
+                value = value.isoformat()
+            elif alias == "sentiment_score" and value is not None:
+                value = float(value)
+            elif alias == "recording_hash" and value is not None:
+                value = value.hex()
+            row_dict[alias] = value
+        result.append(row_dict)
+    return json.dumps({"result": result}, default=str)
+
+
+def typed(rows: list) -> str:
+    return serializer.dumps({"result": serializer.convert_rows(COLUMNS, rows)})
+
+
+def main(args):
+    rows = make_rows(args.rows)
+    print(f"encoder: {'orjson' if serializer.orjson else 'json'}")
+    print(f"{'path':>8} {'rows/s':>12} {'MB/s':>8}")
+    for label, fn in [("per-row", per_row), ("typed", typed)]:
+        fn(rows)
+        start = time.perf_counter()
+        size = 0
+        for _ in range(args.repeat):
+            size += len(fn(rows))
+        elapsed = time.perf_counter() - start
+        print(f"{label:>8} {args.rows * args.repeat / elapsed:>12.0f} {size / elapsed / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,90 @@
+"""Transcript generation throughput.
+
+"legacy" re-creates the original generate_call_transcript: every call formats
+the whole template table for its agent, picks one string, then pads it word
+by word. "engine" is call_transcripts.TranscriptEngine (templates compiled
+once, word counts known up front), one call at a time and as a batch. All
+paths draw from identically seeded RNGs and must produce the same text. Run
+from the repo root:
+
+    python benchmarks/bench_transcripts.py --calls 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import call_transcripts  # noqa: E402
+from call_transcripts import AGENT_SLOT, PADDING, TRANSCRIPT_TEMPLATES  # noqa: E402
+from datagen import ISSUE_CATEGORIES, RESOLUTION_STATUSES, SEED_AGENTS  # noqa: E402
+
+
+def legacy(issue_category, resolution_status, sentiment_score, agent_name, duration, rng):
+    transcript_templates = {
+        category: {sentiment: [t.replace(AGENT_SLOT, agent_name) for t in texts]
+                   for sentiment, texts in by_sentiment.items()}
+        for category, by_sentiment in TRANSCRIPT_TEMPLATES.items()
+    }
+    if sentiment_score >= 0.3:
+        sentiment_cat = 'positive'
+    elif sentiment_score <= -0.3:
+        sentiment_cat = 'negative'
+    else:
+        sentiment_cat = 'neutral'
+    if issue_category in transcript_templates:
+        templates = transcript_templates[issue_category].get(sentiment_cat,
+                                                             transcript_templates[issue_category]['neutral'])
+    else:
+        templates = transcript_templates['general'][sentiment_cat]
+    base_transcript = rng.choice(templates)
+    if duration < 120:
+        base_transcript = "Quick call. " + base_transcript
+    elif duration > 900:
+        base_transcript = "Extended call requiring patience. " + base_transcript
+    if resolution_status == 'escalated':
+        base_transcript += " Supervisor intervention required."
+    elif resolution_status == 'pending':
+        base_transcript += " Follow-up scheduled."
+    words = base_transcript.split()
+    if len(words) > 40:
+        base_transcript = ' '.join(words[:40])
+    elif len(words) < 30:
+        while len(words) < 30:
+            words.extend(rng.choice(PADDING).split())
+        base_transcript = ' '.join(words[:40])
+    return base_transcript
+
+
+def make_calls(count: int) -> list:
+    rng = random.Random(11)
+    return [(rng.choice(ISSUE_CATEGORIES[0]), rng.choice(RESOLUTION_STATUSES[0]), round(rng.uniform(-0.5, 1.0), 2),
+             rng.choice(SEED_AGENTS), rng.randint(30, 1800)) for _ in range(count)]
+
+
+def main(args):
+    calls = make_calls(args.calls)
+    paths = [
+        ("legacy", lambda rng: [legacy(*c, rng) for c in calls]),
+        ("engine", lambda rng: [call_transcripts.generate_call_transcript(*c, rng=rng) for c in calls]),
+        ("batch", lambda rng: call_transcripts.generate_call_transcripts(calls, rng)),
+    ]
+    reference = None
+    print(f"{'path':>8} {'calls/s':>12}")
+    for label, fn in paths:
+        start = time.perf_counter()
+        output = fn(random.Random(args.seed))
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = output
+        assert output == reference, f"{label} output differs from legacy"
+        print(f"{label:>8} {args.calls / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -0,0 +1,245 @@
+import random
+
+TRANSCRIPT_TEMPLATES = {
+    'billing': {
+        'positive': [
+            "Customer called about billing discrepancy. {agent_name} explained the charges clearly. Customer expressed satisfaction with the detailed breakdown. Issue resolved by applying appropriate credit adjustment. Customer thanked agent for patience.",
+            "Inquiry about unexpected charges on account. {agent_name} reviewed billing history, identified duplicate charge. Immediate refund processed. Customer appreciated quick resolution and professional service provided.",
+            "Customer confused about new billing format. {agent_name} walked through each line item. Customer now understands charges better. Offered paperless billing option which customer accepted happily.",
+        ],
+        'negative': [
+            "Customer upset about overcharge. {agent_name} attempted to explain but customer remained frustrated. Multiple billing errors found. Escalated to supervisor for resolution. Customer demanded compensation for inconvenience.",
+            "Angry customer disputing charges for third month. {agent_name} unable to locate previous adjustment notes. System showing conflicting information. Customer threatened to cancel service. Immediate escalation required.",
+            "Customer extremely dissatisfied with billing practices. {agent_name} apologized repeatedly but customer remained hostile. Previous promises not honored. Customer considering legal action. Urgent management intervention needed.",
+        ],
+        'neutral': [
+            "Routine billing inquiry about statement date. {agent_name} explained billing cycle details. Customer requested email confirmation. Standard information provided. Call concluded with no issues identified.",
+            "Customer checking on payment processing status. {agent_name} confirmed payment received yesterday. Updated account reflects current balance. Customer satisfied with information. No further action required.",
+        ]
+    },
+    'technical': {
+        'positive': [
+            "Customer experiencing connectivity issues. {agent_name} performed remote diagnostics successfully. Issue identified as router configuration problem. Guided customer through reset process. Service restored, customer very grateful.",
+            "Software installation problem reported. {agent_name} provided step-by-step guidance. Customer followed instructions carefully. Installation completed successfully. Customer praised agent's clear communication skills.",
+            "Customer needed help with new feature setup. {agent_name} shared screen remotely. Configuration completed together. Customer learned valuable tips. Highly satisfied with support received.",
+        ],
+        'negative': [
+            "Recurring technical problem frustrating customer. {agent_name} attempted multiple troubleshooting steps unsuccessfully. Customer lost patience during lengthy process. Previous tickets show unresolved issues. Escalation to technical team required.",
+            "Customer angry about service outage. {agent_name} acknowledged ongoing system issues. No immediate resolution available. Customer demanding compensation for business losses. Extremely dissatisfied with response.",
+            "Critical system failure affecting customer operations. {agent_name} unable to provide timeline for fix. Customer stressed about impact on business. Multiple failed resolution attempts. Emergency escalation initiated.",
+        ],
+        'neutral': [
+            "Customer inquiring about system maintenance schedule. {agent_name} provided upcoming maintenance windows. Customer noted dates for planning. Standard information exchanged. Call ended cordially.",
+            "Routine technical specification question. {agent_name} consulted documentation and provided details. Customer taking notes for internal team. Information delivered as requested. No issues noted.",
+        ]
+    },
+    'product_inquiry': {
+        'positive': [
+            "Customer interested in new product features. {agent_name} enthusiastically explained benefits and pricing. Customer impressed with capabilities. Decided to upgrade immediately. Very satisfied with information received.",
+            "Inquiry about product compatibility. {agent_name} confirmed full compatibility with customer's setup. Provided additional recommendations. Customer pleased with comprehensive response. Proceeding with purchase.",
+            "Customer seeking product recommendations. {agent_name} analyzed needs and suggested perfect solution. Customer excited about features. Order placed during call. Thanked agent for expertise.",
+        ],
+        'negative': [
+            "Customer disappointed with product limitations. {agent_name} explained current capabilities. Customer expected more features for price. Unhappy with value proposition. Considering competitor alternatives.",
+            "Product not meeting advertised specifications. {agent_name} acknowledged discrepancy. Customer frustrated with misleading information. Requested full refund. Very dissatisfied with experience.",
+        ],
+        'neutral': [
+            "General product information request. {agent_name} provided standard specifications and pricing. Customer collecting information for comparison. Will discuss with team. Polite interaction throughout.",
+            "Customer checking product availability. {agent_name} confirmed stock levels and delivery times. Customer will consider options. Standard inquiry handled efficiently. No commitment made.",
+        ]
+    },
+    'complaint': {
+        'positive': [
+            "Customer initially upset about service issue. {agent_name} listened empathetically and apologized sincerely. Offered immediate solution and compensation. Customer attitude improved significantly. Ended call satisfied.",
+            "Complaint about previous poor experience. {agent_name} took ownership and implemented corrective measures. Customer appreciated proactive approach. Issue resolved beyond expectations. Relationship restored.",
+        ],
+        'negative': [
+            "Customer extremely angry about repeated problems. {agent_name} struggled to calm situation. Multiple service failures documented. Customer demanding executive contact. Threatening social media exposure.",
+            "Serious complaint about staff behavior. {agent_name} attempted damage control unsuccessfully. Customer unwilling to accept apologies. Formal complaint being filed. Legal action mentioned.",
+            "Long-standing issue causing major frustration. {agent_name} unable to provide satisfactory resolution. Customer exhausted all patience. Canceling service immediately. Extremely negative experience.",
+        ],
+        'neutral': [
+            "Customer registering formal complaint for records. {agent_name} documented all details carefully. Standard complaint procedure followed. Reference number provided. Professional interaction maintained throughout.",
+        ]
+    },
+    'order_status': {
+        'positive': [
+            "Customer checking on recent order. {agent_name} provided tracking information promptly. Delivery on schedule for tomorrow. Customer pleased with quick update. Expressed satisfaction with service.",
+            "Inquiry about expedited shipping options. {agent_name} arranged priority delivery at no charge. Customer delighted with accommodation. Order upgraded successfully. Very appreciative of help.",
+        ],
+        'negative': [
+            "Order significantly delayed without notification. {agent_name} found logistics error. Customer upset about lack of communication. Business impact significant. Demanding immediate resolution and compensation.",
+            "Wrong items delivered twice. {agent_name} apologized but no immediate fix available. Customer frustrated with repeated errors. Quality control issues evident. Considering canceling all future orders.",
+        ],
+        'neutral': [
+            "Routine order status check. {agent_name} confirmed shipment departed this morning. Tracking number provided via email. Customer satisfied with update. Standard inquiry resolved quickly.",
+        ]
+    },
+    'account': {
+        'positive': [
+            "Customer needed password reset assistance. {agent_name} verified identity and reset credentials. Access restored immediately. Customer grateful for quick help. Security tips provided and appreciated.",
+            "Account upgrade request. {agent_name} processed changes efficiently. New features activated instantly. Customer excited about enhanced capabilities. Smooth transition completed.",
+        ],
+        'negative': [
+            "Account hacked, unauthorized charges made. {agent_name} initiated security protocol. Customer panicked about data breach. Investigation will take days. Very upset about security failure.",
+            "Unable to access account for weeks. {agent_name} found system error. Customer missed important deadlines. Business losses mounting. Extremely frustrated with platform reliability.",
+        ],
+        'neutral': [
+            "Customer updating contact information. {agent_name} processed changes in system. Confirmation email sent. Standard account maintenance completed. No issues encountered.",
+        ]
+    },
+    'refund': {
+        'positive': [
+            "Refund request for defective product. {agent_name} approved immediately after verification. Processing within 3-5 days. Customer satisfied with quick approval. Appreciated hassle-free process.",
+            "Customer requesting partial refund for service issue. {agent_name} calculated fair adjustment. Credit applied to account instantly. Customer happy with resolution. Thanked agent for understanding.",
+        ],
+        'negative': [
+            "Refund denied despite valid complaint. {agent_name} cited policy restrictions. Customer arguing about unfair treatment. Previous promises not honored. Threatening chargeback through bank.",
+            "Multiple refund requests ignored. {agent_name} found processing errors. Customer exhausted and angry. Financial hardship mentioned. Considering legal action for resolution.",
+        ],
+        'neutral': [
+            "Standard refund inquiry about timeline. {agent_name} explained processing procedures. Customer understood requirements. Documentation submitted. Awaiting standard processing time.",
+        ]
+    },
+    'general': {
+        'positive': [
+            "Customer calling to praise recent service. {agent_name} accepted compliments graciously. Customer wanted manager to know about excellent experience. Positive feedback documented. Very satisfied customer.",
+            "General inquiry about services. {agent_name} provided comprehensive overview. Customer impressed with options available. Interested in learning more. Scheduling follow-up consultation.",
+        ],
+        'negative': [
+            "Customer expressing overall dissatisfaction. {agent_name} listened to multiple concerns. Long list of problems mentioned. Customer considering switching providers. Retention team referral needed.",
+            "Vague complaint about service quality. {agent_name} tried identifying specific issues. Customer frustrated with everything. Unable to pinpoint exact problem. General dissatisfaction expressed.",
+        ],
+        'neutral': [
+            "Customer had miscellaneous questions. {agent_name} answered each one patiently. Information gathering for future reference. No immediate action needed. Cordial conversation throughout.",
+            "General check-in call about services. {agent_name} reviewed account status. Everything functioning normally. Customer had no concerns. Brief, pleasant interaction.",
+        ]
+    }
+}
+
+PADDING = [
+    "Additional notes added.",
+    "Customer database updated.",
+    "Ticket created for tracking.",
+    "Quality assurance reviewed.",
+    "Standard procedures followed.",
+]
+MIN_WORDS = 30
+MAX_WORDS = 40
+AGENT_SLOT = "{agent_name}"
+
+
+class _Template:
+    """A template split around its agent-name slot, with its word count known up front."""
+    __slots__ = ("parts", "slots", "words")
+
+    def __init__(self, text: str):
+        self.parts = text.split(AGENT_SLOT)
+        self.slots = len(self.parts) - 1
+        # Valid only for whitespace-delimited slots in single-spaced text; anything else
+        # makes render() fall back to splitting the finished string.
+        inner = self.parts[1:-1]
+        delimited = (all(p.endswith(" ") for p in self.parts[:-1] if p)
+                     and all(p.startswith(" ") for p in self.parts[1:] if p) and all(inner))
+        countable = delimited and text == " ".join(text.split())
+        self.words = len(text.replace(AGENT_SLOT, " ").split()) if countable else None
+
+
+class TranscriptEngine:
+    """Compiles the transcript templates once and renders them without rebuilding or re-splitting text.
+
+    For the same random state it returns exactly what the original
+    per-call f-string implementation returned.
+    """
+
+    def __init__(self, templates: dict = TRANSCRIPT_TEMPLATES, padding: list = PADDING):
+        self.templates = {
+            category: {sentiment: [_Template(t) for t in texts] for sentiment, texts in by_sentiment.items()}
+            for category, by_sentiment in templates.items()
+        }
+        self.padding = [(" " + p, len(p.split())) for p in padding]
+        self._agent_words: dict = {}
+
+    def _choices(self, issue_category: str, sentiment_score: float) -> list:
+        if sentiment_score >= 0.3:
+            sentiment_cat = 'positive'
+        elif sentiment_score <= -0.3:
+            sentiment_cat = 'negative'
+        else:
+            sentiment_cat = 'neutral'
+        if issue_category in self.templates:
+            by_sentiment = self.templates[issue_category]
+            return by_sentiment.get(sentiment_cat, by_sentiment['neutral'])
+        return self.templates['general'][sentiment_cat]
+
+    def _words_in(self, agent_name: str):
+        words = self._agent_words.get(agent_name)
+        if words is None:
+            words = len(agent_name.split()) if agent_name == " ".join(agent_name.split()) and agent_name else -1
+            if len(self._agent_words) < 100_000:
+                self._agent_words[agent_name] = words
+        return words
+
+    def render(self, issue_category, resolution_status, sentiment_score, agent_name, duration, rng=random) -> str:
+        template = rng.choice(self._choices(issue_category, sentiment_score))
+        text = agent_name.join(template.parts)
+        agent_words = self._words_in(agent_name)
+        words = (template.words + template.slots * agent_words
+                 if template.words is not None and agent_words >= 0 else None)
+
+        if duration < 120:
+            text = "Quick call. " + text
+            words = None if words is None else words + 2
+        elif duration > 900:
+            text = "Extended call requiring patience. " + text
+            words = None if words is None else words + 4
+
+        if resolution_status == 'escalated':
+            text += " Supervisor intervention required."
+            words = None if words is None else words + 3
+        elif resolution_status == 'pending':
+            text += " Follow-up scheduled."
+            words = None if words is None else words + 2
+
+        if words is None:
+            return _fit_words(text, self.padding, rng)
+        if words > MAX_WORDS:
+            return ' '.join(text.split()[:MAX_WORDS])
+        if words < MIN_WORDS:
+            pieces = [text]
+            while words < MIN_WORDS:
+                pad, pad_words = rng.choice(self.padding)
+                pieces.append(pad)
+                words += pad_words
+            text = "".join(pieces)
+            if words > MAX_WORDS:
+                text = ' '.join(text.split()[:MAX_WORDS])
+        return text
+
+    def render_batch(self, calls, rng=random) -> list:
+        """Transcripts for ``(issue_category, resolution_status, sentiment_score, agent_name, duration)`` tuples."""
+        render = self.render
+        return [render(*call, rng=rng) for call in calls]
+
+
+def _fit_words(text: str, padding: list, rng) -> str:
+    """The original word-by-word path, for text whose word count isn't known up front."""
+    words = text.split()
+    if len(words) > MAX_WORDS:
+        return ' '.join(words[:MAX_WORDS])
+    if len(words) < MIN_WORDS:
+        while len(words) < MIN_WORDS:
+            words.extend(rng.choice(padding)[0].split())
+        return ' '.join(words[:MAX_WORDS])
+    return text
+
+
+ENGINE = TranscriptEngine()
+
+
+def generate_call_transcript(issue_category, resolution_status, sentiment_score, agent_name, duration, rng=random):
+    return ENGINE.render(issue_category, resolution_status, sentiment_score, agent_name, duration, rng)
+
+
+def generate_call_transcripts(calls, rng=random) -> list:
+    return ENGINE.render_batch(calls, rng)
@@ -0,0 +1,83 @@
+from typing import Optional
+
+# Flag column -> substrings; a call is flagged when its transcript contains any
+# of them (matched with LIKE, so the column collation's case rules apply).
+LEXICON = {
+    "NegativeLanguage": ("frustrated", "angry", "upset"),
+    "PositiveLanguage": ("satisfied", "happy", "grateful", "appreciated"),
+    "ApologyLanguage": ("apologized", "sorry"),
+    "SolutionLanguage": ("solution", "resolved", "fixed"),
+    "EscalationLanguage": ("escalat",),
+    "RecurringLanguage": ("recurring", "again", "multiple", "repeated"),
+}
+
+LEXICON_COLUMNS = {
+    **{column: "TINYINT NOT NULL DEFAULT 0" for column in LEXICON},
+    "TranscriptLength": "INT",
+}
+
+
+def _feature_sql(column: str, transcript: str) -> str:
+    if column == "TranscriptLength":
+        return f"LENGTH({transcript})"
+    hits = " OR ".join(f"{transcript} LIKE '%{term}%'" for term in LEXICON[column])
+    return f"COALESCE({hits}, 0)"
+
+
+def _assignments(target: Optional[str], transcript: str) -> str:
+    prefix = f"{target}." if target else ""
+    return ", ".join(f"{prefix}{column} = {_feature_sql(column, transcript)}" for column in LEXICON_COLUMNS)
+
+
+# Features are computed once per call, when it is written; the rollup triggers
+# (AFTER ...) then see the enriched row.
+LEXICON_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS calllogs_lexicon_insert;",
+    "DROP TRIGGER IF EXISTS calllogs_lexicon_update;",
+    f"""
+    CREATE TRIGGER calllogs_lexicon_insert BEFORE INSERT ON CallLogs FOR EACH ROW
+    SET {_assignments('NEW', 'NEW.CallTranscript')}
+    """,
+    f"""
+    CREATE TRIGGER calllogs_lexicon_update BEFORE UPDATE ON CallLogs FOR EACH ROW
+    BEGIN
+        IF NOT (NEW.CallTranscript <=> OLD.CallTranscript) THEN
+            SET {_assignments('NEW', 'NEW.CallTranscript')};
+        END IF;
+    END
+    """,
+]
+
+
+def install_lexicon(mysql_cur):
+    """Add any missing feature columns to CallLogs and the triggers that fill them.
+
+    Install before the rollup, whose triggers read these columns.
+    """
+    mysql_cur.execute(
+        "SELECT COLUMN_NAME FROM information_schema.COLUMNS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'CallLogs'"
+    )
+    existing = {r[0] for r in mysql_cur.fetchall()}
+    missing = [f"ADD COLUMN {column} {ddl}" for column, ddl in LEXICON_COLUMNS.items() if column not in existing]
+    if missing:
+        mysql_cur.execute(f"ALTER TABLE CallLogs {', '.join(missing)}")
+    for statement in LEXICON_TRIGGERS_SQL:
+        mysql_cur.execute(statement)
+
+
+def backfill_lexicon(mysql_cur, batch_size: int = 5000):
+    """Compute the features for rows written before the triggers existed, one LogID range per statement.
+
+    The rollup's update trigger folds each change in, so CallLogRollup stays consistent.
+    """
+    mysql_cur.execute("SELECT MIN(LogID), MAX(LogID) FROM CallLogs")
+    low, high = mysql_cur.fetchone()
+    if low is None:
+        return
+    for start in range(low, high + 1, batch_size):
+        # Bounds are inlined: the LIKE patterns' '%' must not meet parameter substitution.
+        mysql_cur.execute(
+            f"UPDATE CallLogs SET {_assignments(None, 'CallTranscript')}"
+            f" WHERE LogID BETWEEN {int(start)} AND {int(start + batch_size - 1)}"
+        )
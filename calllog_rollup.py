@@ -0,0 +1,121 @@
+from calllog_lexicon import LEXICON
+
+ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS CallLogRollup
+    (
+        RollupID            BIGINT AUTO_INCREMENT PRIMARY KEY,
+        CallDay             DATE          NOT NULL,
+        AgentName           VARCHAR(100)  NOT NULL DEFAULT '',
+        IssueCategory       VARCHAR(100)  NOT NULL DEFAULT '',
+        ResolutionStatus    VARCHAR(50)   NOT NULL DEFAULT '',
+        Calls               INT           NOT NULL DEFAULT 0,
+        DurationCalls       INT           NOT NULL DEFAULT 0,
+        SumDuration         BIGINT        NOT NULL DEFAULT 0,
+        WaitCalls           INT           NOT NULL DEFAULT 0,
+        SumWait             BIGINT        NOT NULL DEFAULT 0,
+        SentimentCalls      INT           NOT NULL DEFAULT 0,
+        SumSentiment        DECIMAL(14,2) NOT NULL DEFAULT 0,
+        PositiveCalls       INT           NOT NULL DEFAULT 0,
+        TransferCalls       INT           NOT NULL DEFAULT 0,
+        SumTransfers        BIGINT        NOT NULL DEFAULT 0,
+        NegativeLanguage    INT           NOT NULL DEFAULT 0,
+        PositiveLanguage    INT           NOT NULL DEFAULT 0,
+        ApologyLanguage     INT           NOT NULL DEFAULT 0,
+        SolutionLanguage    INT           NOT NULL DEFAULT 0,
+        EscalationLanguage  INT           NOT NULL DEFAULT 0,
+        RecurringLanguage   INT           NOT NULL DEFAULT 0,
+        TranscriptCalls     INT           NOT NULL DEFAULT 0,
+        SumTranscriptLength BIGINT        NOT NULL DEFAULT 0,
+        UNIQUE KEY uq_rollup (CallDay, AgentName, IssueCategory, ResolutionStatus),
+        INDEX idx_rollup_agent (AgentName),
+        INDEX idx_rollup_category (IssueCategory)
+    );
+"""
+
+# Rows are additive deltas. A NULL key would never match the unique key and add
+# a row per write, so NULL keys are stored as '' (read back with NULLIF).
+_MEASURES = ("Calls", "DurationCalls", "SumDuration", "WaitCalls", "SumWait", "SentimentCalls",
+             "SumSentiment", "PositiveCalls", "TransferCalls", "SumTransfers",
+             *LEXICON, "TranscriptCalls", "SumTranscriptLength")
+
+
+_KEYS = ("CallDay", "AgentName", "IssueCategory", "ResolutionStatus")
+
+
+def _delta_sql(row: str, sign: str) -> str:
+    values = ", ".join([
+        f"DATE({row}.CallDate)", *(f"COALESCE({row}.{key}, '')" for key in _KEYS[1:]),
+        f"{sign}1",
+        f"{sign}({row}.CallDuration IS NOT NULL)", f"{sign}COALESCE({row}.CallDuration, 0)",
+        f"{sign}({row}.WaitTime IS NOT NULL)", f"{sign}COALESCE({row}.WaitTime, 0)",
+        f"{sign}({row}.SentimentScore IS NOT NULL)", f"{sign}COALESCE({row}.SentimentScore, 0)",
+        f"{sign}COALESCE({row}.SentimentScore >= 0.5, 0)",
+        f"{sign}({row}.TransferCount IS NOT NULL)", f"{sign}COALESCE({row}.TransferCount, 0)",
+        *(f"{sign}{row}.{column}" for column in LEXICON),
+        f"{sign}({row}.TranscriptLength IS NOT NULL)", f"{sign}COALESCE({row}.TranscriptLength, 0)",
+    ])
+    updates = ", ".join(f"{m} = {m} + VALUES({m})" for m in _MEASURES)
+    return (
+        "INSERT INTO CallLogRollup (CallDay, AgentName, IssueCategory, ResolutionStatus, "
+        f"{', '.join(_MEASURES)}) VALUES ({values}) ON DUPLICATE KEY UPDATE {updates};"
+    )
+
+
+ROLLUP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS calllogs_rollup_insert;",
+    "DROP TRIGGER IF EXISTS calllogs_rollup_update;",
+    "DROP TRIGGER IF EXISTS calllogs_rollup_delete;",
+    f"CREATE TRIGGER calllogs_rollup_insert AFTER INSERT ON CallLogs FOR EACH ROW {_delta_sql('NEW', '')}",
+    f"""
+    CREATE TRIGGER calllogs_rollup_update AFTER UPDATE ON CallLogs FOR EACH ROW
+    BEGIN
+        {_delta_sql('OLD', '-')}
+        {_delta_sql('NEW', '')}
+    END
+    """,
+    f"CREATE TRIGGER calllogs_rollup_delete AFTER DELETE ON CallLogs FOR EACH ROW {_delta_sql('OLD', '-')}",
+]
+
+REBUILD_SQL = f"""
+    INSERT INTO {{table}} (CallDay, AgentName, IssueCategory, ResolutionStatus, {', '.join(_MEASURES)})
+    SELECT DATE(CallDate), COALESCE(AgentName, ''), COALESCE(IssueCategory, ''), COALESCE(ResolutionStatus, ''),
+           COUNT(*),
+           COUNT(CallDuration), COALESCE(SUM(CallDuration), 0),
+           COUNT(WaitTime), COALESCE(SUM(WaitTime), 0),
+           COUNT(SentimentScore), COALESCE(SUM(SentimentScore), 0),
+           COALESCE(SUM(SentimentScore >= 0.5), 0),
+           COUNT(TransferCount), COALESCE(SUM(TransferCount), 0),
+           {', '.join(f"COALESCE(SUM({column}), 0)" for column in LEXICON)},
+           COUNT(TranscriptLength), COALESCE(SUM(TranscriptLength), 0)
+    FROM CallLogs
+    GROUP BY 1, 2, 3, 4
+"""
+
+
+def install_rollup(mysql_cur):
+    """Create CallLogRollup and the CallLogs triggers that keep it current."""
+    mysql_cur.execute(ROLLUP_TABLE_SQL)
+    for statement in ROLLUP_TRIGGERS_SQL:
+        mysql_cur.execute(statement)
+
+
+def rebuild_rollup(mysql_cur):
+    """Recompute CallLogRollup from CallLogs (rows loaded before the triggers existed); run with writes paused.
+
+    The new rollup is built in a shadow table and swapped in by one atomic
+    RENAME, so a failure part-way leaves the current rollup untouched. Run
+    calllog_lexicon.backfill_lexicon() first so the language counts are filled in.
+    """
+    shadow, old = "CallLogRollup_rebuild", "CallLogRollup_old"
+    mysql_cur.execute(f"DROP TABLE IF EXISTS {shadow}, {old}")
+    mysql_cur.execute(f"CREATE TABLE {shadow} LIKE CallLogRollup")
+    try:
+        mysql_cur.execute(REBUILD_SQL.format(table=shadow))
+        mysql_cur.execute(f"RENAME TABLE CallLogRollup TO {old}, {shadow} TO CallLogRollup")
+    except Exception:
+        try:
+            mysql_cur.execute(f"DROP TABLE IF EXISTS {shadow}")
+        except Exception:
+            pass
+        raise
+    mysql_cur.execute(f"DROP TABLE {old}")
@@ -0,0 +1,39 @@
+import time
+
+import pandas as pd
+
+CAREPLAN_COLUMNS = [
+    "ActualReleaseDate", "NameOfYouth", "RaceEthnicity", "MediCalID",
+    "ResidentialAddress", "Telephone", "MediCalHealthPlan", "HealthScreenings",
+    "HealthAssessments", "ChronicConditions", "PrescribedMedications",
+    "Notes", "CarePlanNotes",
+]
+
+INSERT_SQL = (
+    f"INSERT INTO CarePlan ({', '.join(CAREPLAN_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(CAREPLAN_COLUMNS))})"
+)
+
+
+def clean_chunk(chunk: pd.DataFrame) -> list[tuple]:
+    """Rows for INSERT_SQL: missing columns, NaN and the string 'nan' all become None."""
+    frame = chunk.reindex(columns=CAREPLAN_COLUMNS).astype(object)
+    frame = frame.where(frame.notna() & (frame != "nan"), None)
+    return list(frame.itertuples(index=False, name=None))
+
+
+def load_careplan_tsv(mysql_cur, path: str = "output.tsv", chunk_rows: int = 5000, batch_rows: int = 1000) -> dict:
+    """Stream a CarePlan TSV export into CarePlan with multi-row INSERTs; returns a throughput report.
+
+    Every field is read as text, so IDs and phone numbers keep their leading zeros.
+    """
+    start = time.perf_counter()
+    loaded = 0
+    for chunk in pd.read_csv(path, sep="\t", dtype=str, chunksize=chunk_rows):
+        rows = clean_chunk(chunk)
+        for offset in range(0, len(rows), batch_rows):
+            mysql_cur.executemany(INSERT_SQL, rows[offset:offset + batch_rows])
+        loaded += len(rows)
+    elapsed = time.perf_counter() - start
+    return {"rows": loaded, "seconds": round(elapsed, 3),
+            "rows_per_sec": round(loaded / elapsed) if elapsed > 0 else None}
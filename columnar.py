@@ -0,0 +1,84 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+RESULT_FORMATS = ("rows", "columnar")
+
+# A string column is dictionary-encoded when it has at most this share of
+# distinct values (and at least DICTIONARY_MIN_ROWS rows to amortize the table).
+DICTIONARY_MAX_RATIO = 0.5
+DICTIONARY_MIN_ROWS = 8
+
+_TYPE_NAMES = [
+    (bool, "bool"),
+    (int, "int"),
+    (float, "float"),
+    (Decimal, "decimal"),
+    (datetime, "datetime"),
+    (date, "date"),
+    (time, "time"),
+    (str, "str"),
+    (bytes, "bytes"),
+]
+
+
+def _value_type(value: Any) -> str:
+    for py_type, name in _TYPE_NAMES:
+        if isinstance(value, py_type):
+            return name
+    return "json"
+
+
+def infer_type(values: Sequence) -> str:
+    """Type name of the first non-null value, or "null" for an all-null column."""
+    for value in values:
+        if value is not None:
+            return _value_type(value)
+    return "null"
+
+
+def encode_columnar(columns: Sequence[str], rows: Sequence[Sequence], types: Optional[Sequence[str]] = None) -> dict:
+    """``{columns, types, rows, dictionaries}`` for row tuples.
+
+    Low-cardinality string columns are dictionary-encoded: their type becomes
+    ``"dictionary"``, ``dictionaries[column]`` holds the distinct values and
+    each row carries the value's index (or null).
+    """
+    rows = [list(row) for row in rows]
+    column_values = list(zip(*rows)) if rows else [()] * len(columns)
+    types = list(types) if types else [infer_type(values) for values in column_values]
+    dictionaries = {}
+
+    if len(rows) >= DICTIONARY_MIN_ROWS:
+        for i, (column, values) in enumerate(zip(columns, column_values)):
+            if types[i] not in ("str", "STRING"):
+                continue
+            distinct = list(dict.fromkeys(v for v in values if v is not None))
+            if len(distinct) > len(rows) * DICTIONARY_MAX_RATIO:
+                continue
+            codes = {value: code for code, value in enumerate(distinct)}
+            for row in rows:
+                if row[i] is not None:
+                    row[i] = codes[row[i]]
+            types[i] = "dictionary"
+            dictionaries[column] = distinct
+
+    return {"columns": list(columns), "types": types, "rows": rows, "dictionaries": dictionaries}
+
+
+def records_to_columnar(records: Sequence[dict]) -> dict:
+    """Columnar form of a list of dicts; keys missing from a record come back as null."""
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    return encode_columnar(columns, [[record.get(column) for column in columns] for record in records])
+
+
+def decode_columnar(payload: dict) -> list[dict]:
+    """Inverse of encode_columnar, for clients and tests."""
+    columns = payload["columns"]
+    lookups = [payload["dictionaries"].get(column) if kind == "dictionary" else None
+               for column, kind in zip(columns, payload["types"])]
+    return [
+        {column: (lookup[value] if lookup is not None and value is not None else value)
+         for column, lookup, value in zip(columns, lookups, row)}
+        for row in payload["rows"]
+    ]
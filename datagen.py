@@ -0,0 +1,368 @@
+"""Deterministic synthetic data at production scale, for load testing.
+
+    python datagen.py --scale 10 --seed 7 --target files --out-dir data/
+    python datagen.py --scale 1 --target db     # into the schema seed_databases() created
+
+Row counts are BASE_COUNTS x scale. Every chunk draws from its own RNG seeded
+with (seed, table, chunk index) and owns a fixed id range, so the output is
+identical for any number of worker processes.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from call_transcripts import generate_call_transcript
+from pg_copy import copy_line, copy_rows
+from products_sync import STATE_NAME as SYNC_STATE_NAME
+from transcript_terms import fold_pending_terms
+
+BASE_COUNTS = {"customers": 100_000, "products": 1_000, "sales": 1_000_000, "calllogs": 1_000_000}
+CHUNK_ROWS = 10_000
+FOLD_BATCH_ROWS = 5_000
+MYSQL_DEADLOCK = 1213
+DEADLOCK_RETRIES = 5
+# Sales and CallLogs reference Customers / products, so they load in a second phase.
+PHASES = [("customers", "products"), ("sales", "calllogs")]
+
+COLUMNS = {
+    "customers": ["Id", "FirstName", "LastName", "Name", "Email"],
+    "products": ["id", "name", "price", "description"],
+    "sales": ["Id", "customer_id", "product_id", "quantity", "unit_price", "total_price", "sale_date"],
+    "calllogs": ["LogID", "CallDate", "CustomerID", "AgentName", "CallDuration", "CallType", "CallStatus",
+                 "IssueCategory", "ResolutionStatus", "SentimentScore", "CallNotes", "CallTranscript",
+                 "WaitTime", "TransferCount"],
+}
+PG_SALES_COLUMNS = ["id", "customer_id", "product_id", "quantity", "unit_price", "total_amount", "sale_date"]
+MYSQL_TABLES = {"customers": "Customers", "products": "ProductsCache", "sales": "Sales", "calllogs": "CallLogs"}
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David",
+               "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+               "Carlos", "Karen", "Wei", "Priya", "Ahmed", "Fatima", "Hiroshi", "Yuki", "Olga", "Ivan",
+               "Aisha", "Mateo", "Sofia", "Liam", "Noah", "Emma", "Olivia", "Ava", "Lucas", "Mia"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore",
+              "Jackson", "Martin", "Lee", "Chen", "Nguyen", "Patel", "Kim", "Singh", "Khan", "Ivanova",
+              "Tanaka", "Rossi", "Müller", "O'Brien", "Silva", "Cohen", "Walker", "Young", "King", "Scott"]
+PRODUCT_ADJECTIVES = ["Compact", "Deluxe", "Smart", "Portable", "Heavy-Duty", "Eco", "Wireless", "Classic",
+                      "Pro", "Mini", "Ultra", "Modular"]
+PRODUCT_NOUNS = ["Widget", "Gadget", "Tool", "Sensor", "Router", "Charger", "Speaker", "Lamp", "Camera",
+                 "Monitor", "Keyboard", "Adapter", "Drill", "Kettle", "Backpack"]
+
+# The original demo roster; larger volumes add generated agents, one per CALLS_PER_AGENT calls.
+SEED_AGENTS = ["Sarah Chen", "Mike Johnson", "Emily Davis", "James Wilson",
+               "Lisa Anderson", "David Martinez", "Jennifer Brown", "Robert Taylor"]
+CALLS_PER_AGENT = 5_000
+
+ISSUE_CATEGORIES = (["billing", "technical", "product_inquiry", "complaint", "order_status", "account", "refund",
+                     "general"], [22, 20, 12, 8, 15, 9, 7, 7])
+RESOLUTION_STATUSES = (["resolved", "escalated", "pending", "follow_up"], [58, 12, 16, 14])
+CALL_TYPES = (["inbound", "outbound", "transfer"], [75, 18, 7])
+CALL_STATUSES = (["completed", "dropped", "voicemail"], [88, 7, 5])
+TRANSFER_COUNTS = ([0, 1, 2, 3], [70, 20, 7, 3])
+CALL_OUTCOMES = ["Issue resolved successfully.", "Escalated to supervisor.", "Follow-up required.",
+                 "Customer satisfied with resolution."]
+
+
+@dataclass(frozen=True)
+class GenSpec:
+    customers: int
+    products: int
+    sales: int
+    calllogs: int
+    seed: int = 0
+    end: datetime = None
+    history_days: int = 365
+
+    @classmethod
+    def at_scale(cls, scale: float, seed: int = 0, end: datetime = None, history_days: int = 365) -> "GenSpec":
+        counts = {table: max(1, int(base * scale)) for table, base in BASE_COUNTS.items()}
+        end = end or datetime.combine(datetime.now().date(), datetime.min.time())
+        return cls(**counts, seed=seed, end=end, history_days=history_days)
+
+    def count(self, table: str) -> int:
+        return getattr(self, table)
+
+
+def _weighted(rng: random.Random, options: tuple):
+    return rng.choices(options[0], options[1])[0]
+
+
+def _skewed_id(rng: random.Random, n: int, power: float) -> int:
+    """1..n with low ids drawn far more often: a few heavy customers / best-selling products."""
+    return 1 + int(n * rng.random() ** power)
+
+
+def _timestamp(rng: random.Random, spec: GenSpec) -> datetime:
+    day = spec.end - timedelta(days=rng.randrange(1, spec.history_days + 1))
+    hour = min(20, max(8, int(rng.gauss(13, 3))))
+    return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+
+
+@lru_cache(maxsize=8)
+def _agents(seed: int, count: int) -> tuple:
+    rng = random.Random(f"{seed}:agents")
+    agents = list(SEED_AGENTS)
+    taken = set(agents)
+    while len(agents) < count:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if name in taken:
+            name = f"{name} {len(agents)}"
+        taken.add(name)
+        agents.append(name)
+    return tuple(agents)
+
+
+@lru_cache(maxsize=8)
+def _catalog(seed: int, count: int) -> tuple:
+    """Every product, built once per process: sales need each product's price."""
+    rng = random.Random(f"{seed}:products")
+    catalog = []
+    for product_id in range(1, count + 1):
+        name = f"{rng.choice(PRODUCT_ADJECTIVES)} {rng.choice(PRODUCT_NOUNS)} {product_id}"
+        price = round(min(5000.0, max(0.99, rng.lognormvariate(math.log(25), 0.9))), 2)
+        description = None if rng.random() < 0.2 else f"A {name.lower()} for everyday use."
+        catalog.append((product_id, name, price, description))
+    return tuple(catalog)
+
+
+def customer_rows(spec: GenSpec, rng: random.Random, first_id: int, count: int) -> list:
+    rows = []
+    for customer_id in range(first_id, first_id + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = None if rng.random() < 0.1 else f"{first}.{last}{customer_id}@example.com".lower().replace("'", "")
+        rows.append((customer_id, first, last, f"{first} {last}", email))
+    return rows
+
+
+def product_rows(spec: GenSpec, rng: random.Random, first_id: int, count: int) -> list:
+    return list(_catalog(spec.seed, spec.products)[first_id - 1:first_id - 1 + count])
+
+
+def sale_rows(spec: GenSpec, rng: random.Random, first_id: int, count: int) -> list:
+    catalog = _catalog(spec.seed, spec.products)
+    rows = []
+    for sale_id in range(first_id, first_id + count):
+        product_id = _skewed_id(rng, spec.products, 2)
+        quantity = min(20, 1 + int(rng.expovariate(0.8)))
+        unit_price = catalog[product_id - 1][2]
+        rows.append((sale_id, _skewed_id(rng, spec.customers, 3), product_id, quantity, unit_price,
+                     round(unit_price * quantity, 2), _timestamp(rng, spec)))
+    return rows
+
+
+def calllog_rows(spec: GenSpec, rng: random.Random, first_id: int, count: int) -> list:
+    agents = _agents(spec.seed, max(len(SEED_AGENTS), math.ceil(spec.calllogs / CALLS_PER_AGENT)))
+    rows = []
+    for log_id in range(first_id, first_id + count):
+        agent = rng.choice(agents)
+        duration = int(min(3600, max(30, rng.lognormvariate(math.log(360), 0.7))))
+        issue = _weighted(rng, ISSUE_CATEGORIES)
+        resolution = _weighted(rng, RESOLUTION_STATUSES)
+        sentiment = round(1.5 * rng.betavariate(2.5, 1.8) - 0.5, 2)
+        transcript = generate_call_transcript(issue, resolution, sentiment, agent, duration, rng)
+        call_notes = f"Customer called regarding {issue} issue. {rng.choice(CALL_OUTCOMES)}"
+        rows.append((
+            log_id, _timestamp(rng, spec), _skewed_id(rng, spec.customers, 2), agent, duration,
+            _weighted(rng, CALL_TYPES), _weighted(rng, CALL_STATUSES), issue, resolution, sentiment,
+            call_notes, transcript, min(900, int(rng.expovariate(1 / 60))), _weighted(rng, TRANSFER_COUNTS),
+        ))
+    return rows
+
+
+GENERATORS = {"customers": customer_rows, "products": product_rows, "sales": sale_rows, "calllogs": calllog_rows}
+
+
+def generate_chunk(spec: GenSpec, table: str, index: int, first_id: int, count: int) -> list:
+    return GENERATORS[table](spec, random.Random(f"{spec.seed}:{table}:{index}"), first_id, count)
+
+
+def chunk_tasks(spec: GenSpec, table: str, chunk_rows: int = CHUNK_ROWS) -> list:
+    """``(table, index, first_id, count)`` for every chunk of ``table``."""
+    total = spec.count(table)
+    return [(table, index, start + 1, min(chunk_rows, total - start))
+            for index, start in enumerate(range(0, total, chunk_rows))]
+
+
+def load_mysql(mysql_cur, table: str, rows: list):
+    """Insert generated rows with their ids (CallLogs triggers queue their transcripts for the term index).
+
+    Parallel workers' CallLogs triggers upsert the same CallLogRollup rows, so
+    InnoDB may pick one as a deadlock victim. On an autocommit connection the
+    batch is a single statement that was rolled back whole, so it is retried.
+    """
+    columns = COLUMNS[table]
+    sql = f"INSERT INTO {MYSQL_TABLES[table]} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    for attempt in range(DEADLOCK_RETRIES + 1):
+        try:
+            mysql_cur.executemany(sql, rows)
+            return
+        except Exception as e:
+            if getattr(e, "errno", None) != MYSQL_DEADLOCK or attempt == DEADLOCK_RETRIES:
+                raise
+            time.sleep(random.uniform(0.05, 0.1) * 2 ** attempt)
+
+
+class FileSink:
+    """One TSV per chunk (``<out_dir>/<table>/part-00000.tsv``), NULL as \\N: loadable by LOAD DATA and COPY."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = out_dir
+
+    def prepare(self, spec: GenSpec):
+        for table in COLUMNS:
+            os.makedirs(os.path.join(self.out_dir, table), exist_ok=True)
+
+    def write(self, table: str, index: int, rows: list):
+        path = os.path.join(self.out_dir, table, f"part-{index:05d}.tsv")
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.writelines(copy_line(row) for row in rows)
+
+    def finish(self, spec: GenSpec):
+        manifest = {"spec": {**asdict(spec), "end": spec.end.isoformat()},
+                    "columns": COLUMNS, "chunk_rows": CHUNK_ROWS}
+        with open(os.path.join(self.out_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+
+# One connection per backend per worker process.
+_connections: dict = {}
+
+
+def _connection(backend: str):
+    conn = _connections.get(backend)
+    if conn is None:
+        if backend == "mysql":
+            import mysql.connector
+            conn = mysql.connector.connect(host=os.environ["MYSQL_HOST"], port=int(os.environ["MYSQL_PORT"]),
+                                           user=os.environ["MYSQL_USER"], password=os.environ["MYSQL_PASSWORD"],
+                                           database=os.environ["MYSQL_DB"], autocommit=True)
+        else:
+            import psycopg2
+            prefix = "PG_SALES_" if backend == "pg_sales" else "PG_"
+            default_db = "sales_db" if backend == "pg_sales" else "postgres"
+            conn = psycopg2.connect(host=os.environ[f"{prefix}HOST"], port=int(os.environ[f"{prefix}PORT"]),
+                                    dbname=os.getenv(f"{prefix}DB", default_db), user=os.environ[f"{prefix}USER"],
+                                    password=os.environ[f"{prefix}PASSWORD"], sslmode="require")
+            conn.autocommit = True
+        _connections[backend] = conn
+    return conn
+
+
+def _close_connections():
+    while _connections:
+        _connections.popitem()[1].close()
+
+
+class DatabaseSink:
+    """Replaces the generated tables' contents in MySQL and both Postgres databases.
+
+    Products go to ProductsCache and Postgres products, sales to MySQL Sales and
+    Postgres sales, so the two copies agree the way ProductsSync would keep them.
+    """
+
+    def prepare(self, spec: GenSpec):
+        cur = _connection("mysql").cursor()
+        cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in ("Sales", "CallLogs", "Customers", "ProductsCache",
+                      "CallLogRollup", "CallTermDaily", "CallTermTotals", "CallTermPending"):
+            cur.execute(f"TRUNCATE TABLE {table}")
+        cur.execute("SET FOREIGN_KEY_CHECKS = 1")
+        # products_changes restarts at 1 below, so ProductsSync's high-water mark must too.
+        cur.execute("DELETE FROM SyncState WHERE Name = %s", (SYNC_STATE_NAME,))
+        cur.close()
+        with _connection("postgres").cursor() as pg_cur:
+            pg_cur.execute("TRUNCATE products, products_changes RESTART IDENTITY")
+        with _connection("pg_sales").cursor() as sales_cur:
+            sales_cur.execute("TRUNCATE sales RESTART IDENTITY")
+
+    def write(self, table: str, index: int, rows: list):
+        cur = _connection("mysql").cursor()
+        load_mysql(cur, table, rows)
+        cur.close()
+        if table == "products":
+            with _connection("postgres").cursor() as pg_cur:
+                copy_rows(pg_cur, "products", COLUMNS["products"], rows)
+        elif table == "sales":
+            with _connection("pg_sales").cursor() as sales_cur:
+                copy_rows(sales_cur, "sales", PG_SALES_COLUMNS, rows)
+
+    def finish(self, spec: GenSpec):
+        with _connection("postgres").cursor() as pg_cur:
+            pg_cur.execute("SELECT setval(pg_get_serial_sequence('products', 'id'), (SELECT MAX(id) FROM products))")
+        with _connection("pg_sales").cursor() as sales_cur:
+            sales_cur.execute("SELECT setval(pg_get_serial_sequence('sales', 'id'), (SELECT MAX(id) FROM sales))")
+        cur = _connection("mysql").cursor()
+        # Fold the queued transcripts here, once, rather than from every worker.
+        while fold_pending_terms(cur, FOLD_BATCH_ROWS):
+            pass
+        # A reload can end on the same MAX(LogID); move the version so cached analyses are dropped.
+        cur.execute("INSERT INTO DataVersion (Name, Writes) VALUES ('calllogs', 1)"
+                    " ON DUPLICATE KEY UPDATE Writes = Writes + 1")
+        cur.close()
+
+
+def _run_task(job: tuple) -> tuple:
+    spec, sink, (table, index, first_id, count) = job
+    sink.write(table, index, generate_chunk(spec, table, index, first_id, count))
+    return table, count
+
+
+def generate(spec: GenSpec, sink, workers: Optional[int] = None, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """Generate every table into ``sink``, chunks spread over ``workers`` processes; returns rows/sec per table."""
+    workers = workers or os.cpu_count() or 1
+    sink.prepare(spec)
+    _close_connections()  # forked workers must not share the parent's sockets
+    report = {}
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        for phase in PHASES:
+            jobs = [(spec, sink, task) for table in phase for task in chunk_tasks(spec, table, chunk_rows)]
+            start = time.perf_counter()
+            done = pool.imap_unordered(_run_task, jobs) if pool else map(_run_task, jobs)
+            rows = {table: 0 for table in phase}
+            for table, count in done:
+                rows[table] += count
+            elapsed = time.perf_counter() - start
+            for table in phase:
+                report[table] = {"rows": rows[table], "seconds": round(elapsed, 3),
+                                 "rows_per_sec": round(rows[table] / elapsed) if elapsed > 0 else None}
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    sink.finish(spec)
+    _close_connections()
+    return report
+
+
+def main(args):
+    end = datetime.fromisoformat(args.end_date) if args.end_date else None
+    spec = GenSpec.at_scale(args.scale, seed=args.seed, end=end, history_days=args.history_days)
+    if args.target == "db":
+        from dotenv import load_dotenv
+        load_dotenv()
+    sink = FileSink(args.out_dir) if args.target == "files" else DatabaseSink()
+    print(f"Generating {', '.join(f'{spec.count(t):,} {t}' for t in COLUMNS)} (seed {spec.seed})")
+    for table, stats in generate(spec, sink, args.workers, args.chunk_rows).items():
+        print(f"✅ {table:>9}: {stats['rows']:>10,} rows  {stats['rows_per_sec']:>9,} rows/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier on BASE_COUNTS")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--target", choices=["files", "db"], default="files")
+    parser.add_argument("--out-dir", default="data")
+    parser.add_argument("--end-date", default=None, help="ISO date the history ends on (default: today)")
+    parser.add_argument("--history-days", type=int, default=365)
+    main(parser.parse_args())
@@ -0,0 +1,88 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class DBQueueTimeout(RuntimeError):
+    pass
+
+
+class DBExecutor:
+    """Runs blocking driver calls on a bounded thread pool.
+
+    Each backend gets its own concurrency limit so a burst of slow MySQL work
+    cannot take every worker away from Postgres; callers waiting longer than
+    ``queue_timeout`` for a slot get ``DBQueueTimeout``.
+    """
+
+    def __init__(self, max_workers: int = 32, limits: dict[str, int] | None = None, queue_timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def _backend(self, backend: str) -> tuple[asyncio.Semaphore, dict]:
+        with self._lock:
+            sem = self._semaphores.get(backend)
+            if sem is None:
+                sem = asyncio.Semaphore(self.limits.get(backend, self.max_workers))
+                self._semaphores[backend] = sem
+                self._stats[backend] = {"running": 0, "queued": 0, "completed": 0,
+                                        "failed": 0, "timeouts": 0, "queue_wait": 0.0}
+            return sem, self._stats[backend]
+
+    async def run(self, backend: str, fn: Callable, *args, **kwargs) -> Any:
+        sem, stats = self._backend(backend)
+        start = time.monotonic()
+        stats["queued"] += 1
+        try:
+            await asyncio.wait_for(sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise DBQueueTimeout(
+                f"{backend} is busy: no database slot free after {self.queue_timeout:.1f}s"
+            ) from None
+        finally:
+            stats["queued"] -= 1
+
+        stats["queue_wait"] += time.monotonic() - start
+        stats["running"] += 1
+        try:
+            ctx = contextvars.copy_context()
+            call = functools.partial(ctx.run, fn, *args, **kwargs)
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, call)
+            stats["completed"] += 1
+            return result
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["running"] -= 1
+            sem.release()
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            result = []
+            for backend, s in self._stats.items():
+                done = s["completed"] + s["failed"]
+                result.append({
+                    "backend": backend,
+                    "limit": self.limits.get(backend, self.max_workers),
+                    "running": s["running"],
+                    "queued": s["queued"],
+                    "completed": s["completed"],
+                    "failed": s["failed"],
+                    "timeouts": s["timeouts"],
+                    "avg_queue_wait_ms": round(s["queue_wait"] * 1000 / done, 3) if done else 0.0,
+                })
+            return result
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
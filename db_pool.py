@@ -0,0 +1,295 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class PoolTimeout(RuntimeError):
+    pass
+
+
+class PooledConnection:
+    """DB-API connection proxy; close() hands the connection back to its pool."""
+
+    def __init__(self, pool: "ConnectionPool", raw: Any, created_at: float, generation: int = 0):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._generation = generation
+        self._released = False
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool._release(self)
+
+    def discard(self):
+        """Drop the underlying connection instead of returning it to the pool."""
+        if not self._released:
+            self._released = True
+            self._pool._release(self, broken=True)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._raw, name, value)
+
+    def __del__(self):
+        # Safety net for code paths that drop a connection without closing it.
+        try:
+            self.discard()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """Thread-safe connection pool with overflow, max lifetime and idle health checks.
+
+    ``factory`` opens a new raw connection, ``ping`` returns False for a dead
+    connection and ``reset`` is called on every return (it returns False when the
+    connection must be discarded).
+    """
+
+    def __init__(
+            self,
+            name: str,
+            factory: Callable[[], Any],
+            size: int = 10,
+            max_overflow: int = 10,
+            min_size: int = 0,
+            recycle: float = 1800.0,
+            pre_ping: float = 30.0,
+            timeout: float = 30.0,
+            ping: Optional[Callable[[Any], bool]] = None,
+            reset: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.name = name
+        self._factory = factory
+        self.size = max(1, size)
+        self.max_overflow = max(0, max_overflow)
+        self.min_size = min(max(0, min_size), self.size)
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+        self._ping = ping
+        self._reset = reset
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (raw, created_at, last_used)
+        self._generation = 0  # bumped by dispose(); older connections are closed on return
+        self._total = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._checkout_buckets = deque(maxlen=60)  # [second, count]
+
+    def connect(self) -> PooledConnection:
+        start = time.monotonic()
+        deadline = start + self.timeout
+        raw = None
+        created_at = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at, last_used = self._idle.pop()
+                    break
+                if self._total < self.size + self.max_overflow:
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"{self.name} pool exhausted: {self._in_use} in use, "
+                        f"waited {self.timeout:.1f}s"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            self._in_use += 1
+
+        try:
+            if raw is not None:
+                now = time.monotonic()
+                if self.recycle and now - created_at > self.recycle:
+                    self._close_raw(raw)
+                    raw = None
+                elif self.pre_ping is not None and now - last_used > self.pre_ping and not self._is_alive(raw):
+                    self._close_raw(raw)
+                    raw = None
+            if raw is None:
+                raw = self._factory()
+                created_at = time.monotonic()
+                with self._cond:
+                    self._created += 1
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            generation = self._generation
+            self._checkouts += 1
+            self._wait_time += time.monotonic() - start
+            second = int(time.time())
+            if self._checkout_buckets and self._checkout_buckets[-1][0] == second:
+                self._checkout_buckets[-1][1] += 1
+            else:
+                self._checkout_buckets.append([second, 1])
+
+        return PooledConnection(self, raw, created_at, generation)
+
+    def _is_alive(self, raw) -> bool:
+        if self._ping is None:
+            return True
+        try:
+            return bool(self._ping(raw))
+        except Exception:
+            return False
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._discarded += 1
+
+    def _release(self, conn: PooledConnection, broken: bool = False):
+        raw = conn._raw
+        if not broken and self._reset is not None:
+            try:
+                broken = not self._reset(raw)
+            except Exception:
+                broken = True
+
+        with self._cond:
+            self._in_use -= 1
+            keep = not broken and self._total <= self.size and conn._generation == self._generation
+            if keep:
+                self._idle.append((raw, conn._created_at, time.monotonic()))
+            else:
+                self._total -= 1
+            self._cond.notify()
+
+        if not keep:
+            self._close_raw(raw)
+
+    def warm_up(self) -> int:
+        """Open connections until ``min_size`` are idle; returns how many were opened."""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._total >= self.min_size:
+                    return opened
+                self._total += 1
+            try:
+                raw = self._factory()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                raise
+            with self._cond:
+                self._created += 1
+                now = time.monotonic()
+                self._idle.append((raw, now, now))
+                self._cond.notify()
+            opened += 1
+
+    def dispose(self):
+        """Close every idle connection; checked-out ones are closed on return."""
+        with self._cond:
+            self._generation += 1
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for raw, _, _ in idle:
+            self._close_raw(raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = int(time.time())
+            recent = sum(count for second, count in self._checkout_buckets if now - second < 10)
+            return {
+                "pool": self.name,
+                "min_size": self.min_size,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._total,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "overflow": max(0, self._total - self.size),
+                "waiters": self._waiters,
+                "checkouts": self._checkouts,
+                "checkouts_per_sec": round(recent / 10.0, 2),
+                "avg_wait_ms": round(self._wait_time * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                "created": self._created,
+                "discarded": self._discarded,
+                "timeouts": self._timeouts,
+            }
+
+
+def mysql_ping(raw) -> bool:
+    raw.ping(reconnect=False)
+    return True
+
+
+def mysql_reset(raw) -> bool:
+    if not raw.is_connected():
+        return False
+    if raw.in_transaction:
+        raw.rollback()
+    if not raw.autocommit:
+        raw.autocommit = True
+    return True
+
+
+def pg_ping(raw) -> bool:
+    cur = raw.cursor()
+    try:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    finally:
+        cur.close()
+    if not raw.autocommit:
+        raw.rollback()
+    return True
+
+
+def pg_reset(raw) -> bool:
+    from psycopg2 import extensions
+
+    if raw.closed:
+        return False
+    status = raw.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        raw.rollback()
+    if raw.autocommit:
+        raw.autocommit = False
+    return True
@@ -0,0 +1,133 @@
+import contextvars
+from typing import Any, Callable, Optional
+
+_current_session: contextvars.ContextVar = contextvars.ContextVar("db_session", default=None)
+
+
+class SessionConnection:
+    """Connection handed out inside a session; close() and commit() are deferred to the session."""
+
+    def __init__(self, conn, cursor_kwargs: dict | None = None):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_cursor_kwargs", cursor_kwargs or {})
+
+    def cursor(self, *args, **kwargs):
+        return self._conn.cursor(*args, **{**self._cursor_kwargs, **kwargs})
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+class DBSession:
+    """Unit of work for one tool call: at most one connection per backend, one commit at the end.
+
+    ``openers`` maps a backend name to a callable returning a (pooled)
+    connection and, optionally, the cursor kwargs to use on it. The end commits
+    only if the body returned normally and did not call ``mark_failed``.
+    """
+
+    def __init__(self, openers: dict[str, Callable[[], Any]], cursor_kwargs: dict[str, dict] | None = None):
+        self._openers = openers
+        self._cursor_kwargs = cursor_kwargs or {}
+        self._conns: dict[str, Any] = {}
+        self._after_commit: list[Callable[[], Any]] = []
+        self._failed = False
+        self._token = None
+
+    def connection(self, backend: str) -> SessionConnection:
+        conn = self._conns.get(backend)
+        if conn is None:
+            conn = self._openers[backend]()
+            if conn.autocommit:
+                conn.autocommit = False
+            self._conns[backend] = conn
+        return SessionConnection(conn, self._cursor_kwargs.get(backend))
+
+    @property
+    def backends(self) -> list[str]:
+        return list(self._conns)
+
+    def mark_failed(self):
+        """Roll back instead of committing when the session ends."""
+        self._failed = True
+
+    def after_commit(self, callback: Callable[[], Any]):
+        self._after_commit.append(callback)
+
+    def commit(self):
+        for conn in self._conns.values():
+            conn.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self._after_commit = []
+        for conn in self._conns.values():
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+
+    def close(self):
+        conns, self._conns = self._conns, {}
+        for conn in conns.values():
+            conn.close()
+
+    def __enter__(self):
+        self._token = _current_session.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and not self._failed:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+            _current_session.reset(self._token)
+        return False
+
+
+def current_session() -> Optional[DBSession]:
+    return _current_session.get()
+
+
+def on_commit(callback: Callable[[], Any]):
+    """Run ``callback`` once the current session commits, or right away outside a session."""
+    session = current_session()
+    if session is None:
+        callback()
+    else:
+        session.after_commit(callback)
+
+
+def mark_failed():
+    """Make the current session roll back instead of committing; no-op outside a session."""
+    session = current_session()
+    if session is not None:
+        session.mark_failed()
+
+
+def is_error_response(response: Any) -> bool:
+    """Tool bodies report failures as ``{"result": "❌ ..."}`` instead of raising."""
+    return isinstance(response, dict) and str(response.get("result", "")).startswith("❌")
+
+
+def run_in_session(openers: dict, cursor_kwargs: dict, fn: Callable, *args, **kwargs) -> Any:
+    """Run ``fn`` in a fresh session; an error response rolls back whatever it wrote before failing."""
+    with DBSession(openers, cursor_kwargs) as session:
+        response = fn(*args, **kwargs)
+        if is_error_response(response):
+            session.mark_failed()
+        return response
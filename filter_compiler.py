@@ -0,0 +1,136 @@
+import re
+from functools import lru_cache
+
+FILTER_CACHE_SIZE = 1024
+
+_GREATER = ('exceed', 'above', 'greater', 'more', '>')
+_LESS = ('below', 'less', 'under', '<')
+_EQUAL = ('equal', 'is', '=')
+
+_PRICE_PATTERNS = [re.compile(p) for p in (
+    r'total[_\s]*price[_\s]*(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)',
+    r'(>|>=|exceed[s]?|above|greater\s+than|more\s+than)\s*\$?(\d+(?:\.\d+)?)\s*total[_\s]*price',
+    r'total[_\s]*price[_\s]*(<|<=|below|less\s+than|under)\s*\$?(\d+(?:\.\d+)?)',
+    r'total[_\s]*price[_\s]*(=|equals?|is)\s*\$?(\d+(?:\.\d+)?)',
+)]
+
+_QUANTITY_PATTERNS = [re.compile(p) for p in (
+    r'quantity[_\s]*(>|>=|greater\s+than|more\s+than|above)\s*(\d+)',
+    r'quantity[_\s]*(<|<=|less\s+than|below|under)\s*(\d+)',
+    r'quantity[_\s]*(=|equals?|is)\s*(\d+)',
+)]
+
+_CUSTOMER_PATTERNS = [re.compile(p) for p in (
+    r'customer[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
+    r'customer[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
+    r'customer[_\s]*=[_\s]*["\']([^"\']+)["\']',
+    r'customer[_\s]*name[_\s]*([a-zA-Z\s]+?)(?:\s|$)',
+)]
+
+_PRODUCT_PATTERNS = [re.compile(p) for p in (
+    r'product[_\s]*name[_\s]*like[_\s]*["\']([^"\']+)["\']',
+    r'product[_\s]*name[_\s]*=[_\s]*["\']([^"\']+)["\']',
+    r'product[_\s]*=[_\s]*["\']([^"\']+)["\']',
+)]
+
+_NUMBER = re.compile(r'\$?(\d+(?:\.\d+)?)')
+
+
+class FilterCompileError(ValueError):
+    pass
+
+
+def _first_match(patterns: list, clause: str):
+    for pattern in patterns:
+        match = pattern.search(clause)
+        if match:
+            return match
+    return None
+
+
+def _operator(operator_text: str) -> str:
+    if any(word in operator_text for word in _GREATER):
+        return '>'
+    if any(word in operator_text for word in _LESS):
+        return '<'
+    if any(word in operator_text for word in _EQUAL):
+        return '='
+    return '>'
+
+
+def _quantity_operator(operator_text: str) -> str:
+    if any(word in operator_text for word in ('>', 'greater', 'more', 'above')):
+        return '>'
+    if any(word in operator_text for word in ('<', 'less', 'below', 'under')):
+        return '<'
+    return '='
+
+
+def _text_predicate(column: str, value: str, clause: str) -> tuple:
+    if 'like' in clause:
+        return f"{column} LIKE %s", f"%{value}%"
+    return f"{column} = %s", value
+
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _compile(clause: str) -> tuple:
+    conditions, params = [], []
+
+    match = _first_match(_PRICE_PATTERNS, clause)
+    if match:
+        operator_text, value = match.groups()
+        conditions.append(f"s.total_price {_operator(operator_text)} %s")
+        params.append(float(value))
+
+    match = _first_match(_QUANTITY_PATTERNS, clause)
+    if match:
+        operator_text, value = match.groups()
+        conditions.append(f"s.quantity {_quantity_operator(operator_text)} %s")
+        params.append(int(value))
+
+    match = _first_match(_CUSTOMER_PATTERNS, clause)
+    if match:
+        condition, param = _text_predicate("c.Name", match.group(1).strip(), clause)
+        conditions.append(condition)
+        params.append(param)
+
+    match = _first_match(_PRODUCT_PATTERNS, clause)
+    if match:
+        condition, param = _text_predicate("p.name", match.group(1).strip(), clause)
+        conditions.append(condition)
+        params.append(param)
+
+    if not conditions:
+        match = _NUMBER.search(clause)
+        if match:
+            if any(word in clause for word in ('below', 'less', 'under')):
+                conditions.append("s.total_price < %s")
+            else:
+                conditions.append("s.total_price > %s")
+            params.append(float(match.group(1)))
+
+    if not conditions:
+        raise FilterCompileError(f"Could not understand where_clause '{clause}'")
+    return tuple(conditions), tuple(params)
+
+
+def compile_sales_filter(where_clause: str) -> tuple[tuple, tuple]:
+    """Turn a natural-language sales filter into ``(conditions, params)`` for a parameterized WHERE.
+
+    Results are memoized per normalized clause. Raises FilterCompileError when
+    nothing in the clause can be turned into a predicate.
+    """
+    return _compile(where_clause.strip().lower())
+
+
+def cache_stats() -> dict:
+    info = _compile.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "cache": "sales_filter",
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
@@ -3,22 +3,84 @@
 from fastmcp import FastMCP
 
 from google.cloud import bigquery
+import contextvars
+import functools
 import os
+from columnar import RESULT_FORMATS, records_to_columnar
+from result_governor import ResultGovernor, RowBudget, decode_token, encode_token
+from serializer import convert_rows, dumps
 #os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"D:\MCP_NEW\service_account.json"
 
 # === Create an MCP server ===
-mcp = FastMCP("CustomerProductSalesMCP")
+mcp = FastMCP("CustomerProductSalesMCP", tool_serializer=dumps)
 
 # === BigQuery Client Initialization ===
 bq_client = bigquery.Client()
 
+# Per-tool row / byte caps (RESULT_MAX_ROWS, RESULT_MAX_BYTES, RESULT_MAX_ROWS_<TOOL>, ...).
+result_governor = ResultGovernor.from_env()
+BQ_PAGE_SIZE = int(os.getenv("BQ_PAGE_SIZE", "1000"))
+
+# Limits and truncation outcome of the tool call in progress; see governed().
+_bq_call: contextvars.ContextVar = contextvars.ContextVar("bq_call", default=None)
+
+
+def governed(fn):
+    """Cap what run_bq returns inside this tool; truncated responses get total_estimate and continuation."""
+    limits = result_governor.limits(fn.__name__)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        call = {"tool": fn.__name__, "limits": limits, "continuation": kwargs.get("continuation")}
+        token = _bq_call.set(call)
+        try:
+            response = fn(*args, **kwargs)
+        finally:
+            _bq_call.reset(token)
+        if call.get("truncated") and isinstance(response, dict):
+            response.update(truncated=True, total_estimate=call["total_estimate"], continuation=call["next"])
+        return response
+    return wrapper
+
+
 def run_bq(sql: str):
-    """Run a BigQuery SQL and return rows as list of dicts."""
-    if not sql or not sql.strip():
-        raise ValueError("Expected a non-empty SQL string.")
-    job = bq_client.query(sql)
-    result = job.result()
-    return [dict(row.items()) for row in result]
+    """Run a BigQuery SQL (or resume the call's continuation token) and return rows as list of dicts."""
+    call = _bq_call.get() or {"tool": None, "limits": result_governor.default, "continuation": None}
+    limits = call["limits"]
+    if call["continuation"]:
+        state = decode_token(call["continuation"])
+        if state.get("tool") != call["tool"]:
+            raise ValueError("Continuation token belongs to a different tool.")
+        job = bq_client.get_job(state["job"], location=state.get("location"))
+        start = int(state["offset"])
+    else:
+        if not sql or not sql.strip():
+            raise ValueError("Expected a non-empty SQL string.")
+        job = bq_client.query(sql)
+        start = 0
+
+    # Pages are fetched lazily, so stopping at the cap stops the download.
+    result = job.result(start_index=start, page_size=min(limits.max_rows + 1, BQ_PAGE_SIZE))
+    budget = RowBudget(limits)
+    rows = []
+    for row in result:
+        values = row.values()
+        if not budget.admit(values):
+            call.update(truncated=True, total_estimate=result.total_rows, next=encode_token(
+                {"tool": call["tool"], "job": job.job_id, "location": job.location, "offset": start + len(rows)}))
+            break
+        rows.append(values)
+    # NUMERIC/BIGNUMERIC, DATE, TIMESTAMP and BYTES are converted once per column.
+    return convert_rows([field.name for field in result.schema], rows)
+
+
+def format_rows(rows: list, result_format: str = None):
+    """Rows as returned by run_bq, or ``{columns, types, rows, dictionaries}`` for result_format="columnar"."""
+    if result_format == "columnar":
+        return records_to_columnar(rows)
+    if result_format not in (None, "rows"):
+        raise ValueError(f"Unknown result_format '{result_format}'. Use one of {list(RESULT_FORMATS)}.")
+    return rows
 
 
 # -----------------------------------------------------------------------------
@@ -43,10 +105,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.Customer` WHERE JoinDate >= '2024-01-01'
 """)
-def Bigquery_Customer(sql: str) -> dict:
+@governed
+def Bigquery_Customer(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "Customer", "row_count": len(rows), "rows": rows}
+        return {"table": "Customer", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -71,10 +134,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.Product` WHERE Category = 'Electronics'
 """)
-def Cloud_SQL_Product(sql: str) -> dict:
+@governed
+def Cloud_SQL_Product(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "Product", "row_count": len(rows), "rows": rows}
+        return {"table": "Product", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -99,10 +163,11 @@ Use this tool to:
 
 **Example:** SELECT CustomerID, SUM(TotalAmount) FROM `genai-poc-424806.MCP_demo.Sales` GROUP BY CustomerID
 """)
-def SAP_Hana_Sales(sql: str) -> dict:
+@governed
+def SAP_Hana_Sales(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "Sales", "row_count": len(rows), "rows": rows}
+        return {"table": "Sales", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -127,10 +192,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.CustomerFeedback` WHERE ProductID = 101
 """)
-def Oracle_CustomerFeedback(sql: str) -> dict:
+@governed
+def Oracle_CustomerFeedback(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "CustomerFeedback", "row_count": len(rows), "rows": rows}
+        return {"table": "CustomerFeedback", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -155,10 +221,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.CustomerCallLog` WHERE CallReason = 'Product Inquiry'
 """)
-def amazon_redshift_CustomerCallLog(sql: str) -> dict:
+@governed
+def amazon_redshift_CustomerCallLog(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "CustomerCallLog", "row_count": len(rows), "rows": rows}
+        return {"table": "CustomerCallLog", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -191,13 +258,14 @@ FROM `genai-poc-424806.MCP_demo.daily_market_indices_with_news`
 WHERE Date >= '2025-01-01'
 """,
 )
-def tool_daily_market_indices_with_news(sql: str) -> dict:
+@governed
+def tool_daily_market_indices_with_news(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
         return {
             "table": "daily_market_indices_with_news",
             "row_count": len(rows),
-            "rows": rows
+            "rows": format_rows(rows, result_format)
         }
     except Exception as e:
         print("Azure_SQL_database_daily_market_indices_with_news failed")
@@ -225,13 +293,14 @@ Use this tool to:
 SELECT * FROM `genai-poc-424806.MCP_demo.DMV_Customer_Feedback` where Score='(3-5)' and `Response Date`>'2025-07-05'
 """,
 )
-def tool_dmv_customer_feedback(sql: str) -> dict:
+@governed
+def tool_dmv_customer_feedback(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
         return {
             "table": "DMV_Customer_Feedback",
             "row_count": len(rows),
-            "rows": rows
+            "rows": format_rows(rows, result_format)
         }
     except Exception as e:
         print("Bigquery_dmv_customer_feedback failed")
@@ -263,10 +332,11 @@ Use this tool to:
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.threat_iocs` WHERE threat_actor = 'APT29'
 """
 )
-def tool_threat_iocs(sql: str) -> dict:
+@governed
+def tool_threat_iocs(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "threat_iocs", "row_count": len(rows), "rows": rows}
+        return {"table": "threat_iocs", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         print("Threat_Intelligence_IOCs failed")
         return {"error": str(e)}
@@ -297,10 +367,11 @@ Use this tool to:
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.soc_alerts` WHERE alert_severity = 'Critical' AND status = 'Open'
 """
 )
-def tool_soc_alerts(sql: str) -> dict:
+@governed
+def tool_soc_alerts(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "soc_alerts", "row_count": len(rows), "rows": rows}
+        return {"table": "soc_alerts", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         print("SOC_Alerts_Log failed")
         return {"error": str(e)}    
@@ -326,7 +397,8 @@ Use this tool to:
 
 **Example:** SELECT username, Phone_No, Address, emp_id, Password_Creation_Time, Password_Last_Modified FROM `genai-poc-424806.vapi_ai_demo.servicenow_users` WHERE Address LIKE '%San Jose%'
 """)
-def tool_Users(sql: str) -> dict:
+@governed
+def tool_Users(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         # Define the safe columns to be retrieved
         safe_columns = "username, Phone_No, Address, emp_id, Password_Creation_Time, Password_Last_Modified"
@@ -353,7 +425,7 @@ def tool_Users(sql: str) -> dict:
             safe_sql = f"SELECT {safe_columns} FROM `genai-poc-424806.vapi_ai_demo.servicenow_users`"
 
         rows = run_bq(safe_sql)
-        return {"table": "servicenow_users", "row_count": len(rows), "rows": rows}
+        return {"table": "servicenow_users", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -379,10 +451,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.vapi_ai_demo.servicenow_ticket_details` WHERE issues LIKE '%login%'
 """)
-def tool_TicketDetails(sql: str) -> dict:
+@governed
+def tool_TicketDetails(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "servicenow_ticket_details", "row_count": len(rows), "rows": rows}
+        return {"table": "servicenow_ticket_details", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -415,10 +488,11 @@ Use this tool to:
 
 **Example:** SELECT * FROM `genai-poc-424806.MCP_demo.Refund_Fraud_Detection` WHERE flagged = 'Yes'
 """)
-def BigQuery_RefundFraudDetection(sql: str) -> dict:
+@governed
+def BigQuery_RefundFraudDetection(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "Refund_Fraud_Detection", "row_count": len(rows), "rows": rows}
+        return {"table": "Refund_Fraud_Detection", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
     
@@ -451,10 +525,11 @@ SELECT *
 FROM `genai-poc-424806.MCP_demo.CarData` 
 WHERE Fuel_Type = 'Petrol' AND EXTRACT(YEAR FROM Year) > 2015
 """)
-def BigQuery_CarData(sql: str) -> dict:
+@governed
+def BigQuery_CarData(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "CarData", "row_count": len(rows), "rows": rows}
+        return {"table": "CarData", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -505,10 +580,11 @@ SELECT DISTINCT
 FROM `genai-poc-424806.MCP_demo.CarData`
 WHERE Selling_Price > 0 AND Kms_Driven < 500000;
 """)
-def BigQuery_CarDataPreprocess(sql: str) -> dict:
+@governed
+def BigQuery_CarDataPreprocess(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "CleanedCarData", "row_count": len(rows) if rows else 0, "rows": rows}
+        return {"table": "CleanedCarData", "row_count": len(rows) if rows else 0, "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -588,14 +664,15 @@ LEFT JOIN `genai-poc-424806.gallo_mcp_demo.payments` p ON i.invoice_id = p.invoi
 GROUP BY po.po_number, po.amount
 ```
 """)
-def Bigquery_gallo_DB_MCP_Demo(sql: str) -> dict:
+@governed
+def Bigquery_gallo_DB_MCP_Demo(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
         return {
             "query_success": True,
             "row_count": len(rows),
             "sample_row": rows[0] if rows else None,
-            "rows": rows
+            "rows": format_rows(rows, result_format)
         }
     except Exception as e:
         return {
@@ -636,10 +713,11 @@ Use this tool to:
 - SELECT race_ethnicity, COUNT(*) AS n FROM `your-project.your_dataset.youth_health_records` GROUP BY race_ethnicity ORDER BY n DESC
 - SELECT * FROM `your-project.your_dataset.youth_health_records` WHERE LOWER(name_of_youth) LIKE '%garcia%'
 """)
-def Bigquery_YouthHealthRecords(sql: str) -> dict:
+@governed
+def Bigquery_YouthHealthRecords(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "youth_health_records", "row_count": len(rows), "rows": rows}
+        return {"table": "youth_health_records", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
@@ -709,14 +787,15 @@ containing **UCC filings** and **collateral**.
   ))
   GROUP BY flag ORDER BY count_true DESC;
 """)
-def Bigquery_UCC(sql: str) -> dict:
+@governed
+def Bigquery_UCC(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
         return {
             "query_success": True,
             "row_count": len(rows),
             "sample_row": rows[0] if rows else None,
-            "rows": rows,
+            "rows": format_rows(rows, result_format),
         }
     except Exception as e:
         return {
@@ -830,7 +909,8 @@ SELECT
   MAX(temperature_2m_max) AS max_tmax
 FROM `genai-poc-424806.SAC_CEQA.sac_heat`;       
 """)
-def Bigquery_SAC_CEQA_Analytics(sql: str) -> dict:
+@governed
+def Bigquery_SAC_CEQA_Analytics(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
         return {
@@ -838,7 +918,7 @@ def Bigquery_SAC_CEQA_Analytics(sql: str) -> dict:
             "query_success": True,
             "row_count": len(rows),
             "sample_row": rows[0] if rows else None,
-            "rows": rows
+            "rows": format_rows(rows, result_format)
         }
     except Exception as e:
         return {
@@ -973,7 +1053,8 @@ SELECT consumer_id, monthandyear, anomaly_score, risk_score, health_status
 FROM `genai-poc-424806.MSME.MSME2023-2025 Anomaly`
 WHERE district = 'Chennai' AND tariff_category = 'HT-I';
 """)
-def BigQuery_MSME_Anomaly(sql: str) -> dict:
+@governed
+def BigQuery_MSME_Anomaly(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
 
@@ -1010,7 +1091,7 @@ def BigQuery_MSME_Anomaly(sql: str) -> dict:
         return {
             "table": "MSME2023-2025 Anomaly",
             "row_count": len(rows),
-            "rows": rows,
+            "rows": format_rows(rows, result_format),
             "insights": insights
         }
     except Exception as e:
@@ -1047,10 +1128,11 @@ Use this tool to:
   WHERE industry = 'Textile Industry' 
   ORDER BY predicted_date ASC
 """)
-def Bigquery_PredictedConsumptionTimeseries(sql: str) -> dict:
+@governed
+def Bigquery_PredictedConsumptionTimeseries(sql: str, result_format: str = None, continuation: str = None) -> dict:
     try:
         rows = run_bq(sql)
-        return {"table": "predicted_consumption_timeseries", "row_count": len(rows), "rows": rows}
+        return {"table": "predicted_consumption_timeseries", "row_count": len(rows), "rows": format_rows(rows, result_format)}
     except Exception as e:
         return {"error": str(e)}
 
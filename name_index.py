@@ -0,0 +1,178 @@
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+MATCH_RANKS = {"exact_full_name": 0, "exact_name_part": 1, "partial": 2}
+
+
+def normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def trigrams(value: str) -> set:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class CustomerNameIndex:
+    """In-memory exact / name-part / trigram index over Customers.
+
+    ``loader(ids=None, after_id=None)`` returns ``(Id, FirstName, LastName, Name, Email)``
+    rows: every row when both are None, otherwise the given ids plus rows with
+    ``Id > after_id``. Writes made through the server mark ids stale and the
+    index reloads just those rows on the next lookup; rows inserted by other
+    writers are picked up by polling ``Id > max_id`` and a periodic full reload.
+    Full reloads build a new index without holding the lock; periodic ones run
+    in a background thread while lookups keep using the current index.
+    """
+
+    def __init__(self, loader: Callable[..., Iterable[tuple]], poll_interval: float = 5.0,
+                 full_reload_interval: float = 600.0):
+        self._loader = loader
+        self.poll_interval = poll_interval
+        self.full_reload_interval = full_reload_interval
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self._rows: dict[int, tuple] = {}  # Id -> (name, email, name_norm, first_norm, last_norm)
+        self._by_name: dict[str, set] = {}
+        self._by_part: dict[str, set] = {}
+        self._by_trigram: dict[str, set] = {}
+        self._max_id = 0
+        self._stale: set = set()
+        self._loaded_at = None
+        self._polled_at = 0.0
+        self._lookups = 0
+        self._refreshes = 0
+
+    def _index(self, key: str, index: dict, customer_id: int):
+        if key:
+            index.setdefault(key, set()).add(customer_id)
+
+    def _unindex(self, key: str, index: dict, customer_id: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(customer_id)
+            if not ids:
+                del index[key]
+
+    def _add(self, row: tuple):
+        customer_id, first_name, last_name, name, email = row
+        self._remove(customer_id)
+        name_norm, first_norm, last_norm = normalize(name), normalize(first_name), normalize(last_name)
+        self._rows[customer_id] = (name, email, name_norm, first_norm, last_norm)
+        self._index(name_norm, self._by_name, customer_id)
+        self._index(first_norm, self._by_part, customer_id)
+        self._index(last_norm, self._by_part, customer_id)
+        for gram in trigrams(name_norm) | trigrams(first_norm) | trigrams(last_norm):
+            self._index(gram, self._by_trigram, customer_id)
+        self._max_id = max(self._max_id, customer_id)
+
+    def _remove(self, customer_id: int):
+        entry = self._rows.pop(customer_id, None)
+        if entry is None:
+            return
+        _, _, name_norm, first_norm, last_norm = entry
+        self._unindex(name_norm, self._by_name, customer_id)
+        self._unindex(first_norm, self._by_part, customer_id)
+        self._unindex(last_norm, self._by_part, customer_id)
+        for gram in trigrams(name_norm) | trigrams(first_norm) | trigrams(last_norm):
+            self._unindex(gram, self._by_trigram, customer_id)
+
+    def mark_stale(self, customer_id: int = None):
+        """Reload ``customer_id`` (or poll for new rows when None) before the next lookup."""
+        with self._lock:
+            if customer_id is None:
+                self._polled_at = 0.0
+            else:
+                self._stale.add(customer_id)
+
+    def refresh(self, force_full: bool = False):
+        with self._lock:
+            now = time.monotonic()
+            loaded_at = self._loaded_at
+            if loaded_at is not None and not force_full:
+                if now - loaded_at > self.full_reload_interval and not self._reloading:
+                    self._reloading = True
+                    threading.Thread(target=self._background_reload, args=(loaded_at,),
+                                     name="customer-name-index-reload", daemon=True).start()
+                self._apply_changes(now)
+                return
+        self._full_reload(loaded_at)
+
+    def _background_reload(self, loaded_at):
+        try:
+            self._full_reload(loaded_at)
+        except Exception:
+            pass  # the next lookup past full_reload_interval tries again
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def _full_reload(self, loaded_at):
+        with self._reload_lock:
+            with self._lock:
+                if self._loaded_at != loaded_at:
+                    return  # another caller reloaded while this one waited
+                pending = set(self._stale)
+            fresh = CustomerNameIndex(self._loader)
+            for row in self._loader():
+                fresh._add(row)
+            with self._lock:
+                self._rows, self._by_name = fresh._rows, fresh._by_name
+                self._by_part, self._by_trigram = fresh._by_part, fresh._by_trigram
+                self._max_id = fresh._max_id
+                # Only ids marked before the load started are covered by it.
+                self._stale -= pending
+                self._loaded_at = self._polled_at = time.monotonic()
+                self._refreshes += 1
+
+    def _apply_changes(self, now: float):
+        if not self._stale and now - self._polled_at < self.poll_interval:
+            return
+        stale, self._stale = self._stale, set()
+        rows = list(self._loader(ids=sorted(stale), after_id=self._max_id))
+        found = {row[0] for row in rows}
+        for customer_id in stale - found:
+            self._remove(customer_id)
+        for row in rows:
+            self._add(row)
+        self._polled_at = now
+        self._refreshes += 1
+
+    def _partial_candidates(self, query: str) -> Iterable[int]:
+        grams = trigrams(query)
+        if not grams:
+            return list(self._rows)
+        postings = sorted((self._by_trigram.get(g, set()) for g in grams), key=len)
+        return set.intersection(*postings) if postings[0] else set()
+
+    def search(self, name: str) -> list[dict]:
+        """Matches of the best tier (exact full name, then name part, then partial), ranked by Id."""
+        self.refresh()
+        query = normalize(name)
+        with self._lock:
+            self._lookups += 1
+            ids = self._by_name.get(query)
+            match_type = "exact_full_name"
+            if not ids:
+                ids = self._by_part.get(query)
+                match_type = "exact_name_part"
+            if not ids:
+                ids = [cid for cid in self._partial_candidates(query)
+                       if any(query in field for field in self._rows[cid][2:])]
+                match_type = "partial"
+            return [
+                {"id": cid, "name": self._rows[cid][0], "email": self._rows[cid][1], "match_type": match_type}
+                for cid in sorted(ids)
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "customers": len(self._rows),
+                "trigrams": len(self._by_trigram),
+                "max_id": self._max_id,
+                "stale": len(self._stale),
+                "lookups": self._lookups,
+                "refreshes": self._refreshes,
+            }
@@ -0,0 +1,49 @@
+from datetime import date, datetime
+from typing import Iterable, Sequence
+
+COPY_READ_SIZE = 64 * 1024
+
+
+def copy_value(value) -> str:
+    """One field in COPY text format (also what MySQL LOAD DATA reads): NULL is \\N, separators escaped."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_line(row: Sequence) -> str:
+    return "\t".join(copy_value(v) for v in row) + "\n"
+
+
+class CopyStream:
+    """File-like object that encodes rows only as COPY reads them, so any iterable streams in bounded memory."""
+
+    def __init__(self, rows: Iterable[Sequence]):
+        self._rows = iter(rows)
+        self._buffer = bytearray()
+        self.rows = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer.extend(copy_line(row).encode("utf-8"))
+            self.rows += 1
+        if size < 0:
+            size = len(self._buffer)
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+
+def copy_rows(pg_cur, table: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """Bulk-insert ``rows`` into ``table`` with a single COPY ... FROM STDIN; returns the row count."""
+    stream = CopyStream(rows)
+    pg_cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", stream, size=COPY_READ_SIZE)
+    return stream.rows
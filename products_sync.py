@@ -0,0 +1,348 @@
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+NOTIFY_CHANNEL = "products_changed"
+
+PG_CHANGE_CAPTURE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS products_changes
+    (
+        change_id  BIGSERIAL PRIMARY KEY,
+        product_id INT         NOT NULL,
+        op         CHAR(1)     NOT NULL,
+        changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    );
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION products_capture_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO products_changes (product_id, op) VALUES (OLD.id, 'D');
+        ELSE
+            INSERT INTO products_changes (product_id, op) VALUES (NEW.id, LEFT(TG_OP, 1));
+        END IF;
+        PERFORM pg_notify('{NOTIFY_CHANNEL}', '');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    "DROP TRIGGER IF EXISTS products_capture_change ON products;",
+    """
+    CREATE TRIGGER products_capture_change
+        AFTER INSERT OR UPDATE OR DELETE ON products
+        FOR EACH ROW EXECUTE FUNCTION products_capture_change();
+    """,
+]
+
+MYSQL_SYNC_STATE_SQL = """
+    CREATE TABLE IF NOT EXISTS SyncState
+    (
+        Name         VARCHAR(50) PRIMARY KEY,
+        LastChangeId BIGINT      NOT NULL DEFAULT 0,
+        UpdatedAt    TIMESTAMP   DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    );
+"""
+
+STATE_NAME = "products"
+
+
+def install_change_capture(pg_cur):
+    for statement in PG_CHANGE_CAPTURE_SQL:
+        pg_cur.execute(statement)
+
+
+def install_sync_state(mysql_cur):
+    mysql_cur.execute(MYSQL_SYNC_STATE_SQL)
+
+
+class ProductsSync:
+    """Propagates Postgres ``products`` changes into the MySQL ``ProductsCache`` table.
+
+    A trigger appends every insert/update/delete to ``products_changes`` and
+    NOTIFYs ``products_changed``. The worker LISTENs for that (falling back to
+    polling every ``poll_interval`` seconds), reads changes past the high-water
+    mark stored in MySQL ``SyncState``, collapses them per product and applies
+    them as one upsert plus one soft delete (``DeletedAt``) per batch, so Sales
+    rows keep their product.
+
+    ``change_id`` comes from a sequence, so a transaction that commits late can
+    land below the mark. Ids skipped when the mark moves are remembered for
+    ``gap_timeout`` seconds and picked up if they appear; the catalog is also
+    fully resynced at start and every ``resync_interval`` seconds.
+    """
+
+    def __init__(self, pg_connect: Callable, mysql_connect: Callable, listen_connect: Callable = None,
+                 batch_size: int = 500, poll_interval: float = 5.0, retention: int = 10000,
+                 gap_timeout: float = 300.0, max_gaps: int = 10000, resync_interval: float = 3600.0):
+        self._pg_connect = pg_connect
+        self._mysql_connect = mysql_connect
+        self._listen_connect = listen_connect
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.gap_timeout = gap_timeout
+        self.max_gaps = max_gaps
+        self.resync_interval = resync_interval
+        self._gaps: dict[int, float] = {}  # change_id -> monotonic time it was skipped
+        self._resync_due = True
+        self._resynced_at = None
+        self._resyncs = 0
+        self._late = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._mode = "stopped"
+        self._batches = 0
+        self._upserts = 0
+        self._deletes = 0
+        self._errors = 0
+        self._last_error = None
+        self._last_sync_at = None
+        self._last_change_id = None
+        self._lag_seconds = 0.0
+
+    def _high_water_mark(self, mysql_cur) -> int:
+        mysql_cur.execute("SELECT LastChangeId FROM SyncState WHERE Name = %s", (STATE_NAME,))
+        rows = mysql_cur.fetchall()
+        return rows[0][0] if rows else 0
+
+    def _apply(self, mysql_cnxn, upserts: list, deletes: list, last_change_id: int):
+        mysql_cur = mysql_cnxn.cursor()
+        if upserts:
+            mysql_cur.execute(
+                "INSERT INTO ProductsCache (id, name, price, description) VALUES "
+                + ", ".join(["(%s, %s, %s, %s)"] * len(upserts))
+                + " ON DUPLICATE KEY UPDATE name = VALUES(name), price = VALUES(price),"
+                  " description = VALUES(description), DeletedAt = NULL",
+                [value for row in upserts for value in row],
+            )
+        if deletes:
+            mysql_cur.execute(
+                "UPDATE ProductsCache SET DeletedAt = CURRENT_TIMESTAMP"
+                f" WHERE id IN ({', '.join(['%s'] * len(deletes))}) AND DeletedAt IS NULL", deletes
+            )
+        mysql_cur.execute(
+            "INSERT INTO SyncState (Name, LastChangeId) VALUES (%s, %s)"
+            " ON DUPLICATE KEY UPDATE LastChangeId = VALUES(LastChangeId)",
+            (STATE_NAME, last_change_id),
+        )
+        mysql_cnxn.commit()
+
+    def _track_gaps(self, since: int, change_ids: list):
+        """Remember the ids in (since, max(change_ids)] that were not visible yet."""
+        if not change_ids:
+            return
+        seen = set(change_ids)
+        missing = max(change_ids) - since - len(seen)
+        if missing <= 0:
+            return
+        if len(self._gaps) + missing > self.max_gaps:
+            # Too many to chase one by one; the next resync reads the whole catalog.
+            self._resync_due = True
+            return
+        now = time.monotonic()
+        for change_id in range(since + 1, max(change_ids)):
+            if change_id not in seen:
+                self._gaps.setdefault(change_id, now)
+
+    def _late_changes(self, pg_cur) -> list:
+        """Changes that have appeared in earlier gaps; expired gaps (rolled back or lost) are dropped."""
+        cutoff = time.monotonic() - self.gap_timeout
+        self._gaps = {change_id: at for change_id, at in self._gaps.items() if at >= cutoff}
+        if not self._gaps:
+            return []
+        pg_cur.execute(
+            "SELECT change_id, product_id, changed_at FROM products_changes WHERE change_id = ANY(%s)",
+            (list(self._gaps),),
+        )
+        return pg_cur.fetchall()
+
+    def sync_once(self) -> int:
+        """Apply up to one batch of pending changes; returns how many change rows were consumed."""
+        with self._lock:
+            mysql_cnxn = self._mysql_connect()
+            pg_cnxn = self._pg_connect()
+            try:
+                mysql_cnxn.autocommit = False
+                mysql_cur = mysql_cnxn.cursor()
+                since = self._high_water_mark(mysql_cur)
+
+                pg_cur = pg_cnxn.cursor()
+                pg_cur.execute(
+                    "SELECT change_id, product_id, changed_at FROM products_changes"
+                    " WHERE change_id > %s ORDER BY change_id LIMIT %s",
+                    (since, self.batch_size),
+                )
+                changes = pg_cur.fetchall()
+                late = self._late_changes(pg_cur)
+                if not changes and not late:
+                    self._lag_seconds = 0.0
+                    self._last_sync_at = datetime.now(timezone.utc)
+                    return 0
+
+                product_ids = list({c[1] for c in changes + late})
+                pg_cur.execute(
+                    "SELECT id, name, price, description FROM products WHERE id = ANY(%s)", (product_ids,)
+                )
+                upserts = pg_cur.fetchall()
+                present = {r[0] for r in upserts}
+                deletes = [pid for pid in product_ids if pid not in present]
+                last_change_id = changes[-1][0] if changes else since
+
+                self._apply(mysql_cnxn, upserts, deletes, last_change_id)
+                for change in late:
+                    self._gaps.pop(change[0], None)
+                self._track_gaps(since, [c[0] for c in changes])
+
+                if self.retention and changes:
+                    pg_cur.execute("DELETE FROM products_changes WHERE change_id <= %s",
+                                   (last_change_id - self.retention,))
+                pg_cnxn.commit()
+
+                now = datetime.now(timezone.utc)
+                self._batches += 1
+                self._upserts += len(upserts)
+                self._deletes += len(deletes)
+                self._late += len(late)
+                self._last_change_id = last_change_id
+                self._last_sync_at = now
+                self._lag_seconds = max(0.0, (now - min(c[2] for c in changes + late)).total_seconds())
+                return len(changes)
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                raise
+            finally:
+                pg_cnxn.close()
+                mysql_cnxn.close()
+
+    def full_resync(self):
+        """Copy the whole catalog and move the high-water mark to the newest change."""
+        with self._lock:
+            mysql_cnxn = self._mysql_connect()
+            pg_cnxn = self._pg_connect()
+            try:
+                mysql_cnxn.autocommit = False
+                pg_cur = pg_cnxn.cursor()
+                # Read the mark first: anything committed after it is replayed by sync_once,
+                # and ids just below it that are still in flight are tracked as gaps.
+                pg_cur.execute("SELECT COALESCE(MAX(change_id), 0) FROM products_changes")
+                last_change_id = pg_cur.fetchone()[0]
+                window_start = max(0, last_change_id - self.batch_size)
+                pg_cur.execute("SELECT change_id FROM products_changes WHERE change_id > %s", (window_start,))
+                recent = [r[0] for r in pg_cur.fetchall()]
+                pg_cur.execute("SELECT id, name, price, description FROM products")
+                rows = pg_cur.fetchall()
+                pg_cnxn.commit()
+
+                mysql_cur = mysql_cnxn.cursor()
+                mysql_cur.execute("SELECT id FROM ProductsCache WHERE DeletedAt IS NULL")
+                present = {r[0] for r in rows}
+                deletes = [r[0] for r in mysql_cur.fetchall() if r[0] not in present]
+                for start in range(0, len(rows), self.batch_size):
+                    self._apply(mysql_cnxn, rows[start:start + self.batch_size], [], last_change_id)
+                self._apply(mysql_cnxn, [], deletes, last_change_id)
+                self._track_gaps(window_start, recent)
+                self._resync_due = False
+                self._resynced_at = time.monotonic()
+                self._resyncs += 1
+                self._upserts += len(rows)
+                self._deletes += len(deletes)
+                self._last_change_id = last_change_id
+                self._last_sync_at = datetime.now(timezone.utc)
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                raise
+            finally:
+                pg_cnxn.close()
+                mysql_cnxn.close()
+
+    def wake(self):
+        self._wake.set()
+
+    def _resync_needed(self) -> bool:
+        if self._resync_due or self._resynced_at is None:
+            return True
+        return bool(self.resync_interval) and time.monotonic() - self._resynced_at > self.resync_interval
+
+    def _drain(self):
+        if self._resync_needed():
+            self.full_resync()
+        while not self._stop.is_set() and self.sync_once() >= self.batch_size:
+            pass
+
+    def _listen(self):
+        conn = self._listen_connect()
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(f"LISTEN {NOTIFY_CHANNEL};")
+        return conn
+
+    def _run(self):
+        listen_conn = None
+        while not self._stop.is_set():
+            try:
+                if listen_conn is None and self._listen_connect is not None:
+                    try:
+                        listen_conn = self._listen()
+                        self._mode = "listen"
+                    except Exception as e:
+                        self._last_error = f"LISTEN unavailable, polling: {e}"
+                        self._mode = "poll"
+
+                self._drain()
+
+                if listen_conn is not None:
+                    ready, _, _ = select.select([listen_conn], [], [], self.poll_interval)
+                    if ready:
+                        listen_conn.poll()
+                        listen_conn.notifies.clear()
+                elif self._wake.wait(self.poll_interval):
+                    self._wake.clear()
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                if listen_conn is not None:
+                    try:
+                        listen_conn.close()
+                    except Exception:
+                        pass
+                    listen_conn = None
+                self._stop.wait(self.poll_interval)
+        if listen_conn is not None:
+            listen_conn.close()
+        self._mode = "stopped"
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._mode = "poll"
+            self._thread = threading.Thread(target=self._run, name="products-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self._mode,
+            "last_change_id": self._last_change_id,
+            "last_sync_at": self._last_sync_at.isoformat() if self._last_sync_at else None,
+            # Age of the oldest change in the last applied batch when it reached ProductsCache.
+            "lag_seconds": round(self._lag_seconds, 3),
+            "batches": self._batches,
+            "upserts": self._upserts,
+            "deletes": self._deletes,
+            "late_changes": self._late,
+            "pending_gaps": len(self._gaps),
+            "resyncs": self._resyncs,
+            "last_resync_age": round(time.monotonic() - self._resynced_at, 1) if self._resynced_at else None,
+            "errors": self._errors,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,138 @@
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from result_governor import ResultLimits, RowBudget
+
+# fetchmany() batch size for governed plans that don't ask for their own chunking.
+GOVERNED_CHUNK_SIZE = 100
+
+
+@dataclass
+class QueryPlan:
+    """A single read statement plus the function that turns its rows into a tool response.
+
+    Planning does no I/O, so the same plan runs on a blocking driver in the
+    executor or on a native asyncio driver.
+    """
+    sql: str
+    params: Optional[Sequence] = None
+    build: Callable[[list], Any] = None
+    on_error: Optional[Callable[[Exception], Any]] = None
+    # When set, rows come off an unbuffered / server-side cursor in fetchmany()
+    # batches of this size and ``progress`` gets the running row count.
+    chunk_size: Optional[int] = None
+    progress: Optional[Callable[[int], Any]] = None
+    # When set, fetching stops at the first row over the cap and the response is
+    # marked truncated; ``continuation`` turns the last delivered row into a token
+    # that resumes after it.
+    limits: Optional[ResultLimits] = None
+    continuation: Optional[Callable[[tuple], Optional[str]]] = None
+    # When set, the response is cached under this key for the current data version.
+    cache_key: Optional[Hashable] = None
+    # The un-paged query (no LIMIT, no cursor predicate) a truncated response's
+    # total_estimate counts; plans whose ``sql`` is not paged leave it unset.
+    count_sql: Optional[str] = None
+    count_params: Optional[Sequence] = None
+
+    @property
+    def streamed(self) -> bool:
+        return bool(self.chunk_size or self.limits)
+
+
+@dataclass
+class PlanGroup:
+    """Independent named plans that run concurrently, each on its own connection."""
+    plans: dict[str, QueryPlan]
+
+
+class _Collector:
+    def __init__(self, plan: QueryPlan):
+        self.plan = plan
+        self.rows = []
+        self.truncated = False
+        self._budget = RowBudget(plan.limits) if plan.limits else None
+
+    def add(self, chunk: Sequence) -> bool:
+        """Keep the rows that fit; False once the result has been cut off."""
+        if self._budget is None:
+            self.rows.extend(chunk)
+        else:
+            for row in chunk:
+                if not self._budget.admit(row):
+                    self.truncated = True
+                    break
+                self.rows.append(row)
+        if self.plan.progress is not None:
+            self.plan.progress(len(self.rows))
+        return not self.truncated
+
+    def respond(self) -> Any:
+        response = self.plan.build(self.rows)
+        if self.truncated and isinstance(response, dict):
+            token = None
+            if self.plan.continuation is not None and self.rows:
+                token = self.plan.continuation(self.rows[-1])
+            response["truncated"] = True
+            response["continuation"] = token
+            if "next_cursor" in response:
+                response["next_cursor"] = token
+        return response
+
+
+def _close_cursor(conn, cur):
+    try:
+        cur.close()
+    except Exception:
+        # An unbuffered MySQL result abandoned part-way refuses to close; drop the
+        # connection instead of pulling the remaining rows over the wire.
+        discard = getattr(conn, "discard", None)
+        if discard is None:
+            raise
+        discard()
+
+
+def run_plan_sync(conn, plan: QueryPlan, stream_cursor_kwargs: Optional[dict] = None) -> Any:
+    collector = _Collector(plan)
+    try:
+        cur = conn.cursor(**(stream_cursor_kwargs or {})) if plan.streamed else conn.cursor()
+        try:
+            if plan.params:
+                cur.execute(plan.sql, plan.params)
+            else:
+                cur.execute(plan.sql)
+            if plan.streamed:
+                size = plan.chunk_size or GOVERNED_CHUNK_SIZE
+                while True:
+                    chunk = cur.fetchmany(size)
+                    if not chunk or not collector.add(chunk):
+                        break
+            else:
+                collector.rows = cur.fetchall()
+        finally:
+            _close_cursor(conn, cur)
+    except Exception as e:
+        if plan.on_error is None:
+            raise
+        return plan.on_error(e)
+    finally:
+        conn.close()
+    return collector.respond()
+
+
+async def run_plan_async(db, backend: str, plan: QueryPlan) -> Any:
+    collector = _Collector(plan)
+    try:
+        if plan.streamed:
+            size = plan.chunk_size or GOVERNED_CHUNK_SIZE
+            async with aclosing(db.stream(backend, plan.sql, plan.params or None, size)) as chunks:
+                async for chunk in chunks:
+                    if not collector.add(chunk):
+                        break
+        else:
+            collector.rows = await db.fetchall(backend, plan.sql, plan.params or None)
+    except Exception as e:
+        if plan.on_error is None:
+            raise
+        return plan.on_error(e)
+    return collector.respond()
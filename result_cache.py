@@ -0,0 +1,123 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from entity_cache import MISS
+
+# Data version for call-log results: (MAX(LogID), write counter). Inserts move
+# MAX(LogID); the triggers below bump the counter for everything else that can
+# change an analysis or a transcript_search row (CallLogs updates / deletes and
+# Customers name changes), so the ingest path never touches the counter row.
+DATA_VERSION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS DataVersion
+    (
+        Name   VARCHAR(50) PRIMARY KEY,
+        Writes BIGINT NOT NULL DEFAULT 0
+    );
+"""
+
+_BUMP_SQL = "INSERT INTO DataVersion (Name, Writes) VALUES ('calllogs', 1) ON DUPLICATE KEY UPDATE Writes = Writes + 1;"
+
+DATA_VERSION_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS calllogs_version_update;",
+    "DROP TRIGGER IF EXISTS calllogs_version_delete;",
+    "DROP TRIGGER IF EXISTS customers_version_update;",
+    "DROP TRIGGER IF EXISTS customers_version_delete;",
+    f"CREATE TRIGGER calllogs_version_update AFTER UPDATE ON CallLogs FOR EACH ROW {_BUMP_SQL}",
+    f"CREATE TRIGGER calllogs_version_delete AFTER DELETE ON CallLogs FOR EACH ROW {_BUMP_SQL}",
+    f"""
+    CREATE TRIGGER customers_version_update AFTER UPDATE ON Customers FOR EACH ROW
+    BEGIN
+        IF NOT (NEW.Name <=> OLD.Name) THEN
+            {_BUMP_SQL}
+        END IF;
+    END
+    """,
+    f"CREATE TRIGGER customers_version_delete AFTER DELETE ON Customers FOR EACH ROW {_BUMP_SQL}",
+]
+
+DATA_VERSION_SQL = """
+    SELECT (SELECT MAX(LogID) FROM CallLogs),
+           (SELECT Writes FROM DataVersion WHERE Name = 'calllogs')
+"""
+
+
+def install_data_version(mysql_cur):
+    mysql_cur.execute(DATA_VERSION_TABLE_SQL)
+    for statement in DATA_VERSION_TRIGGERS_SQL:
+        mysql_cur.execute(statement)
+
+
+def bump_data_version(mysql_cur):
+    """Invalidate cached call-log results after derived tables change without a CallLogs write."""
+    mysql_cur.execute(_BUMP_SQL)
+
+
+class ResultCache:
+    """Bounded LRU of tool responses, each valid only for the data version it was computed at.
+
+    A key holds one entry; a lookup under a newer version drops it. Entries are
+    evicted by count and by their encoded size.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, max_bytes: int = 64_000_000):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()  # key -> (version, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Any:
+        """Return the value cached for ``key`` at ``version``, or MISS."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._drop(key)
+                    self._stale += 1
+                self._misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, version: Hashable, value: Any, size: int):
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _drop(self, key: Hashable):
+        self._bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "cache": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "stale": self._stale,
+                "evictions": self._evictions,
+            }
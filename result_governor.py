@@ -0,0 +1,104 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+
+ROWS_PREFIX = "RESULT_MAX_ROWS_"
+BYTES_PREFIX = "RESULT_MAX_BYTES_"
+# Continuation tokens are HMAC-signed; without CONTINUATION_SECRET they only verify in this process.
+TOKEN_SECRET = os.getenv("CONTINUATION_SECRET", "").encode() or os.urandom(32)
+
+
+@dataclass(frozen=True)
+class ResultLimits:
+    max_rows: int
+    max_bytes: int
+
+
+class ResultGovernor:
+    """Per-tool caps on how many rows / bytes a single tool call may return.
+
+    ``RESULT_MAX_ROWS`` / ``RESULT_MAX_BYTES`` set the defaults and
+    ``RESULT_MAX_ROWS_<TOOL>`` / ``RESULT_MAX_BYTES_<TOOL>`` (tool name
+    upper-cased) override them for one tool.
+    """
+
+    def __init__(self, max_rows: int = 1000, max_bytes: int = 1_000_000,
+                 overrides: Optional[dict[str, dict]] = None):
+        self.default = ResultLimits(max(1, max_rows), max(1, max_bytes))
+        self._overrides = overrides or {}
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "ResultGovernor":
+        overrides: dict[str, dict] = {}
+        for key, value in environ.items():
+            for prefix, field in ((ROWS_PREFIX, "max_rows"), (BYTES_PREFIX, "max_bytes")):
+                if key.startswith(prefix):
+                    overrides.setdefault(key[len(prefix):].upper(), {})[field] = int(value)
+        return cls(
+            max_rows=int(environ.get("RESULT_MAX_ROWS", "1000")),
+            max_bytes=int(environ.get("RESULT_MAX_BYTES", "1000000")),
+            overrides=overrides,
+        )
+
+    def limits(self, tool: str) -> ResultLimits:
+        override = self._overrides.get(tool.upper())
+        if not override:
+            return self.default
+        return ResultLimits(max(1, override.get("max_rows", self.default.max_rows)),
+                            max(1, override.get("max_bytes", self.default.max_bytes)))
+
+
+def row_size(row: Sequence) -> int:
+    """Cheap estimate of a row's encoded size: text/binary length, 8 bytes for anything else."""
+    return sum(len(v) if isinstance(v, (str, bytes, bytearray)) else 8 for v in row) + 2 * len(row)
+
+
+class RowBudget:
+    """Admits rows until the next one would break the row or byte cap (the first row always fits)."""
+
+    def __init__(self, limits: ResultLimits):
+        self.limits = limits
+        self.rows = 0
+        self.bytes = 0
+
+    def admit(self, row: Sequence) -> bool:
+        size = row_size(row)
+        if self.rows >= self.limits.max_rows or (self.rows and self.bytes + size > self.limits.max_bytes):
+            return False
+        self.rows += 1
+        self.bytes += size
+        return True
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signature(body: str, secret: bytes) -> bytes:
+    return hmac.new(secret, body.encode(), hashlib.sha256).digest()
+
+
+def encode_token(payload: dict, secret: Optional[bytes] = None) -> str:
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return f"{body}.{_b64encode(_signature(body, secret or TOKEN_SECRET))}"
+
+
+def decode_token(token: str, secret: Optional[bytes] = None) -> dict:
+    """Payload of a token written by encode_token; ValueError if it is malformed or was not signed here."""
+    try:
+        body, signature = token.split(".")
+        valid = hmac.compare_digest(_b64decode(signature), _signature(body, secret or TOKEN_SECRET))
+        payload = json.loads(_b64decode(body)) if valid else None
+    except Exception as e:
+        raise ValueError(f"Invalid continuation token: {token!r}") from e
+    if not isinstance(payload, dict):
+        raise ValueError(f"Invalid continuation token: {token!r}")
+    return payload
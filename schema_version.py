@@ -0,0 +1,55 @@
+from typing import Optional
+
+# One row per seeded component, written only after its seed has finished, so a
+# matching row means the schema and its seed data are both in place.
+SCHEMA_VERSION_DDL = {
+    "mysql": """
+        CREATE TABLE IF NOT EXISTS SchemaVersion
+        (
+            Component VARCHAR(50) PRIMARY KEY,
+            Version   INT         NOT NULL,
+            SeededAt  TIMESTAMP   DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        );
+    """,
+    "postgres": """
+        CREATE TABLE IF NOT EXISTS schema_version
+        (
+            component TEXT PRIMARY KEY,
+            version   INT         NOT NULL,
+            seeded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+    """,
+}
+
+_SELECT_SQL = {
+    "mysql": "SELECT Version FROM SchemaVersion WHERE Component = %s",
+    "postgres": "SELECT version FROM schema_version WHERE component = %s",
+}
+
+_RECORD_SQL = {
+    "mysql": "INSERT INTO SchemaVersion (Component, Version) VALUES (%s, %s)"
+             " ON DUPLICATE KEY UPDATE Version = VALUES(Version)",
+    "postgres": "INSERT INTO schema_version (component, version) VALUES (%s, %s)"
+                " ON CONFLICT (component) DO UPDATE SET version = EXCLUDED.version, seeded_at = now()",
+}
+
+
+def seeded_version(conn, dialect: str, component: str) -> Optional[int]:
+    """The version ``component`` was last seeded at, or None (never seeded, or no version table / database yet)."""
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(_SELECT_SQL[dialect], (component,))
+            row = cur.fetchone()
+        finally:
+            cur.close()
+    except Exception:
+        if dialect == "postgres":
+            conn.rollback()
+        return None
+    return row[0] if row else None
+
+
+def record_version(cur, dialect: str, component: str, version: int):
+    cur.execute(SCHEMA_VERSION_DDL[dialect])
+    cur.execute(_RECORD_SQL[dialect], (component, version))
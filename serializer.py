@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder gives the same output shape
+    orjson = None
+
+
+def _iso(value) -> str:
+    return value.isoformat()
+
+
+def _b64(value) -> str:
+    return base64.b64encode(bytes(value)).decode("ascii")
+
+
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    Decimal: float,
+    datetime: _iso,
+    date: _iso,
+    time: _iso,
+    timedelta: str,
+    bytes: _b64,
+    bytearray: _b64,
+    memoryview: _b64,
+}
+
+
+def converter_for(value: Any) -> Optional[Callable[[Any], Any]]:
+    """Converter to a JSON-native value for ``value``'s type, or None if it is already JSON-native."""
+    converter = _CONVERTERS.get(type(value))
+    if converter is None and not isinstance(value, (str, int, float, bool, list, dict)):
+        converter = next((c for t, c in _CONVERTERS.items() if isinstance(value, t)), None)
+    return converter
+
+
+def column_converters(rows: Sequence[Sequence], width: int) -> list:
+    """One converter per column, picked from the column's first non-null value."""
+    converters = [None] * width
+    pending = set(range(width))
+    for row in rows:
+        for i in list(pending):
+            if row[i] is not None:
+                converters[i] = converter_for(row[i])
+                pending.discard(i)
+        if not pending:
+            break
+    return converters
+
+
+def convert_rows(columns: Sequence[str], rows: Iterable[Sequence]) -> list[dict]:
+    """Row tuples -> JSON-ready dicts; extra trailing values (e.g. paging keys) are dropped."""
+    rows = rows if isinstance(rows, list) else list(rows)
+    converters = column_converters(rows, len(columns)) if rows else []
+    if not any(converters):
+        return [dict(zip(columns, row)) for row in rows]
+    pairs = list(zip(columns, converters))
+    return [
+        {column: (value if converter is None or value is None else converter(value))
+         for (column, converter), value in zip(pairs, row)}
+        for row in rows
+    ]
+
+
+def _default(value: Any) -> Any:
+    converter = converter_for(value)
+    if converter is None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    return converter(value)
+
+
+def dumps(obj: Any) -> str:
+    """JSON-encode a tool result, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_default, ensure_ascii=False)
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_db import AsyncDatabase  # noqa: E402
+from query_plan import QueryPlan, run_plan_async  # noqa: E402
+from result_governor import ResultLimits  # noqa: E402
+
+ROWS = [(i, f"name-{i}") for i in range(1, 26)]
+
+
+class FakeSSCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    async def execute(self, sql, params=None):
+        self._rows = list(ROWS)
+
+    async def fetchmany(self, size):
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    async def close(self):
+        # Like aiomysql's SSCursor: closing reads whatever is left of the result.
+        self.conn.drained += len(self._rows)
+        self._rows = []
+
+
+class FakeConnection:
+    def __init__(self):
+        self.drained = 0
+        self.closed = False
+
+    async def cursor(self, cursor_class):
+        return FakeSSCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+        self.released = []
+
+    async def acquire(self):
+        return self.conn
+
+    async def release(self, conn):
+        self.released.append(conn)
+
+
+def make_db():
+    sys.modules.setdefault("aiomysql", types.SimpleNamespace(SSCursor=object()))
+    db = AsyncDatabase({}, {})
+    db._mysql_pool = FakePool()
+    return db
+
+
+def test_stream_to_the_end_closes_cursor_and_keeps_connection():
+    db = make_db()
+    plan = QueryPlan("SELECT 1", None, lambda rows: len(rows), chunk_size=10)
+    assert asyncio.run(run_plan_async(db, "mysql", plan)) == 25
+    pool = db._mysql_pool
+    assert pool.released == [pool.conn]
+    assert not pool.conn.closed
+
+
+def test_early_exit_discards_connection_without_draining():
+    db = make_db()
+    plan = QueryPlan("SELECT 1", None, lambda rows: {"result": rows}, chunk_size=5,
+                     limits=ResultLimits(max_rows=7, max_bytes=10 ** 6))
+    response = asyncio.run(run_plan_async(db, "mysql", plan))
+    assert response["truncated"]
+    pool = db._mysql_pool
+    assert pool.conn.closed
+    assert pool.conn.drained == 0
+    assert pool.released == [pool.conn]
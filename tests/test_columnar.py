@@ -0,0 +1,36 @@
+import os
+import sys
+from datetime import date
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import decode_columnar, encode_columnar, records_to_columnar  # noqa: E402
+
+RECORDS = [
+    {"id": i, "agent": ["Ann", "Ben"][i % 2], "note": f"note-{i}" if i % 3 else None,
+     "price": Decimal("1.50"), "day": date(2024, 1, 1 + i)}
+    for i in range(10)
+]
+
+
+def test_round_trip():
+    assert decode_columnar(records_to_columnar(RECORDS)) == RECORDS
+
+
+def test_low_cardinality_strings_are_dictionary_encoded():
+    payload = records_to_columnar(RECORDS)
+    types = dict(zip(payload["columns"], payload["types"]))
+    assert types == {"id": "int", "agent": "dictionary", "note": "str", "price": "decimal", "day": "date"}
+    assert payload["dictionaries"] == {"agent": ["Ann", "Ben"]}
+    assert [row[1] for row in payload["rows"][:3]] == [0, 1, 0]
+
+
+def test_small_results_are_not_dictionary_encoded():
+    payload = encode_columnar(["agent"], [("Ann",), ("Ann",)])
+    assert payload["types"] == ["str"] and payload["dictionaries"] == {}
+
+
+def test_missing_keys_and_empty_results():
+    assert decode_columnar(records_to_columnar([{"a": 1}, {"b": 2}])) == [{"a": 1, "b": None}, {"a": None, "b": 2}]
+    assert encode_columnar(["a"], []) == {"columns": ["a"], "types": ["null"], "rows": [], "dictionaries": {}}
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_pool import ConnectionPool, PoolTimeout  # noqa: E402
+
+
+class Raw:
+    opened = 0
+
+    def __init__(self):
+        Raw.opened += 1
+        self.id = Raw.opened
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**kwargs):
+    return ConnectionPool("test", Raw, **kwargs)
+
+
+def test_returned_connection_is_reused():
+    pool = make_pool(size=2)
+    conn = pool.connect()
+    raw = conn.raw
+    conn.close()
+    again = pool.connect()
+    assert again.raw is raw
+    assert pool.stats()["created"] == 1
+
+
+def test_dispose_closes_idle_and_checked_out_connections_on_return():
+    pool = make_pool(size=2)
+    idle, busy = pool.connect(), pool.connect()
+    idle_raw, busy_raw = idle.raw, busy.raw
+    idle.close()
+    pool.dispose()
+    assert idle_raw.closed
+    busy.close()
+    assert busy_raw.closed
+    fresh = pool.connect()
+    assert fresh.raw not in (idle_raw, busy_raw)
+    assert pool.stats()["open"] == 1
+
+
+def test_failed_reset_discards_connection():
+    pool = make_pool(size=2, reset=lambda raw: False)
+    conn = pool.connect()
+    raw = conn.raw
+    conn.close()
+    assert raw.closed
+    assert pool.stats()["idle"] == 0 and pool.stats()["discarded"] == 1
+
+
+def test_raising_reset_discards_connection():
+    def reset(raw):
+        raise RuntimeError("server gone")
+
+    pool = make_pool(size=1, reset=reset)
+    conn = pool.connect()
+    conn.close()
+    assert pool.stats()["open"] == 0
+
+
+def test_exhausted_pool_times_out():
+    pool = make_pool(size=1, max_overflow=0, timeout=0.01)
+    conn = pool.connect()
+    with pytest.raises(PoolTimeout):
+        pool.connect()
+    conn.close()
+    pool.connect()
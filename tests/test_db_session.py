@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_session import mark_failed, on_commit, run_in_session  # noqa: E402
+
+
+class FakeConnection:
+    def __init__(self):
+        self.autocommit = True
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return None
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def run(body):
+    conn = FakeConnection()
+    callbacks = []
+
+    def fn():
+        from db_session import current_session
+        current_session().connection("mysql")
+        on_commit(lambda: callbacks.append("invalidated"))
+        return body()
+
+    try:
+        response = run_in_session({"mysql": lambda: conn}, {}, fn)
+    except RuntimeError:
+        response = None
+    return response, conn, callbacks
+
+
+def test_success_commits_and_runs_callbacks():
+    response, conn, callbacks = run(lambda: {"result": "✅ done"})
+    assert (conn.commits, conn.rollbacks, conn.closed) == (1, 0, True)
+    assert callbacks == ["invalidated"]
+    assert response == {"result": "✅ done"}
+
+
+def test_error_response_rolls_back():
+    response, conn, callbacks = run(lambda: {"sql": None, "result": "❌ Customer not found"})
+    assert (conn.commits, conn.rollbacks, conn.closed) == (0, 1, True)
+    assert callbacks == []
+    assert response["result"].startswith("❌")
+
+
+def test_mark_failed_rolls_back():
+    def body():
+        mark_failed()
+        return {"result": "partial"}
+    _, conn, callbacks = run(body)
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+    assert callbacks == []
+
+
+def test_exception_rolls_back():
+    def body():
+        raise RuntimeError("boom")
+    _, conn, _ = run(body)
+    assert (conn.commits, conn.rollbacks, conn.closed) == (0, 1, True)
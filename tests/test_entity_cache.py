@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_cache import MISS, EntityCache  # noqa: E402
+
+
+def test_entity_cache_invalidate():
+    cache = EntityCache("customers")
+    cache.set(1, "Alice")
+    cache.set(2, "Bob")
+    cache.invalidate(1)
+    assert cache.get(1) is MISS
+    assert cache.get(2) == "Bob"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_entity_cache_invalidate_where():
+    cache = EntityCache("product_names")
+    cache.set("apple", 1)
+    cache.set("pear", 2)
+    cache.set(("name", "apple"), 1)
+    cache.invalidate_where(lambda key, value: value == 1)
+    assert cache.get("apple") is MISS
+    assert cache.get(("name", "apple")) is MISS
+    assert cache.get("pear") == 2
+
+
+def test_entity_cache_expires_and_evicts():
+    cache = EntityCache("ttl", max_size=2, ttl=-1.0)
+    cache.set(1, "a")
+    assert cache.get(1) is MISS
+    cache = EntityCache("lru", max_size=2)
+    for key in (1, 2, 3):
+        cache.set(key, key)
+    assert cache.get(1) is MISS
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entity_cache_get_or_load_skips_uncacheable_values():
+    cache = EntityCache("lookups")
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"found": False}
+
+    cache.get_or_load("x", load, cache_if=lambda value: value["found"])
+    cache.get_or_load("x", load, cache_if=lambda value: value["found"])
+    assert len(loads) == 2
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filter_compiler import FilterCompileError, cache_stats, compile_sales_filter  # noqa: E402
+
+
+@pytest.mark.parametrize("clause, expected", [
+    ("total_price > 100", (("s.total_price > %s",), (100.0,))),
+    ("total price below $20.5", (("s.total_price < %s",), (20.5,))),
+    ("quantity < 5", (("s.quantity < %s",), (5,))),
+    ("customer_name = 'Alice Smith'", (("c.Name = %s",), ("alice smith",))),
+    ("product_name like 'widget'", (("p.name LIKE %s",), ("%widget%",))),
+    ("sales more than 50", (("s.total_price > %s",), (50.0,))),
+])
+def test_compile(clause, expected):
+    assert compile_sales_filter(clause) == expected
+
+
+def test_values_are_parameters_not_sql():
+    conditions, params = compile_sales_filter("customer = 'x'' OR 1=1 --'")
+    assert conditions == ("c.Name = %s",)
+    assert params == ("x",)
+
+
+def test_unparseable_clause_raises():
+    with pytest.raises(FilterCompileError):
+        compile_sales_filter("whatever")
+
+
+def test_normalized_clauses_share_a_cache_entry():
+    before = cache_stats()["hits"]
+    compile_sales_filter("Quantity < 7")
+    compile_sales_filter("  quantity < 7 ")
+    assert cache_stats()["hits"] == before + 1
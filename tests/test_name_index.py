@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from name_index import CustomerNameIndex  # noqa: E402
+
+CUSTOMERS = [
+    (1, "Alice", "Smith", "Alice Smith", "alice@example.com"),
+    (2, "Bob", "Smithers", "Bob Smithers", "bob@example.com"),
+]
+
+
+class Loader:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.full_loads = 0
+        self.gate = None
+
+    def __call__(self, ids=None, after_id=None):
+        if ids is None and after_id is None:
+            self.full_loads += 1
+            if self.gate is not None:
+                self.gate.wait(5)
+            return list(self.rows)
+        return [r for r in self.rows if r[0] in ids or r[0] > after_id]
+
+
+def test_tiers():
+    index = CustomerNameIndex(Loader(CUSTOMERS))
+    assert [m["id"] for m in index.search("alice smith")] == [1]
+    assert index.search("smith")[0]["match_type"] == "exact_name_part"
+    assert [m["id"] for m in index.search("mith")] == [1, 2]
+
+
+def test_stale_row_reloads():
+    loader = Loader(CUSTOMERS)
+    index = CustomerNameIndex(loader)
+    index.search("alice")
+    loader.rows[0] = (1, "Alicia", "Smith", "Alicia Smith", "alice@example.com")
+    index.mark_stale(1)
+    assert index.search("alicia")[0]["id"] == 1
+    assert loader.full_loads == 1
+
+
+def test_periodic_reload_runs_in_background():
+    loader = Loader(CUSTOMERS)
+    index = CustomerNameIndex(loader, full_reload_interval=0.0)
+    index.search("alice")
+    loader.gate = threading.Event()
+    loader.rows.append((3, "Carol", "Jones", "Carol Jones", "carol@example.com"))
+
+    # The reload is blocked inside the loader; lookups still answer from the current index.
+    assert [m["id"] for m in index.search("alice")] == [1]
+    assert index.search("carol") == []
+
+    loader.gate.set()
+    for thread in threading.enumerate():
+        if thread.name == "customer-name-index-reload":
+            thread.join(5)
+    assert loader.full_loads >= 2
+    assert [m["id"] for m in index.search("carol jones")] == [3]
@@ -0,0 +1,52 @@
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pg_copy import CopyStream, copy_line, copy_rows, copy_value  # noqa: E402
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "\\N"),
+    ("plain", "plain"),
+    ("back\\slash", "back\\\\slash"),
+    ("tab\there", "tab\\there"),
+    ("line\nbreak", "line\\nbreak"),
+    ("carriage\rreturn", "carriage\\rreturn"),
+    ("\\N", "\\\\N"),
+    (3.5, "3.5"),
+    (date(2024, 1, 2), "2024-01-02"),
+    (datetime(2024, 1, 2, 3, 4, 5), "2024-01-02 03:04:05"),
+])
+def test_copy_value(value, expected):
+    assert copy_value(value) == expected
+
+
+def test_copy_line():
+    assert copy_line((1, "a\tb", None)) == "1\ta\\tb\t\\N\n"
+
+
+def test_copy_stream_reads_in_bounded_chunks():
+    rows = [(i, f"name-{i}") for i in range(100)]
+    stream = CopyStream(iter(rows))
+    chunks = []
+    while chunk := stream.read(64):
+        assert len(chunk) <= 64
+        chunks.append(chunk)
+    assert b"".join(chunks).decode() == "".join(copy_line(row) for row in rows)
+    assert stream.rows == 100
+
+
+def test_copy_rows():
+    class Cursor:
+        def copy_expert(self, sql, stream, size):
+            self.sql = sql
+            self.data = stream.read()
+
+    cur = Cursor()
+    assert copy_rows(cur, "products", ["id", "name"], [(1, "ä"), (2, None)]) == 2
+    assert cur.sql == "COPY products (id, name) FROM STDIN"
+    assert cur.data == "1\tä\n2\t\\N\n".encode("utf-8")
@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from query_plan import QueryPlan, run_plan_async, run_plan_sync  # noqa: E402
+from result_governor import ResultLimits  # noqa: E402
+
+ROWS = [(i, f"name-{i}") for i in range(1, 26)]
+
+
+class FakeCursor:
+    def __init__(self, conn, kwargs):
+        self.conn = conn
+        self.kwargs = kwargs
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params, self.kwargs))
+        if "boom" in sql:
+            raise RuntimeError("query failed")
+        self._rows = list(ROWS)
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    def close(self):
+        self.conn.cursors_closed += 1
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.fetch_sizes = []
+        self.cursors_closed = 0
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self, kwargs)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncDatabase:
+    def __init__(self):
+        self.executed = []
+        self.fetch_sizes = []
+
+    def _check(self, backend, sql, params):
+        self.executed.append((backend, sql, params))
+        if "boom" in sql:
+            raise RuntimeError("query failed")
+
+    async def fetchall(self, backend, sql, params=None):
+        self._check(backend, sql, params)
+        return list(ROWS)
+
+    async def stream(self, backend, sql, params, chunk_size):
+        self._check(backend, sql, params)
+        for start in range(0, len(ROWS), chunk_size):
+            self.fetch_sizes.append(chunk_size)
+            yield ROWS[start:start + chunk_size]
+
+
+def run_sync(plan):
+    conn = FakeConnection()
+    result = run_plan_sync(conn, plan, {"buffered": False})
+    assert conn.closed
+    assert conn.cursors_closed == 1
+    return result
+
+
+def run_async(plan):
+    return asyncio.run(run_plan_async(FakeAsyncDatabase(), "mysql", plan))
+
+
+RUNNERS = pytest.mark.parametrize("run", [run_sync, run_async], ids=["sync", "async"])
+
+
+def build(rows):
+    return {"success": True, "data": [{"id": r[0], "name": r[1]} for r in rows]}
+
+
+@RUNNERS
+def test_fetchall(run):
+    result = run(QueryPlan("SELECT id, name FROM t WHERE id > %s", (0,), build))
+    assert result == build(ROWS)
+
+
+@RUNNERS
+def test_chunked_reports_progress(run):
+    seen = []
+    plan = QueryPlan("SELECT id, name FROM t", None, build, chunk_size=10, progress=seen.append)
+    assert run(plan) == build(ROWS)
+    assert seen == [10, 20, 25]
+
+
+@RUNNERS
+def test_row_cap_truncates_with_continuation(run):
+    plan = QueryPlan("SELECT id, name FROM t", None, build, limits=ResultLimits(max_rows=7, max_bytes=10_000),
+                     continuation=lambda row: f"after:{row[0]}")
+    result = run(plan)
+    assert result["data"] == build(ROWS[:7])["data"]
+    assert result["truncated"] is True
+    assert result["continuation"] == "after:7"
+
+
+@RUNNERS
+def test_byte_cap_truncates(run):
+    plan = QueryPlan("SELECT id, name FROM t", None, build, limits=ResultLimits(max_rows=1000, max_bytes=50))
+    result = run(plan)
+    assert 0 < len(result["data"]) < len(ROWS)
+    assert result["truncated"] is True
+    assert result["continuation"] is None
+
+
+@RUNNERS
+def test_next_cursor_follows_continuation(run):
+    plan = QueryPlan("SELECT id, name FROM t", None, lambda rows: {**build(rows), "next_cursor": None},
+                     limits=ResultLimits(max_rows=5, max_bytes=10_000), continuation=lambda row: str(row[0]))
+    result = run(plan)
+    assert result["next_cursor"] == result["continuation"] == "5"
+
+
+@RUNNERS
+def test_on_error(run):
+    plan = QueryPlan("SELECT boom", None, build, on_error=lambda e: {"success": False, "error": str(e)})
+    assert run(plan) == {"success": False, "error": "query failed"}
+
+
+@RUNNERS
+def test_error_without_handler_raises(run):
+    with pytest.raises(RuntimeError, match="query failed"):
+        run(QueryPlan("SELECT boom", None, build))
+
+
+def test_sync_streams_on_stream_cursor():
+    conn = FakeConnection()
+    run_plan_sync(conn, QueryPlan("SELECT id, name FROM t", None, build, chunk_size=10), {"buffered": False})
+    assert conn.executed[0][2] == {"buffered": False}
+    assert conn.fetch_sizes[0] == 10
+
+
+def test_sync_plain_plan_uses_buffered_cursor():
+    conn = FakeConnection()
+    run_plan_sync(conn, QueryPlan("SELECT id, name FROM t", None, build), {"buffered": False})
+    assert conn.executed[0][2] == {}
+    assert conn.fetch_sizes == []
+
+
+def test_async_passes_params_and_backend():
+    db = FakeAsyncDatabase()
+    asyncio.run(run_plan_async(db, "postgres", QueryPlan("SELECT %s", (3,), build)))
+    assert db.executed == [("postgres", "SELECT %s", (3,))]
@@ -0,0 +1,117 @@
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calllog_rollup import rebuild_rollup  # noqa: E402
+from transcript_terms import rebuild_term_index  # noqa: E402
+
+
+class FakeMySQL:
+    """Just enough of MySQL's DDL for the rebuilds: tables are lists of rows, keyed by name."""
+
+    def __init__(self, tables: dict, fail_on: str = None):
+        self.tables = {name: list(rows) for name, rows in tables.items()}
+        self.fail_on = fail_on
+        self._rows = []
+
+    def _check(self, sql):
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"failed on {self.fail_on}")
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self._check(sql)
+        if m := re.match(r"DROP TABLE IF EXISTS (.+)", sql):
+            for name in m.group(1).split(", "):
+                self.tables.pop(name, None)
+        elif m := re.match(r"DROP TABLE (\w+)", sql):
+            del self.tables[m.group(1)]
+        elif m := re.match(r"CREATE TABLE (\w+) LIKE (\w+)", sql):
+            assert m.group(2) in self.tables
+            self.tables[m.group(1)] = []
+        elif m := re.match(r"RENAME TABLE (.+)", sql):
+            pairs = [pair.split(" TO ") for pair in m.group(1).split(", ")]
+            for old, new in pairs:
+                self.tables[new] = self.tables.pop(old)
+        elif m := re.match(r"INSERT INTO (\w+) .* SELECT .* FROM CallLogs", sql):
+            self.tables[m.group(1)].extend(("rebuilt", row) for row in self.tables["CallLogs"])
+        elif sql.startswith("SELECT COALESCE(MAX(PendingID), 0)"):
+            self._rows = [(max((r[0] for r in self.tables["CallTermPending"]), default=0),)]
+        elif m := re.match(r"SELECT LogID, CallDate, IssueCategory, CallTranscript FROM CallLogs", sql):
+            after, limit = params
+            self._rows = [r for r in self.tables["CallLogs"] if r[0] > after][:limit]
+        elif m := re.match(r"DELETE FROM CallTermPending WHERE PendingID <= %s", sql):
+            self.tables["CallTermPending"] = [r for r in self.tables["CallTermPending"] if r[0] > params[0]]
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def executemany(self, sql, rows):
+        sql = " ".join(sql.split())
+        self._check(sql)
+        table = re.match(r"INSERT INTO (\w+)", sql).group(1)
+        self.tables[table].extend(rows)
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+
+CALLS = [(1, "2024-01-02", "billing", "refund requested twice"), (2, "2024-01-03", None, "password reset")]
+
+
+def test_rollup_rebuild_swaps_in_new_table():
+    db = FakeMySQL({"CallLogs": CALLS, "CallLogRollup": ["stale"]})
+    rebuild_rollup(db)
+    assert db.tables["CallLogRollup"] == [("rebuilt", row) for row in CALLS]
+    assert set(db.tables) == {"CallLogs", "CallLogRollup"}
+
+
+@pytest.mark.parametrize("fail_on", ["INSERT INTO CallLogRollup_rebuild", "RENAME TABLE"])
+def test_rollup_rebuild_failure_keeps_old_rollup(fail_on):
+    db = FakeMySQL({"CallLogs": CALLS, "CallLogRollup": ["stale"]}, fail_on=fail_on)
+    with pytest.raises(RuntimeError):
+        rebuild_rollup(db)
+    assert db.tables["CallLogRollup"] == ["stale"]
+    assert set(db.tables) == {"CallLogs", "CallLogRollup"}
+
+
+def term_db(fail_on=None):
+    return FakeMySQL({"CallLogs": CALLS, "CallTermDaily": ["stale daily"], "CallTermTotals": ["stale totals"],
+                      "CallTermPending": [(1, "queued"), (2, "queued")]}, fail_on=fail_on)
+
+
+def test_term_index_rebuild_swaps_in_new_tables():
+    db = term_db()
+    db.tables["CallTermPending"].append((3, "queued"))
+    original_execute = db.execute
+
+    def execute(sql, params=None):
+        # A write queued after the rebuild read the queue's high-water mark must survive it.
+        original_execute(sql, params)
+        if sql.startswith("SELECT COALESCE(MAX(PendingID), 0)"):
+            db.tables["CallTermPending"].append((4, "queued during rebuild"))
+    db.execute = execute
+    rebuild_term_index(db, batch_size=1)
+    assert ("billing", "refund", 1) in db.tables["CallTermTotals"]
+    assert ("", "password", 1) in db.tables["CallTermTotals"]
+    assert "stale daily" not in db.tables["CallTermDaily"]
+    assert db.tables["CallTermPending"] == [(4, "queued during rebuild")]
+    assert set(db.tables) == {"CallLogs", "CallTermDaily", "CallTermTotals", "CallTermPending"}
+
+
+@pytest.mark.parametrize("fail_on", ["INSERT INTO CallTermTotals_rebuild", "RENAME TABLE"])
+def test_term_index_rebuild_failure_keeps_old_index(fail_on):
+    db = term_db(fail_on)
+    with pytest.raises(RuntimeError):
+        rebuild_term_index(db, batch_size=1)
+    assert db.tables["CallTermDaily"] == ["stale daily"]
+    assert db.tables["CallTermTotals"] == ["stale totals"]
+    assert db.tables["CallTermPending"] == [(1, "queued"), (2, "queued")]
+    assert set(db.tables) == {"CallLogs", "CallTermDaily", "CallTermTotals", "CallTermPending"}
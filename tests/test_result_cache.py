@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entity_cache import MISS  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+
+
+def test_result_cache_newer_version_drops_entry():
+    cache = ResultCache("results")
+    cache.set("k", (10, 1), {"result": []}, 10)
+    assert cache.get("k", (10, 1)) == {"result": []}
+    assert cache.get("k", (11, 1)) is MISS
+    assert cache.get("k", (10, 1)) is MISS
+    assert cache.stats()["stale"] == 1
+
+
+def test_result_cache_evicts_by_count_and_bytes():
+    cache = ResultCache("results", max_entries=2, max_bytes=100)
+    cache.set("a", 1, "a", 40)
+    cache.set("b", 1, "b", 40)
+    cache.set("c", 1, "c", 40)
+    assert cache.get("a", 1) is MISS
+    cache.set("big", 1, "big", 101)
+    assert cache.get("big", 1) is MISS
+    cache.set("d", 1, "d", 90)
+    stats = cache.stats()
+    assert stats["size"] == 1 and stats["bytes"] == 90
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_governor import (ResultGovernor, ResultLimits, RowBudget, decode_token,  # noqa: E402
+                             encode_token, row_size)
+
+SECRET = b"test-secret"
+
+
+def test_token_round_trip():
+    payload = {"tool": "sales_crud", "after": ["2024-01-01", 42]}
+    assert decode_token(encode_token(payload, SECRET), SECRET) == payload
+
+
+def test_token_signed_with_another_secret_is_rejected():
+    token = encode_token({"after": 1}, b"other-secret")
+    with pytest.raises(ValueError):
+        decode_token(token, SECRET)
+
+
+def test_tampered_token_is_rejected():
+    token = encode_token({"after": 1}, SECRET)
+    forged = encode_token({"after": 999}, SECRET).split(".")[0]
+    with pytest.raises(ValueError):
+        decode_token(f"{forged}.{token.split('.')[1]}", SECRET)
+
+
+@pytest.mark.parametrize("token", ["", "no-signature", "a.b.c", "!!!.???"])
+def test_malformed_token_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_token(token, SECRET)
+
+
+def test_row_budget_stops_at_row_cap():
+    budget = RowBudget(ResultLimits(max_rows=2, max_bytes=10 ** 6))
+    assert [budget.admit((i,)) for i in range(3)] == [True, True, False]
+
+
+def test_row_budget_stops_at_byte_cap_but_admits_first_row():
+    row = ("x" * 100,)
+    budget = RowBudget(ResultLimits(max_rows=100, max_bytes=row_size(row) + 10))
+    assert budget.admit(row)
+    assert not budget.admit(row)
+    assert RowBudget(ResultLimits(max_rows=100, max_bytes=1)).admit(row)
+
+
+def test_per_tool_overrides_from_env():
+    governor = ResultGovernor.from_env({"RESULT_MAX_ROWS": "50", "RESULT_MAX_BYTES_SALES_CRUD": "0"})
+    assert governor.limits("careplan_crud") == ResultLimits(50, 1_000_000)
+    assert governor.limits("sales_crud") == ResultLimits(50, 1)
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serializer import convert_rows, dumps  # noqa: E402
+
+
+def test_convert_rows_converts_per_column_and_drops_paging_keys():
+    rows = [
+        (1, Decimal("2.50"), datetime(2024, 1, 2, 3, 4, 5), b"\x00\x01", "page-key"),
+        (2, None, None, None, "page-key"),
+    ]
+    assert convert_rows(["id", "price", "at", "blob"], rows) == [
+        {"id": 1, "price": 2.5, "at": "2024-01-02T03:04:05", "blob": "AAE="},
+        {"id": 2, "price": None, "at": None, "blob": None},
+    ]
+
+
+def test_convert_rows_leaves_native_rows_alone():
+    assert convert_rows(["a", "b"], [(1, "x")]) == [{"a": 1, "b": "x"}]
+    assert convert_rows(["a"], []) == []
+
+
+def test_dumps_handles_db_types():
+    value = {"d": date(2024, 1, 2), "t": time(3, 4), "span": timedelta(hours=1), "n": Decimal("1.5"), "s": "é"}
+    assert json.loads(dumps(value)) == {"d": "2024-01-02", "t": "03:04:00", "span": "1:00:00", "n": 1.5, "s": "é"}
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"x": object()})
@@ -0,0 +1,260 @@
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from result_cache import bump_data_version
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'was', 'were', 'been', 'be', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'is', 'are', 'am', 'customer', 'agent', 'call', 'called',
+})
+TERM_MAX_LENGTH = 191
+
+# Terms are compared byte-for-byte (utf8mb4_bin) so the index counts exactly
+# what the tokenizer produced. As in CallLogRollup, a NULL category is stored
+# as '' so it still matches the unique key.
+#
+# Tokenizing needs Python, so CallLogs triggers only queue the old (-1) and new
+# (+1) side of every write in CallTermPending; fold_pending_terms() applies them.
+TERM_TABLES_SQL = [
+    f"""
+    CREATE TABLE IF NOT EXISTS CallTermDaily
+    (
+        RowID         BIGINT AUTO_INCREMENT PRIMARY KEY,
+        CallDay       DATE         NOT NULL,
+        IssueCategory VARCHAR(100) NOT NULL DEFAULT '',
+        Term          VARCHAR({TERM_MAX_LENGTH}) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+        Freq          BIGINT       NOT NULL DEFAULT 0,
+        UNIQUE KEY uq_term_daily (CallDay, IssueCategory, Term)
+    );
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS CallTermTotals
+    (
+        RowID         BIGINT AUTO_INCREMENT PRIMARY KEY,
+        IssueCategory VARCHAR(100) NOT NULL DEFAULT '',
+        Term          VARCHAR({TERM_MAX_LENGTH}) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+        Freq          BIGINT       NOT NULL DEFAULT 0,
+        UNIQUE KEY uq_term_totals (IssueCategory, Term)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS CallTermPending
+    (
+        PendingID      BIGINT AUTO_INCREMENT PRIMARY KEY,
+        CallDate       DATETIME     NOT NULL,
+        IssueCategory  VARCHAR(100),
+        CallTranscript TEXT,
+        Sign           TINYINT      NOT NULL
+    );
+    """,
+]
+
+
+def _enqueue_sql(row: str, sign: int) -> str:
+    return ("INSERT INTO CallTermPending (CallDate, IssueCategory, CallTranscript, Sign) VALUES "
+            f"({row}.CallDate, {row}.IssueCategory, {row}.CallTranscript, {sign});")
+
+
+TERM_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS calllogs_terms_insert;",
+    "DROP TRIGGER IF EXISTS calllogs_terms_update;",
+    "DROP TRIGGER IF EXISTS calllogs_terms_delete;",
+    f"CREATE TRIGGER calllogs_terms_insert AFTER INSERT ON CallLogs FOR EACH ROW {_enqueue_sql('NEW', 1)}",
+    f"""
+    CREATE TRIGGER calllogs_terms_update AFTER UPDATE ON CallLogs FOR EACH ROW
+    BEGIN
+        IF NOT (NEW.CallTranscript <=> OLD.CallTranscript AND NEW.IssueCategory <=> OLD.IssueCategory
+                AND DATE(NEW.CallDate) <=> DATE(OLD.CallDate)) THEN
+            {_enqueue_sql('OLD', -1)}
+            {_enqueue_sql('NEW', 1)}
+        END IF;
+    END
+    """,
+    f"CREATE TRIGGER calllogs_terms_delete AFTER DELETE ON CallLogs FOR EACH ROW {_enqueue_sql('OLD', -1)}",
+]
+
+TERM_TABLES = ("CallTermDaily", "CallTermTotals")
+
+_UPSERT_DAILY = (
+    "INSERT INTO {table} (CallDay, IssueCategory, Term, Freq) VALUES (%s, %s, %s, %s)"
+    " ON DUPLICATE KEY UPDATE Freq = Freq + VALUES(Freq)"
+)
+_UPSERT_TOTALS = (
+    "INSERT INTO {table} (IssueCategory, Term, Freq) VALUES (%s, %s, %s)"
+    " ON DUPLICATE KEY UPDATE Freq = Freq + VALUES(Freq)"
+)
+
+
+def terms(transcript: str) -> Counter:
+    """Keyword counts for one transcript: lower-cased words longer than 3 characters, minus stop words."""
+    words = (transcript or "").lower().split()
+    return Counter(w[:TERM_MAX_LENGTH] for w in words if len(w) > 3 and w not in STOP_WORDS)
+
+
+def install_term_index(mysql_cur):
+    """Create the term tables and the CallLogs triggers that queue every write for fold_pending_terms()."""
+    for statement in TERM_TABLES_SQL + TERM_TRIGGERS_SQL:
+        mysql_cur.execute(statement)
+
+
+def _executemany(mysql_cur, sql: str, rows: list, batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        mysql_cur.executemany(sql, rows[start:start + batch_size])
+
+
+def _index_signed(mysql_cur, calls: Iterable[tuple], batch_size: int, tables: tuple = TERM_TABLES):
+    """Upsert the net term counts of ``(CallDate, IssueCategory, CallTranscript, sign)`` rows into ``tables``."""
+    daily: Counter = Counter()
+    totals: Counter = Counter()
+    for call_date, category, transcript, sign in calls:
+        day = call_date.date() if isinstance(call_date, datetime) else call_date
+        category = category or ""
+        for term, count in terms(transcript).items():
+            daily[(day, category, term)] += sign * count
+            totals[(category, term)] += sign * count
+    daily_table, totals_table = tables
+    _executemany(mysql_cur, _UPSERT_DAILY.format(table=daily_table),
+                 [(*key, n) for key, n in daily.items() if n], batch_size)
+    _executemany(mysql_cur, _UPSERT_TOTALS.format(table=totals_table),
+                 [(*key, n) for key, n in totals.items() if n], batch_size)
+
+
+def index_transcripts(mysql_cur, calls: Iterable[tuple], sign: int = 1, batch_size: int = 1000):
+    """Add the terms of ``(CallDate, IssueCategory, CallTranscript)`` rows (``sign=-1`` removes them)."""
+    _index_signed(mysql_cur, ((*call, sign) for call in calls), batch_size)
+
+
+def fold_pending_terms(mysql_cur, batch_size: int = 1000) -> int:
+    """Apply up to ``batch_size`` queued CallLogs writes to the term index; returns how many were folded.
+
+    Run it in a transaction and commit per call: the queue rows are locked
+    (SKIP LOCKED, so concurrent folders split the queue) until they are deleted.
+    """
+    mysql_cur.execute(
+        "SELECT PendingID, CallDate, IssueCategory, CallTranscript, Sign FROM CallTermPending"
+        " ORDER BY PendingID LIMIT %s FOR UPDATE SKIP LOCKED",
+        (batch_size,),
+    )
+    rows = mysql_cur.fetchall()
+    if not rows:
+        return 0
+    _index_signed(mysql_cur, [r[1:] for r in rows], batch_size)
+    ids = [r[0] for r in rows]
+    mysql_cur.execute(f"DELETE FROM CallTermPending WHERE PendingID IN ({', '.join(['%s'] * len(ids))})", ids)
+    return len(rows)
+
+
+def rebuild_term_index(mysql_cur, batch_size: int = 5000):
+    """Re-index every CallLogs transcript in LogID order; run with writes paused.
+
+    The index is built in shadow tables and swapped in by one atomic RENAME,
+    so a failure part-way leaves the current index and its queue untouched.
+    Queued writes the scan already covers are dropped once the swap is done.
+    """
+    mysql_cur.execute("SELECT COALESCE(MAX(PendingID), 0) FROM CallTermPending")
+    covered = mysql_cur.fetchone()[0]
+    shadows = tuple(f"{table}_rebuild" for table in TERM_TABLES)
+    olds = tuple(f"{table}_old" for table in TERM_TABLES)
+    mysql_cur.execute(f"DROP TABLE IF EXISTS {', '.join(shadows + olds)}")
+    try:
+        for table, shadow in zip(TERM_TABLES, shadows):
+            mysql_cur.execute(f"CREATE TABLE {shadow} LIKE {table}")
+        last_id = 0
+        while True:
+            mysql_cur.execute(
+                "SELECT LogID, CallDate, IssueCategory, CallTranscript FROM CallLogs"
+                " WHERE LogID > %s ORDER BY LogID LIMIT %s",
+                (last_id, batch_size),
+            )
+            rows = mysql_cur.fetchall()
+            if not rows:
+                break
+            _index_signed(mysql_cur, [(*r[1:], 1) for r in rows], batch_size, shadows)
+            last_id = rows[-1][0]
+        renames = [f"{table} TO {old}, {shadow} TO {table}" for table, shadow, old in zip(TERM_TABLES, shadows, olds)]
+        mysql_cur.execute(f"RENAME TABLE {', '.join(renames)}")
+    except Exception:
+        try:
+            mysql_cur.execute(f"DROP TABLE IF EXISTS {', '.join(shadows)}")
+        except Exception:
+            pass
+        raise
+    mysql_cur.execute(f"DROP TABLE IF EXISTS {', '.join(olds)}")
+    mysql_cur.execute("DELETE FROM CallTermPending WHERE PendingID <= %s", (covered,))
+
+
+class TermIndexSync:
+    """Background thread that folds CallTermPending into the term index every ``interval`` seconds.
+
+    Each batch commits on its own and bumps the call-log data version, so a
+    cached transcript_keywords result never outlives the terms it was built from.
+    """
+
+    def __init__(self, mysql_connect: Callable, batch_size: int = 1000, interval: float = 5.0):
+        self._mysql_connect = mysql_connect
+        self.batch_size = batch_size
+        self.interval = interval
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._folded = 0
+        self._errors = 0
+        self._last_error = None
+        self._last_fold_at = None
+
+    def fold(self) -> int:
+        """Fold everything queued so far; returns how many writes were applied."""
+        with self._lock:
+            cnxn = self._mysql_connect()
+            try:
+                cnxn.autocommit = False
+                cur = cnxn.cursor()
+                folded = 0
+                while True:
+                    count = fold_pending_terms(cur, self.batch_size)
+                    if not count:
+                        break
+                    bump_data_version(cur)
+                    cnxn.commit()
+                    folded += count
+                cnxn.commit()
+                self._folded += folded
+                self._last_fold_at = datetime.now(timezone.utc)
+                return folded
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                cnxn.rollback()
+                raise
+            finally:
+                cnxn.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.fold()
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="term-index-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "folded": self._folded,
+            "last_fold_at": self._last_fold_at.isoformat() if self._last_fold_at else None,
+            "errors": self._errors,
+            "last_error": self._last_error,
+        }